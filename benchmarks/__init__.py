@@ -0,0 +1,2 @@
+# benchmarks/__init__.py
+"""Performance benchmarks for hot paths. Run each module with `python -m benchmarks.<name>`."""
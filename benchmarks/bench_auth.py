@@ -0,0 +1,53 @@
+"""Benchmark password verification throughput (logins per second per core).
+
+Usage: python -m benchmarks.bench_auth [--logins 40] [--workers 1 2 4]
+
+Mirrors the production defaults in config.settings.PASSWORD_HASH_SETTINGS;
+that module imports streamlit, so the values are repeated here.
+"""
+import argparse
+import hashlib
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from utils.passwords import hash_password, verify_password
+
+N, R, P = 2 ** 14, 8, 1
+
+def timed_logins(stored, logins, workers):
+    """Verify `logins` passwords on a pool of `workers` threads; returns seconds"""
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        started = time.perf_counter()
+        results = list(pool.map(lambda _: verify_password("correct horse", stored, N, R, P), range(logins)))
+        elapsed = time.perf_counter() - started
+    assert all(matches for matches, _ in results)
+    return elapsed
+
+def run(logins, worker_counts):
+    stored = hash_password("correct horse", N, R, P)
+    legacy = hashlib.sha256("correct horse".encode()).hexdigest()
+
+    legacy_time = timed_logins(legacy, logins * 100, 1) / (logins * 100)
+    print(f"scrypt n={N} r={R} p={P}  cpus={os.cpu_count()}  hash length={len(stored)}")
+    print(f"  legacy sha256 verify:  {legacy_time * 1e6:10.2f} us/login")
+
+    single = None
+    for workers in worker_counts:
+        elapsed = timed_logins(stored, logins, workers)
+        rate = logins / elapsed
+        single = single or rate
+        print(f"  scrypt, {workers:2d} worker(s):  {elapsed / logins * 1e3:10.2f} ms/login"
+              f"  {rate:7.1f} logins/s  ({rate / single:.2f}x)")
+
+    matches, needs_rehash = verify_password("correct horse", legacy, N, R, P)
+    print(f"  legacy hash upgrade:   matches={matches} needs_rehash={needs_rehash}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--logins", type=int, default=40)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    args = parser.parse_args()
+    run(args.logins, args.workers)
+
+if __name__ == "__main__":
+    main()
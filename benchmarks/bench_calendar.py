@@ -0,0 +1,78 @@
+"""Benchmark ICS feed generation and busy-block import at 10k events per lawyer.
+
+Usage: python -m benchmarks.bench_calendar [--events 10000]
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from utils.ical import iter_calendar, iter_busy_blocks
+
+def synthetic_events(count, seed=42):
+    """Yield event dicts shaped like calendar_service rows"""
+    rng = random.Random(seed)
+    start = datetime(2025, 1, 6, 9, 0)
+    for i in range(count):
+        begins = start + timedelta(days=i // 8, minutes=60 * (i % 8))
+        yield {
+            'uid': f"consultation-{i}@legal-aid-india",
+            'start': begins,
+            'end': begins + timedelta(minutes=rng.choice([30, 60])),
+            'summary': f"Consultation: client_{rng.randrange(5000)}",
+            'description': "Client: क्लाइंट\nPhone: +91-98765-43210\nEmail: client@example.com\n"
+                           + "Property dispute, sale deed review; bring mutation records. " * rng.randint(0, 3),
+            'status': rng.choice(["CONFIRMED", "TENTATIVE"]),
+            'last_modified': begins - timedelta(days=3)
+        }
+
+def measure(label, func):
+    """Time func, then re-run it under tracemalloc for its peak allocation"""
+    began = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - began
+
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"  {label:<34} {elapsed * 1e3:8.1f} ms   peak {peak / 1024:9.1f} KiB")
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=10000)
+    args = parser.parse_args()
+
+    print(f"events={args.events}")
+
+    def stream_to_sink():
+        sink = 0
+        for line in iter_calendar(synthetic_events(args.events), 330, "-//bench//EN", "bench"):
+            sink += len(line)
+        return sink
+
+    def build_document():
+        return "".join(iter_calendar(list(synthetic_events(args.events)), 330, "-//bench//EN", "bench"))
+
+    size = measure("stream feed (generator)", stream_to_sink)
+    document = measure("build whole document in memory", build_document)
+    print(f"  document size: {size / 1024:.0f} KiB")
+
+    with tempfile.NamedTemporaryFile("w", suffix=".ics", encoding="utf-8", newline="", delete=False) as handle:
+        handle.write(document)
+
+    def import_file():
+        with open(handle.name, encoding="utf-8", newline="") as lines:
+            return sum(1 for _ in iter_busy_blocks(lines, 330))
+
+    try:
+        blocks = measure("import busy blocks (streamed file)", import_file)
+    finally:
+        os.unlink(handle.name)
+    print(f"  parsed busy blocks: {blocks}")
+
+if __name__ == "__main__":
+    main()
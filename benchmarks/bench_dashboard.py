@@ -0,0 +1,110 @@
+"""Benchmark lawyer dashboard data loading: sequential calls vs fetch_all fan-out.
+
+Usage: DATABASE_URL=postgresql://... python -m benchmarks.bench_dashboard
+       [--iterations 50] [--lawyers 20] [--rtt-ms 0]
+
+Needs a seeded database (python -m database.seeder). Each iteration loads
+the dashboard's four data sets for one seeded lawyer, once one call after
+another and once through utils.page_data.fetch_all. The per-loader times
+show how close the fan-out comes to the slowest loader instead of the sum.
+
+Against a database on the same machine the loaders compete for the same
+CPUs, so a single-core box shows little gain. --rtt-ms adds a sleep per
+connection and per statement to emulate a database across a network,
+where waiting rather than CPU dominates.
+"""
+import argparse
+import os
+import statistics
+import time
+import psycopg2
+import psycopg2.extensions
+import streamlit.logger
+from streamlit.runtime.scriptrunner_utils import script_run_context
+from database import db_manager
+from pages.lawyer.dashboard import load_dashboard_data
+from services.case_service import get_case_statistics, get_recent_case_updates
+from services.consultation_service import get_consultation_statistics, get_upcoming_consultations
+
+def remote_connection(rtt):
+    """Wrap get_pg_connection so connecting and each statement cost one round-trip"""
+    connect = db_manager.get_pg_connection
+
+    class RemoteCursor(psycopg2.extensions.cursor):
+        def execute(self, query, vars=None):
+            time.sleep(rtt)
+            return super().execute(query, vars)
+
+    def get_pg_connection():
+        time.sleep(rtt * 2)  # TCP handshake plus authentication
+        conn = connect()
+        if conn is not None:
+            conn.cursor_factory = RemoteCursor
+        return conn
+    return get_pg_connection
+
+def sample_lawyers(count):
+    conn = psycopg2.connect(os.environ["DATABASE_URL"])
+    try:
+        with conn.cursor() as cur:
+            cur.execute("SELECT user_id, id FROM lawyers ORDER BY md5(id::text) LIMIT %s", (count,))
+            return cur.fetchall()
+    finally:
+        conn.close()
+
+def load_sequentially(user_id, lawyer_id, loader_times):
+    """The dashboard's data path before fetch_all, timing each loader"""
+    for name, loader in (
+        ('case_stats', lambda: get_case_statistics(user_id, "Lawyer")),
+        ('consultation_stats', lambda: get_consultation_statistics(lawyer_id)),
+        ('recent_cases', lambda: get_recent_case_updates(user_id, limit=5)),
+        ('upcoming_appointments', lambda: get_upcoming_consultations(user_id, limit=5)),
+    ):
+        began = time.perf_counter()
+        loader()
+        loader_times.setdefault(name, []).append(time.perf_counter() - began)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--lawyers", type=int, default=20)
+    parser.add_argument("--rtt-ms", type=float, default=0, help="emulated network round-trip time")
+    args = parser.parse_args()
+
+    if not os.environ.get("DATABASE_URL"):
+        raise SystemExit("Set DATABASE_URL to a seeded PostgreSQL database")
+    streamlit.logger.get_logger(script_run_context.__name__).addFilter(
+        lambda record: "missing ScriptRunContext" not in record.getMessage()
+    )
+
+    lawyers = sample_lawyers(args.lawyers)
+    if args.rtt_ms:
+        db_manager.get_pg_connection = remote_connection(args.rtt_ms / 1000)
+    loader_times = {}
+    sequential, concurrent = [], []
+    for i in range(args.iterations):
+        user_id, lawyer_id = lawyers[i % len(lawyers)]
+
+        began = time.perf_counter()
+        load_sequentially(user_id, lawyer_id, loader_times)
+        sequential.append(time.perf_counter() - began)
+
+        began = time.perf_counter()
+        # No session identity here, so the loader looks lawyers.id up itself
+        load_dashboard_data(user_id)
+        concurrent.append(time.perf_counter() - began)
+
+    print(f"{args.iterations} dashboard loads over {len(lawyers)} lawyers, "
+          f"rtt {args.rtt_ms:g} ms (median ms)")
+    for name, times in loader_times.items():
+        print(f"  {name:<24} {statistics.median(times) * 1000:8.2f}")
+    slowest = max(statistics.median(times) for times in loader_times.values())
+    total = sum(statistics.median(times) for times in loader_times.values())
+    print(f"  {'sum of loaders':<24} {total * 1000:8.2f}")
+    print(f"  {'slowest loader':<24} {slowest * 1000:8.2f}")
+    print(f"sequential   {statistics.median(sequential) * 1000:8.2f} ms")
+    print(f"fetch_all    {statistics.median(concurrent) * 1000:8.2f} ms "
+          f"({statistics.median(sequential) / statistics.median(concurrent):.1f}x)")
+
+if __name__ == "__main__":
+    main()
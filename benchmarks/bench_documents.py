@@ -0,0 +1,101 @@
+"""Benchmark document storage memory: streamed upload, dedup re-upload and ranged download.
+
+Usage: DATABASE_URL=postgresql://... python -m benchmarks.bench_documents
+       [--size-mb 100] [--range-mb 4]
+
+Needs an initialised database (documents table). The upload is generated
+on the fly, so the benchmark itself never holds the file; tracemalloc's
+peak for each step is what the document pipeline adds on top of the
+caller's data. With streaming it stays near one chunk
+(DOCUMENT_SETTINGS["chunk_bytes"]) whatever --size-mb is.
+"""
+import argparse
+import os
+import time
+import tracemalloc
+import streamlit.logger
+from streamlit.runtime.scriptrunner_utils import script_run_context
+from database.db_manager import execute_query
+from services.document_service import get_case_documents, open_document, store_document
+
+class GeneratedFile:
+    """A read-only file of `size` pseudo-random bytes that exists only as it is read"""
+
+    def __init__(self, size, seed):
+        self._remaining = size
+        self._block = (seed.to_bytes(8, "big") * 8192)[:65536]
+        self.name = f"scan-{seed}.pdf"
+        self.type = "application/pdf"
+
+    def readinto(self, buffer):
+        count = min(len(buffer), self._remaining)
+        view = memoryview(buffer)
+        filled = 0
+        while filled < count:
+            step = min(len(self._block), count - filled)
+            view[filled:filled + step] = self._block[:step]
+            filled += step
+        self._remaining -= count
+        return count
+
+def measure(label, step):
+    tracemalloc.start()
+    began = time.perf_counter()
+    result = step()
+    seconds = time.perf_counter() - began
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<22} {seconds * 1000:9.1f} ms   peak {peak / 1024:9.1f} KiB")
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size-mb", type=int, default=100)
+    parser.add_argument("--range-mb", type=int, default=4)
+    args = parser.parse_args()
+
+    if not os.environ.get("DATABASE_URL"):
+        raise SystemExit("Set DATABASE_URL to an initialised PostgreSQL database")
+    streamlit.logger.get_logger(script_run_context.__name__).addFilter(
+        lambda record: "missing ScriptRunContext" not in record.getMessage()
+    )
+
+    case = execute_query("SELECT id, user_id FROM cases ORDER BY id LIMIT 1", fetch='one')
+    if not case:
+        raise SystemExit("Needs at least one case (python -m database.seeder)")
+    case_id, user_id = case
+    size = args.size_mb * 1024 * 1024
+    seed = int(time.time())
+
+    def upload():
+        source = GeneratedFile(size, seed)
+        return store_document(source, source.name, source.type, user_id, case_id=case_id)
+
+    print(f"{args.size_mb} MB document, case {case_id}")
+    for label in ("upload", "re-upload (dedup)"):
+        success, message = measure(label, upload)
+        if not success:
+            raise SystemExit(message)
+
+    document = get_case_documents(case_id)[0]
+    range_bytes = args.range_mb * 1024 * 1024
+    start = size // 2
+
+    def download(byte_range):
+        received = 0
+        with open_document(document, byte_range)['Body'] as body:
+            for chunk in body.iter_chunks():
+                received += len(chunk)
+        return received
+
+    received = measure("full download", lambda: download(None))
+    assert received == size, received
+    received = measure(f"range {args.range_mb} MB", lambda: download(f"bytes={start}-{start + range_bytes - 1}"))
+    assert received == range_bytes, received
+
+    copies = execute_query("SELECT COUNT(*) FROM documents WHERE sha256 = %s", (document.sha256,), fetch='one')[0]
+    print(f"{copies} document rows share one stored object ({document.sha256[:12]}…)")
+    execute_query("DELETE FROM documents WHERE sha256 = %s", (document.sha256,))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""Benchmark document text extraction throughput and its effect on page latency.
+
+Usage: DATABASE_URL=postgresql://... python -m benchmarks.bench_extraction
+       [--documents 20] [--pages 10] [--workers 1 2] [--probe-seconds 0]
+
+Needs a seeded database. Uploads --documents synthetic text PDFs of --pages
+pages each to one case, then drains the extraction queue with each worker
+count in turn (python -m services.document_jobs --once) and reports pages
+per second overall and per core in use. With --probe-seconds the main
+process times a lawyer search before and during extraction, showing how
+much the niced workers slow interactive queries. Scanned pages need
+tesseract and are not generated here.
+"""
+import argparse
+import io
+import os
+import statistics
+import threading
+import time
+import zlib
+import streamlit.logger
+from streamlit.runtime.scriptrunner_utils import script_run_context
+from database.db_manager import execute_query
+from services.document_jobs import run_workers
+from services.document_service import enqueue_job, store_document
+from services.lawyer_service import get_lawyers
+
+WORDS = ("complainant respondent petition affidavit hearing tribunal notice deed property "
+         "tenant landlord deposit FIR station accused bail summons decree appeal").split()
+
+def text_pdf(pages, lines_per_page, seed):
+    """A minimal PDF with a text layer; every page differs so no two documents dedupe"""
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", None, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for page in range(pages):
+        lines = []
+        for line in range(lines_per_page):
+            n = seed * 7919 + page * 104729 + line
+            words = " ".join(WORDS[(n * (i + 3)) % len(WORDS)] for i in range(10))
+            lines.append(f"BT /F1 10 Tf 50 {780 - line * 14} Td ({words} {n}) Tj ET")
+        stream = zlib.compress("\n".join(lines).encode())
+        objects.append(b"<< /Length %d /Filter /FlateDecode >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        objects.append(b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+                       b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % len(objects))
+        kids.append(len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (b" ".join(b"%d 0 R" % k for k in kids), pages)
+
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(out.tell())
+        out.write(b"%d 0 obj\n" % number + body + b"\nendobj\n")
+    xref = out.tell()
+    out.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    out.write(b"".join(b"%010d 00000 n \n" % offset for offset in offsets))
+    out.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref))
+    out.seek(0)
+    return out
+
+def probe_latency(seconds, stop=None):
+    """Time repeated lawyer searches (an interactive page's query) for `seconds`"""
+    timings = []
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline and not (stop and stop.is_set()):
+        began = time.perf_counter()
+        get_lawyers("Family Law")
+        timings.append(time.perf_counter() - began)
+    return timings
+
+def describe(timings):
+    if not timings:
+        return "no samples"
+    timings = sorted(timings)
+    return (f"p50 {statistics.median(timings) * 1000:.1f} ms, "
+            f"p95 {timings[int(len(timings) * 0.95)] * 1000:.1f} ms ({len(timings)} samples)")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--documents", type=int, default=20)
+    parser.add_argument("--pages", type=int, default=10)
+    parser.add_argument("--lines", type=int, default=50, help="text lines per page")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2])
+    parser.add_argument("--probe-seconds", type=float, default=0)
+    args = parser.parse_args()
+
+    if not os.environ.get("DATABASE_URL"):
+        raise SystemExit("Set DATABASE_URL to a seeded PostgreSQL database")
+    streamlit.logger.get_logger(script_run_context.__name__).addFilter(
+        lambda record: "missing ScriptRunContext" not in record.getMessage()
+    )
+
+    case = execute_query("SELECT id, user_id FROM cases ORDER BY id LIMIT 1", fetch='one')
+    if not case:
+        raise SystemExit("Needs at least one case (python -m database.seeder)")
+    case_id, user_id = case
+    run_seed = int(time.time())
+    for i in range(args.documents):
+        success, message = store_document(
+            text_pdf(args.pages, args.lines, run_seed * 1000 + i), f"bench-{i}.pdf", "application/pdf",
+            user_id, case_id=case_id
+        )
+        if not success:
+            raise SystemExit(message)
+    document_ids = [row[0] for row in execute_query(
+        "SELECT id FROM documents WHERE case_id = %s AND filename LIKE 'bench-%%' ORDER BY id DESC LIMIT %s",
+        (case_id, args.documents), fetch='all'
+    )]
+
+    cores = os.cpu_count() or 1
+    print(f"{args.documents} PDFs x {args.pages} pages, {cores} CPU(s)")
+    if args.probe_seconds:
+        print(f"  idle search latency     {describe(probe_latency(args.probe_seconds))}")
+
+    try:
+        for workers in args.workers:
+            for document_id in document_ids:
+                enqueue_job(document_id, 'extract')
+
+            stop = threading.Event()
+            probe = []
+            prober = threading.Thread(
+                target=lambda: probe.extend(probe_latency(args.probe_seconds, stop)), daemon=True
+            )
+            if args.probe_seconds:
+                prober.start()
+            began = time.perf_counter()
+            jobs, pages = run_workers(workers, ['extract'], once=True)
+            seconds = time.perf_counter() - began
+            stop.set()
+            if args.probe_seconds:
+                prober.join()
+
+            per_second = pages / seconds if seconds else 0
+            print(f"  workers={workers}: {jobs} jobs, {pages} pages in {seconds:.2f} s = "
+                  f"{per_second:.1f} pages/s, {per_second / min(workers, cores):.1f} pages/s/core")
+            if args.probe_seconds:
+                print(f"  search latency during   {describe(probe)}")
+    finally:
+        execute_query("DELETE FROM documents WHERE id = ANY(%s)", (document_ids,))
+
+if __name__ == "__main__":
+    main()
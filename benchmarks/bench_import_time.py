@@ -0,0 +1,76 @@
+"""Compare cold-start import cost of the lazy router against eager page imports.
+
+Usage: python -m benchmarks.bench_import_time [--runs 5] [--top 10]
+
+Each scenario runs in a fresh interpreter under `python -X importtime`.
+"lazy" imports the app entry modules as a cold start does now; "eager"
+additionally imports every registered page module, which is what the old
+router did at import time.
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ENTRY = "import main"
+SCENARIOS = {
+    "lazy": ENTRY,
+    "eager": ENTRY + "; import importlib, router; "
+             "[importlib.import_module(entry[0]) for entry in router.PAGE_REGISTRY.values()]",
+}
+
+def import_profile(code):
+    """Run `code` under -X importtime; returns {module: cumulative_us} and top-level total"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT, capture_output=True, text=True
+    )
+    modules = {}
+    total = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        modules[name.strip()] = int(cumulative)
+        if not name[1:].startswith(" "):  # top-level imports are not indented
+            total += int(cumulative)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    return modules, total
+
+def run(runs, top):
+    totals = {}
+    for name, code in SCENARIOS.items():
+        try:
+            samples = [import_profile(code) for _ in range(runs)]
+        except RuntimeError as e:
+            print(f"{name}: import failed ({e}); install requirements.txt first")
+            return
+        best_modules, best_total = min(samples, key=lambda sample: sample[1])
+        totals[name] = (best_modules, best_total)
+        print(f"{name:6s} cold start: {best_total / 1000:8.1f} ms  modules={len(best_modules)}")
+
+    lazy_modules, lazy_total = totals["lazy"]
+    eager_modules, eager_total = totals["eager"]
+    print(f"saved at startup: {(eager_total - lazy_total) / 1000:.1f} ms "
+          f"({1 - lazy_total / eager_total:.0%}), {len(eager_modules) - len(lazy_modules)} fewer modules")
+
+    deferred = sorted(
+        (name for name in eager_modules if name not in lazy_modules),
+        key=lambda name: eager_modules[name], reverse=True
+    )
+    print("slowest deferred imports:")
+    for name in deferred[:top]:
+        print(f"  {eager_modules[name] / 1000:8.1f} ms  {name}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+    run(args.runs, args.top)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Benchmark the marketplace row path: named-tuple records vs a pandas DataFrame.
+
+Usage: python -m benchmarks.bench_marketplace [--lawyers 1000 10000 100000]
+
+Each "render" maps cursor rows and formats every lawyer card's text, which
+is the per-rerun work of render_lawyers_list minus the widget calls. The
+DataFrame path (DataFrame + iterrows) is skipped when pandas is missing.
+"""
+import argparse
+import random
+import time
+import tracemalloc
+from datetime import datetime
+from decimal import Decimal
+from database.records import rows_to_records
+
+DESCRIPTION = [(name,) for name in (
+    "id", "user_id", "name", "email", "phone", "specialization", "experience",
+    "location", "rating", "fee_range", "languages", "username", "user_created_at"
+)]
+
+def synthetic_rows(count, seed=42):
+    """Rows shaped like get_lawyers' SELECT list"""
+    rng = random.Random(seed)
+    cities = ["Mumbai", "Delhi", "Bangalore", "Chennai", "Pune", "Hyderabad", "Kolkata"]
+    areas = ["Criminal Law", "Family Law", "Property Law", "Labour Law", "Consumer Protection"]
+    return [
+        (i, 10000 + i, f"Adv. Lawyer {i}", f"lawyer{i}@example.com", f"+91-98{i:08d}",
+         rng.choice(areas), rng.randint(1, 35), rng.choice(cities),
+         Decimal(f"{rng.uniform(3, 5):.2f}"), rng.choice(["₹500-1500", "₹1500-3000", None]),
+         "Hindi, English", f"lawyer_{i}", datetime(2024, 1, 1))
+        for i in range(count)
+    ]
+
+def card_text(name, specialization, rating, location, experience, languages, fee_range):
+    return (f"### {name}\n**{specialization}**\n⭐ {rating or 4.5}/5.0\n"
+            f"**📍 Location:** {location} | **💼 Experience:** {experience} years | "
+            f"**💬 Languages:** {languages}\n**💰 Fee Range:** {fee_range or '-'}")
+
+def render_records(rows):
+    lawyers = rows_to_records(DESCRIPTION, rows)
+    return sum(
+        len(card_text(lawyer.name, lawyer.specialization, lawyer.rating, lawyer.location,
+                      lawyer.experience, lawyer.languages, lawyer.fee_range))
+        for lawyer in lawyers
+    )
+
+def render_dataframe(rows):
+    import pandas as pd
+    lawyers_df = pd.DataFrame.from_records(rows, columns=[column[0] for column in DESCRIPTION])
+    return sum(
+        len(card_text(lawyer['name'], lawyer['specialization'], lawyer.get('rating', 4.5),
+                      lawyer['location'], lawyer['experience'], lawyer['languages'],
+                      lawyer.get('fee_range')))
+        for _, lawyer in lawyers_df.iterrows()
+    )
+
+def measure(func, rows):
+    """Return (seconds, peak bytes) for one render; memory is traced on a separate run"""
+    began = time.perf_counter()
+    func(rows)
+    elapsed = time.perf_counter() - began
+
+    tracemalloc.start()
+    func(rows)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lawyers", type=int, nargs="+", default=[1000, 10000, 100000])
+    args = parser.parse_args()
+
+    try:
+        import pandas  # noqa: F401
+        paths = {"records": render_records, "dataframe": render_dataframe}
+    except ImportError:
+        print("pandas not installed; timing the records path only")
+        paths = {"records": render_records}
+
+    for count in args.lawyers:
+        rows = synthetic_rows(count)
+        print(f"lawyers={count}")
+        for label, func in paths.items():
+            elapsed, peak = measure(func, rows)
+            print(f"  {label:<10} {elapsed * 1e3:9.1f} ms/render  {elapsed / count * 1e6:6.2f} us/row"
+                  f"  peak {peak / 1024 / 1024:7.1f} MiB")
+
+if __name__ == "__main__":
+    main()
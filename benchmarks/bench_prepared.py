@@ -0,0 +1,79 @@
+"""Benchmark hot service statements: a connection per call, a pooled connection, and pooled prepared statements.
+
+Usage: DATABASE_URL=postgresql://... python -m benchmarks.bench_prepared [--calls 500]
+
+Needs a seeded database. Runs each statement --calls times with varying
+ids in three ways: execute_query, which connects for every call; plain
+execute on a connection from the prepared-statement pool, isolating the
+pooling gain; and execute_prepared. Then prints the planning time each
+statement costs (EXPLAIN (SUMMARY)) and the planning time the prepared
+runs saved, as shown on the admin Diagnostics page.
+"""
+import argparse
+import time
+import streamlit.logger
+from streamlit.runtime.scriptrunner_utils import script_run_context
+from database.db_manager import execute_query
+from database.prepared import _get_pool, execute_prepared, prepared_stats
+
+# (label, statement, parameters for the nth call), as issued by the services
+STATEMENTS = [
+    ("unread count", "SELECT COUNT(*) FROM direct_messages WHERE receiver_id = %s AND read_at IS NULL",
+     lambda user_ids, n: (user_ids[n % len(user_ids)],)),
+    ("lawyer id", "SELECT id FROM lawyers WHERE user_id = %s",
+     lambda user_ids, n: (user_ids[n % len(user_ids)],)),
+    ("user lookup", "SELECT username, user_type, created_at FROM users WHERE id = %s",
+     lambda user_ids, n: (user_ids[n % len(user_ids)],)),
+    ("message fetch",
+     """SELECT id, sender_id, receiver_id, message, sent_at, read_at
+               FROM direct_messages
+               WHERE (sender_id = %s AND receiver_id = %s)
+                  OR (sender_id = %s AND receiver_id = %s)
+               ORDER BY sent_at ASC
+               LIMIT %s""",
+     lambda user_ids, n: (user_ids[n % len(user_ids)], user_ids[(n + 1) % len(user_ids)],
+                          user_ids[(n + 1) % len(user_ids)], user_ids[n % len(user_ids)], 50)),
+]
+
+def pooled(query, params, fetch):
+    """Plain execute on a pooled connection: pooling without preparation"""
+    connection_pool = _get_pool()
+    conn = connection_pool.getconn()
+    try:
+        with conn.cursor() as cur:
+            cur.execute(query, params)
+            result = cur.fetchall() if fetch == 'all' else cur.fetchone()
+        conn.commit()
+        return result
+    finally:
+        connection_pool.putconn(conn)
+
+MODES = [("connect", execute_query), ("pooled", pooled), ("prepared", execute_prepared)]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=500)
+    args = parser.parse_args()
+
+    streamlit.logger.get_logger(script_run_context.__name__).addFilter(
+        lambda record: "missing ScriptRunContext" not in record.getMessage()
+    )
+    user_ids = [row[0] for row in execute_query("SELECT id FROM users ORDER BY id LIMIT 200", fetch='all')]
+    print(f"{'statement':<15}" + "".join(f"{name:>14}" for name, _ in MODES) + "   (µs per call)")
+    for label, query, params in STATEMENTS:
+        timings = []
+        for _, run in MODES:
+            began = time.perf_counter()
+            for n in range(args.calls):
+                run(query, params(user_ids, n), 'all')
+            timings.append((time.perf_counter() - began) / args.calls)
+        print(f"{label:<15}" + "".join(f"{seconds * 1e6:14.0f}" for seconds in timings))
+
+    print()
+    for row in prepared_stats.snapshot():
+        planning = "n/a" if row['planning_ms'] is None else f"{row['planning_ms']:.3f} ms"
+        print(f"{row['query'][:60]:<60}  planning {planning:>10}  executions {row['executions']:>5}  "
+              f"prepares {row['prepares']}  saved {row['saved_ms']:.1f} ms")
+
+if __name__ == "__main__":
+    main()
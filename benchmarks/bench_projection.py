@@ -0,0 +1,71 @@
+"""Benchmark column-projected page queries against the previous SELECT l.* / a.* queries.
+
+Usage: DATABASE_URL=postgresql://... python -m benchmarks.bench_projection [--repeat 5]
+
+Needs a seeded database. For each page query, "before" is the previous
+statement selecting whole rows and "after" selects only the fields that
+page declares. Reports the rows' total size as Postgres measures it
+(pg_column_size of each result row) and the fastest of --repeat fetches
+through execute_query.
+"""
+import argparse
+import time
+import streamlit.logger
+from streamlit.runtime.scriptrunner_utils import script_run_context
+from database.db_manager import execute_query
+from pages.citizen.consultations import APPOINTMENT_REQUEST_FIELDS
+from pages.lawyer.lawyer_marketplace import LAWYER_FIELDS
+from pages.lawyer.lawyer_profile import PROFILE_FIELDS
+from services.appointment_service import CLIENT_APPOINTMENT
+from services.lawyer_service import LAWYER
+
+def page_queries():
+    """(page, before, after, params) for each page query"""
+    lawyer_user = execute_query("SELECT user_id FROM lawyers ORDER BY id LIMIT 1", fetch='one')
+    client = execute_query(
+        "SELECT client_id FROM appointments GROUP BY client_id ORDER BY count(*) DESC LIMIT 1", fetch='one'
+    )
+    lawyers_from = "FROM lawyers l JOIN users u ON l.user_id = u.id"
+    appointments_from = """FROM appointments a JOIN lawyers l ON a.lawyer_id = l.id
+                           WHERE a.client_id = %s ORDER BY a.appointment_date DESC, a.appointment_time DESC"""
+    return [
+        ("marketplace",
+         f"SELECT l.*, u.username, u.email, u.created_at {lawyers_from} WHERE l.verified = %s "
+         "ORDER BY l.rating DESC, l.experience DESC",
+         f"SELECT {LAWYER.select_list(LAWYER_FIELDS)} {lawyers_from} WHERE l.verified = %s "
+         "ORDER BY l.rating DESC, l.experience DESC",
+         (True,)),
+        ("lawyer profile",
+         f"SELECT l.*, u.username, u.created_at {lawyers_from} WHERE l.user_id = %s",
+         f"SELECT {LAWYER.select_list(PROFILE_FIELDS)} {lawyers_from} WHERE l.user_id = %s",
+         (lawyer_user[0] if lawyer_user else 0,)),
+        ("appointment requests",
+         f"SELECT a.*, l.name as lawyer_name, l.email as lawyer_email {appointments_from}",
+         f"SELECT {CLIENT_APPOINTMENT.select_list(APPOINTMENT_REQUEST_FIELDS)} {appointments_from}",
+         (client[0] if client else 0,)),
+    ]
+
+def measure(query, params, repeat):
+    size = execute_query(f"SELECT coalesce(sum(pg_column_size(t.*)), 0) FROM ({query}) t", params, fetch='one')[0]
+    timings, rows = [], []
+    for _ in range(repeat):
+        began = time.perf_counter()
+        rows = execute_query(query, params, fetch='all')
+        timings.append(time.perf_counter() - began)
+    return len(rows), size, min(timings)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5, help="Fetches per query; the fastest is reported")
+    args = parser.parse_args()
+
+    streamlit.logger.get_logger(script_run_context.__name__).addFilter(
+        lambda record: "missing ScriptRunContext" not in record.getMessage()
+    )
+    for page, before, after, params in page_queries():
+        for label, query in (("before", before), ("after", after)):
+            count, size, seconds = measure(query, params, args.repeat)
+            print(f"{page:<22} {label:<7} {count:>6} rows  {size / 1024:9.1f} KiB  {seconds * 1000:8.2f} ms")
+
+if __name__ == "__main__":
+    main()
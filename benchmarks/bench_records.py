@@ -0,0 +1,98 @@
+"""Benchmark row representations for card rendering: tuples, named-tuple records, __slots__ objects and dicts.
+
+Usage: python -m benchmarks.bench_records [--rows 100000] [--repeat 5]
+
+No database needed. Each representation is built from the same synthetic
+get_user_cases rows and described by cursor-style column names. "build" is
+the conversion from cursor rows, with the memory it retains measured on a
+separate traced run; "render" is the fastest of --repeat passes formatting
+every case card's text. "tuple + len" is the previous page code: positional
+indexing guarded by a len() check per field.
+"""
+import argparse
+import random
+import time
+import tracemalloc
+from datetime import datetime
+from database.records import record_type, rows_to_records
+
+COLUMNS = ("id", "user_id", "lawyer_id", "title", "description", "category", "status",
+           "priority", "created_at", "updated_at", "lawyer_name")
+DESCRIPTION = [(name,) for name in COLUMNS]
+
+class SlotsCase:
+    __slots__ = COLUMNS
+
+    def __init__(self, *values):
+        for name, value in zip(COLUMNS, values):
+            setattr(self, name, value)
+
+def synthetic_rows(count, seed=7):
+    """Rows shaped like get_user_cases' SELECT list"""
+    rng = random.Random(seed)
+    statuses = ["Open", "In Progress", "Closed", "Pending"]
+    return [
+        (i, 1000 + i % 500, rng.choice([None, 7, 9]), f"Case {i}", "Boundary dispute with neighbour",
+         rng.choice(["Civil", "Family", "Criminal"]), rng.choice(statuses), rng.choice(["Low", "High"]),
+         datetime(2024, 1, 1), None, rng.choice([None, "adv_sharma"]))
+        for i in range(count)
+    ]
+
+def card(title, status, category, priority, description, lawyer_name, created_at):
+    return (f"{title} [{status}] {category} | {priority} | {description} | "
+            f"{lawyer_name or 'Not assigned'} | {created_at}")
+
+def render_tuple(cases):
+    return sum(len(card(
+        case[3] if len(case) > 3 else "No Title", case[6] if len(case) > 6 else "Pending",
+        case[5] if len(case) > 5 else "Unknown", case[7] if len(case) > 7 else "Low",
+        case[4] if len(case) > 4 else "No Description", case[10] if len(case) > 10 else None,
+        case[8] if len(case) > 8 else "Unknown",
+    )) for case in cases)
+
+def render_attributes(cases):
+    return sum(len(card(case.title, case.status, case.category, case.priority, case.description,
+                        case.lawyer_name, case.created_at)) for case in cases)
+
+def render_dict(cases):
+    return sum(len(card(case['title'], case['status'], case['category'], case['priority'],
+                        case['description'], case['lawyer_name'], case['created_at'])) for case in cases)
+
+REPRESENTATIONS = {
+    'tuple + len': (lambda rows: list(rows), render_tuple),
+    'record': (lambda rows: rows_to_records(DESCRIPTION, rows), render_attributes),
+    '__slots__': (lambda rows: [SlotsCase(*row) for row in rows], render_attributes),
+    'dict': (lambda rows: [dict(zip(COLUMNS, row)) for row in rows], render_dict),
+}
+
+def timed(func, cases):
+    began = time.perf_counter()
+    func(cases)
+    return time.perf_counter() - began
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=5, help="Render passes; the fastest is reported")
+    args = parser.parse_args()
+
+    rows = synthetic_rows(args.rows)
+    record_type(COLUMNS)  # The class is built once per column set; keep that out of the timings
+    print(f"{args.rows} rows")
+    for name, (build, render) in REPRESENTATIONS.items():
+        tracemalloc.start()
+        traced = build(rows)
+        retained, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del traced
+
+        began = time.perf_counter()
+        cases = build(rows)
+        build_seconds = time.perf_counter() - began
+        render_seconds = min(timed(render, cases) for _ in range(args.repeat))
+        print(f"{name:<12} build {build_seconds * 1000:8.1f} ms  {retained / 2**20:7.1f} MiB   "
+              f"render {render_seconds * 1000:8.1f} ms")
+        del cases
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Benchmark free-slot search and overlap checks for busy lawyers.
+
+Usage: python -m benchmarks.bench_scheduling [--appointments 5000] [--lookups 2000]
+"""
+import argparse
+import random
+import timeit
+from datetime import datetime, timedelta, time
+from utils.intervals import BookedIntervals, find_free_slots
+
+def build_bookings(count, start, rng):
+    """Generate `count` non-overlapping bookings inside working hours"""
+    bookings = []
+    day = start.date()
+    while len(bookings) < count:
+        cursor = datetime.combine(day, time(9, 0))
+        closes = datetime.combine(day, time(18, 30))
+        while cursor < closes and len(bookings) < count:
+            length = timedelta(minutes=rng.choice([30, 30, 60, 90]))
+            if rng.random() < 0.7 and cursor + length <= closes:
+                bookings.append((cursor, cursor + length))
+            cursor += length
+        day += timedelta(days=1)
+    return bookings
+
+def run(appointments, lookups, seed=42):
+    rng = random.Random(seed)
+    now = datetime(2025, 1, 6, 8, 0)
+    bookings = build_bookings(appointments, now, rng)
+    span = (bookings[-1][1] - now).total_seconds()
+
+    build_time = timeit.timeit(lambda: BookedIntervals(bookings), number=10) / 10
+    booked = BookedIntervals(bookings)
+    probes = [now + timedelta(seconds=rng.uniform(0, span)) for _ in range(lookups)]
+
+    def search():
+        for probe in probes:
+            find_free_slots(booked, probe, timedelta(minutes=60), 5,
+                            time(9, 0), time(18, 30), timedelta(minutes=30),
+                            break_start=time(13, 0), break_end=time(14, 0),
+                            working_days={0, 1, 2, 3, 4, 5})
+
+    def overlap():
+        for probe in probes:
+            booked.overlaps(probe, probe + timedelta(minutes=30))
+
+    search_time = min(timeit.repeat(search, number=1, repeat=5)) / lookups
+    overlap_time = min(timeit.repeat(overlap, number=1, repeat=5)) / lookups
+
+    print(f"appointments={len(bookings)} merged_intervals={len(booked)} span_days={span / 86400:.0f}")
+    print(f"  build index:           {build_time * 1e3:8.2f} ms")
+    print(f"  next 5 free 1h slots:  {search_time * 1e6:8.2f} us/lookup")
+    print(f"  overlap check:         {overlap_time * 1e6:8.2f} us/check")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--appointments", type=int, nargs="+", default=[1000, 5000, 20000])
+    parser.add_argument("--lookups", type=int, default=2000)
+    args = parser.parse_args()
+    for count in args.appointments:
+        run(count, args.lookups)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Benchmark the styling bytes each rerun sends: per-run inline CSS versus the once-per-session theme.
+
+Usage: python -m benchmarks.bench_styles [--cards 20] [--reruns 5]
+
+No database needed. Renders a page of case cards with status badges and
+chat bubbles through Streamlit's AppTest and sums the serialized size of
+every element the script emits, for the first run of a session and for the
+reruns after it. "before" reproduces the previous markup: the raw
+stylesheets sent through st.markdown on every run and inline style
+attributes on every card; "after" is config.styles.apply_custom_styles
+with the class-based components.
+"""
+import argparse
+import streamlit.logger
+from streamlit.runtime.scriptrunner_utils import script_run_context
+from streamlit.testing.v1 import AppTest
+
+# The per-card markup the components used before they moved to classes
+LEGACY_CARD = '<div style="border: 1px solid #ddd; padding: 15px; margin: 10px 0; border-radius: 10px; background-color: #212529;">'
+LEGACY_BADGE = '<span style="background-color: {color}; color: white; padding: 3px 8px; border-radius: 15px; font-size: 12px;">{label}</span>'
+LEGACY_BUBBLE = ('<div style="background-color: #007bff; color: white; padding: 10px; border-radius: 15px; margin: 5px 0; '
+                 'text-align: left;">{message}<br><small style="opacity: 0.8;">{timestamp}</small></div>')
+
+def page_before():
+    import os
+    import streamlit as st
+    from config.settings import THEME_SETTINGS
+    from config.styles import STATUS_COLORS
+    from benchmarks.bench_styles import LEGACY_BADGE, LEGACY_BUBBLE, LEGACY_CARD
+
+    sources = []
+    for name in THEME_SETTINGS["files"]:
+        with open(os.path.join(THEME_SETTINGS["source_dir"], name), encoding="utf-8") as handle:
+            sources.append(handle.read())
+    st.markdown(f"<style>{''.join(sources)}</style>", unsafe_allow_html=True)
+
+    for index in range(st.session_state.cards):
+        status = list(STATUS_COLORS)[index % len(STATUS_COLORS)]
+        badge = LEGACY_BADGE.format(color=STATUS_COLORS[status], label=status)
+        st.markdown(f"""{LEGACY_CARD}<h4>Case {index} {badge}</h4>
+            <p><strong>Category:</strong> Civil</p><p><strong>Description:</strong> Boundary dispute</p></div>""",
+                    unsafe_allow_html=True)
+        st.markdown(LEGACY_BUBBLE.format(message=f"Message {index}", timestamp="10:30"), unsafe_allow_html=True)
+
+def page_after():
+    import streamlit as st
+    from config.styles import STATUS_COLORS, apply_custom_styles
+    from components.ui_components import render_case_card
+    from database.records import record_type
+
+    Case = record_type(("id", "title", "description", "category", "status", "priority"))
+    apply_custom_styles()
+    for index in range(st.session_state.cards):
+        status = list(STATUS_COLORS)[index % len(STATUS_COLORS)]
+        render_case_card(Case(index, f"Case {index}", "Boundary dispute", "Civil", status, "Medium"), show_actions=False)
+        st.markdown(f'<div class="chat-bubble sent">Message {index}<br><small>10:30</small></div>',
+                    unsafe_allow_html=True)
+
+def payload_bytes(node):
+    """Serialized size of every element under an AppTest tree node"""
+    total = 0
+    proto = getattr(node, 'proto', None)
+    if proto is not None and not getattr(node, 'children', None):
+        total += len(proto.SerializeToString())
+    for child in getattr(node, 'children', {}).values():
+        total += payload_bytes(child)
+    return total
+
+def measure(label, page, cards, reruns):
+    app = AppTest.from_function(page)
+    app.session_state.cards = cards
+    first = payload_bytes(app.run()._tree)
+    later = [payload_bytes(app.run()._tree) for _ in range(reruns)]
+    steady = sum(later) / len(later)
+    print(f"{label:<8} first run {first / 1024:8.1f} KiB   each rerun {steady / 1024:8.1f} KiB")
+    return steady
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cards", type=int, default=20)
+    parser.add_argument("--reruns", type=int, default=5)
+    args = parser.parse_args()
+
+    streamlit.logger.get_logger(script_run_context.__name__).addFilter(
+        lambda record: "missing ScriptRunContext" not in record.getMessage()
+    )
+
+    before = measure("before", page_before, args.cards, args.reruns)
+    after = measure("after", page_after, args.cards, args.reruns)
+    print(f"{args.cards} cards: {before - after:.0f} bytes ({1 - after / before:.0%}) less per rerun")
+
+if __name__ == "__main__":
+    main()
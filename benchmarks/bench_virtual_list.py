@@ -0,0 +1,71 @@
+"""Benchmark long card lists: one card and a row of buttons per row versus the windowed virtual list.
+
+Usage: python -m benchmarks.bench_virtual_list [--rows 1000 10000] [--reruns 3]
+
+No database needed. Renders synthetic marketplace lawyers through
+Streamlit's AppTest and reports script time and the serialized size of the
+elements each rerun sends. "before" is the previous per-row layout: a card
+and four action buttons for every lawyer. "after" is
+components.virtual_list with the marketplace's card and actions, so its
+cost follows VIRTUAL_LIST_SETTINGS["page_size"] rather than the row count.
+"""
+import argparse
+import time
+import streamlit.logger
+from streamlit.runtime.scriptrunner_utils import script_run_context
+from streamlit.testing.v1 import AppTest
+from benchmarks.bench_marketplace import DESCRIPTION, synthetic_rows
+from benchmarks.bench_styles import payload_bytes
+from database.records import rows_to_records
+
+def page_before():
+    import streamlit as st
+    from pages.lawyer.lawyer_marketplace import lawyer_card_html
+
+    for lawyer in st.session_state.lawyers:
+        st.markdown(lawyer_card_html(lawyer), unsafe_allow_html=True)
+        for column, label in zip(st.columns(4), ["📅 Book Consultation", "👤 View Profile", "💬 Start Chat", "📞 Contact Info"]):
+            with column:
+                st.button(label, key=f"{label}_{lawyer.id}")
+
+def page_after():
+    import streamlit as st
+    from components.virtual_list import render_virtual_list
+    from pages.lawyer.lawyer_marketplace import lawyer_card_html, render_lawyer_actions
+
+    render_virtual_list(
+        "bench_lawyers", st.session_state.lawyers, row_id=lambda lawyer: lawyer.id, row_html=lawyer_card_html,
+        row_label=lambda lawyer: lawyer.name, render_actions=render_lawyer_actions
+    )
+
+def measure(label, page, lawyers, reruns):
+    app = AppTest.from_function(page, default_timeout=600)
+    app.session_state.lawyers = lawyers
+    timings, sizes = [], []
+    for _ in range(reruns):
+        began = time.perf_counter()
+        app.run()
+        timings.append(time.perf_counter() - began)
+        sizes.append(payload_bytes(app._tree))
+    seconds, size = min(timings), sum(sizes) / len(sizes)
+    print(f"{len(lawyers):>7} rows {label:<7} {seconds * 1000:10.1f} ms   {size / 1024:10.1f} KiB per rerun")
+    return seconds, size
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--reruns", type=int, default=3)
+    args = parser.parse_args()
+
+    streamlit.logger.get_logger(script_run_context.__name__).addFilter(
+        lambda record: "missing ScriptRunContext" not in record.getMessage()
+    )
+    for count in args.rows:
+        lawyers = rows_to_records(DESCRIPTION, synthetic_rows(count))
+        before_seconds, before_size = measure("before", page_before, lawyers, args.reruns)
+        after_seconds, after_size = measure("after", page_after, lawyers, args.reruns)
+        print(f"{count:>7} rows: {before_seconds / after_seconds:.0f}x faster, "
+              f"{before_size / after_size:.0f}x smaller")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,388 @@
+"""Concurrent load test with mixed citizen, lawyer and admin sessions.
+
+Usage: DATABASE_URL=postgresql://... python -m benchmarks.load_test
+       [--users 50] [--duration 60] [--mix citizen=70,lawyer=25,admin=5]
+       [--think 0.5] [--mode service|apptest] [--output results.json]
+
+Run it against a database filled by `python -m database.seeder`: virtual
+users log in as seed_<id> accounts. Each one loops through its persona's
+actions with a random think time in between, until --duration runs out.
+
+--mode service calls the service layer directly from a thread per user,
+which measures the database and Python work of each action. --mode apptest
+runs main.py through Streamlit's AppTest instead, with one process and
+script session per user. That includes the full rerun (sidebar, page,
+footer) but costs far more client CPU and memory, so use fewer users.
+
+The report covers throughput, per-action latency percentiles, error rates
+and PostgreSQL connections: opened by the app, plus the peak and mean
+backends seen in pg_stat_activity.
+"""
+import argparse
+import json
+import os
+import random
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import psycopg2
+import streamlit as st
+import streamlit.logger
+from streamlit.runtime.scriptrunner_utils import script_run_context
+from benchmarks.service_suite import percentile
+from database import db_manager, prepared, seeder
+from services.case_service import (
+    assign_case_to_lawyer, create_case, get_available_cases, get_case_statistics,
+    get_lawyer_cases, get_user_cases
+)
+from services.chatbot_service import get_legal_response, save_chat_message
+from services.consultation_service import get_consultation_statistics, get_upcoming_consultations
+from services.lawyer_service import get_all_lawyers_for_admin, get_lawyers
+from services.messaging_service import (
+    get_messages, get_unread_message_count, get_user_conversations, send_message
+)
+from utils.auth_manager import authenticate_user
+from config.settings import LEGAL_CATEGORIES, MAJOR_CITIES, CASE_PRIORITIES
+
+# Pages each persona clicks through in apptest mode
+PERSONA_PAGES = {
+    "citizen": ["Home", "Lawyers", "Chatbot", "Cases", "Consultations", "Messages"],
+    "lawyer": ["LawyerDashboard", "AvailableCases", "LawyerCases", "LawyerAppointments", "Messages"],
+    "admin": ["AdminDashboard", "AdminLawyers", "AdminAnalytics", "AdminDiagnostics"],
+}
+
+USER_TYPES = {"citizen": "Citizen", "lawyer": "Lawyer", "admin": "Legal Aid Worker"}
+
+MAIN_SCRIPT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "main.py")
+
+_connections = {'opened': 0}
+_connections_lock = threading.Lock()
+_action_errors = threading.local()
+
+def counting_connection():
+    """Drop-in for db_manager.get_pg_connection that counts new connections"""
+    with _connections_lock:
+        _connections['opened'] += 1
+    return psycopg2.connect(os.environ["DATABASE_URL"])
+
+class CountingPreparedConnection(prepared.PreparedConnection):
+    """Pooled connection for execute_prepared that counts new connections"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        with _connections_lock:
+            _connections['opened'] += 1
+
+def report_error(message, *args, **kwargs):
+    """Stand-in for st.error that charges the message to the running action"""
+    errors = getattr(_action_errors, "messages", None)
+    if errors is not None:
+        errors.append(str(message))
+
+def load_accounts(dsn, limit=2000):
+    """Seeded citizens and lawyers as dicts with the ids each persona needs"""
+    conn = psycopg2.connect(dsn)
+    try:
+        with conn.cursor() as cur:
+            cur.execute(
+                """SELECT id, username FROM users
+                   WHERE user_type = 'Citizen' AND username LIKE 'seed\\_%%'
+                   ORDER BY random() LIMIT %s""", (limit,)
+            )
+            citizens = [{'user_id': row[0], 'username': row[1]} for row in cur.fetchall()]
+            cur.execute(
+                """SELECT u.id, u.username, l.id FROM lawyers l JOIN users u ON u.id = l.user_id
+                   WHERE u.username LIKE 'seed\\_%%' ORDER BY random() LIMIT %s""", (limit,)
+            )
+            lawyers = [{'user_id': row[0], 'username': row[1], 'lawyer_id': row[2]} for row in cur.fetchall()]
+    finally:
+        conn.close()
+    if not citizens or not lawyers:
+        raise SystemExit("No seed_<id> accounts found; run python -m database.seeder first")
+    return {'citizen': citizens, 'lawyer': lawyers, 'admin': [{'user_id': None, 'username': 'admin'}]}
+
+# Service-mode actions, each called as action(account, accounts, rng)
+
+def citizen_browse_lawyers(account, accounts, rng):
+    get_lawyers(rng.choice(["All"] + LEGAL_CATEGORIES), rng.choice(["All"] + MAJOR_CITIES), "All")
+
+def citizen_ask_chatbot(account, accounts, rng):
+    language = rng.choice(list(seeder.QUESTIONS))
+    question = rng.choice(seeder.QUESTIONS[language])
+    save_chat_message(account['user_id'], question, get_legal_response(question, language), language)
+
+def citizen_file_case(account, accounts, rng):
+    ok, message = create_case(account['user_id'], "Load test case", "Filed by benchmarks.load_test",
+                              rng.choice(LEGAL_CATEGORIES), rng.choice(CASE_PRIORITIES))
+    if not ok:
+        report_error(message)
+
+def citizen_view_cases(account, accounts, rng):
+    get_user_cases(account['user_id'])
+    get_case_statistics(account['user_id'], "Citizen")
+
+def message_someone(account, other):
+    send_message(account['user_id'], other['user_id'], "Load test message")
+    get_messages(account['user_id'], other['user_id'])
+
+def citizen_message_lawyer(account, accounts, rng):
+    message_someone(account, rng.choice(accounts['lawyer']))
+
+def lawyer_message_client(account, accounts, rng):
+    message_someone(account, rng.choice(accounts['citizen']))
+
+def check_inbox(account, accounts, rng):
+    get_user_conversations(account['user_id'])
+    get_unread_message_count(account['user_id'])
+
+def lawyer_dashboard(account, accounts, rng):
+    get_case_statistics(account['user_id'], "Lawyer")
+    # consultations.lawyer_id holds lawyers.id
+    get_consultation_statistics(account['lawyer_id'])
+    get_upcoming_consultations(account['user_id'])
+
+def lawyer_claim_case(account, accounts, rng):
+    cases = get_available_cases()
+    if cases:
+        ok, message = assign_case_to_lawyer(rng.choice(cases)[0], account['user_id'])
+        if not ok:
+            report_error(message)
+
+def lawyer_view_cases(account, accounts, rng):
+    get_lawyer_cases(account['user_id'])
+
+def admin_analytics(account, accounts, rng):
+    get_all_lawyers_for_admin()
+    get_available_cases()
+
+# Persona -> (weight, action name, action)
+PERSONAS = {
+    "citizen": [
+        (30, "browse_lawyers", citizen_browse_lawyers),
+        (20, "ask_chatbot", citizen_ask_chatbot),
+        (5, "file_case", citizen_file_case),
+        (15, "view_cases", citizen_view_cases),
+        (15, "message_lawyer", citizen_message_lawyer),
+        (15, "check_inbox", check_inbox),
+    ],
+    "lawyer": [
+        (25, "dashboard", lawyer_dashboard),
+        (15, "claim_case", lawyer_claim_case),
+        (20, "my_cases", lawyer_view_cases),
+        (20, "message_client", lawyer_message_client),
+        (20, "check_inbox", check_inbox),
+    ],
+    "admin": [
+        (1, "analytics", admin_analytics),
+    ],
+}
+
+class Recorder:
+    """Collects (persona, action, seconds, errors) from every virtual user"""
+
+    def __init__(self):
+        self.samples = []
+        self._lock = threading.Lock()
+
+    def timed(self, persona, action, function, *args):
+        _action_errors.messages = []
+        began = time.perf_counter()
+        try:
+            function(*args)
+        except Exception as e:
+            _action_errors.messages.append(f"{type(e).__name__}: {e}")
+        elapsed = time.perf_counter() - began
+        errors, _action_errors.messages = _action_errors.messages, None
+        with self._lock:
+            self.samples.append((persona, action, elapsed, errors))
+
+def run_service_user(persona, account, accounts, recorder, deadline, think, seed):
+    """One virtual user calling services directly until the deadline"""
+    rng = random.Random(seed)
+    weights, names, actions = zip(*PERSONAS[persona])
+    if account['user_id'] is not None:
+        recorder.timed(persona, "login", authenticate_user, account['username'], seeder.SEED_PASSWORD)
+    while time.time() < deadline:
+        index = rng.choices(range(len(actions)), weights)[0]
+        recorder.timed(persona, names[index], actions[index], account, accounts, rng)
+        time.sleep(rng.uniform(0, 2 * think))
+
+def run_apptest_user(persona, account, deadline, think, seed):
+    """
+    One virtual Streamlit session rerunning main.py page after page.
+    Runs in its own process (AppTest sessions sharing a process can stall
+    each other) and returns the samples it recorded.
+    """
+    from streamlit.testing.v1 import AppTest
+
+    recorder = Recorder()
+    rng = random.Random(seed)
+    app = AppTest.from_file(MAIN_SCRIPT, default_timeout=120)
+    app.session_state.authenticated = True
+    app.session_state.user_type = USER_TYPES[persona]
+    app.session_state.user_id = account['user_id']
+    app.session_state.username = account['username']
+    if account.get('lawyer_id'):
+        app.session_state.lawyer_id = account['lawyer_id']
+
+    while time.time() < deadline:
+        page = rng.choice(PERSONA_PAGES[persona])
+        app.session_state.current_page = page
+
+        def rerun():
+            app.run()
+            if app.exception:
+                _action_errors.messages.extend(element.value for element in app.exception)
+            _action_errors.messages.extend(f"st.error: {element.value}" for element in app.error)
+
+        recorder.timed(persona, f"page:{page}", rerun)
+        time.sleep(rng.uniform(0, 2 * think))
+    return recorder.samples
+
+def watch_connections(dsn, stop, interval=0.5):
+    """Poll pg_stat_activity for this database; returns the collected samples"""
+    samples = []
+    conn = psycopg2.connect(dsn)
+    conn.autocommit = True
+    try:
+        with conn.cursor() as cur:
+            while not stop.wait(interval):
+                cur.execute(
+                    """SELECT count(*), count(*) FILTER (WHERE state = 'active')
+                       FROM pg_stat_activity
+                       WHERE datname = current_database() AND pid <> pg_backend_pid()"""
+                )
+                samples.append(cur.fetchone())
+    finally:
+        conn.close()
+    return samples
+
+def summarize(samples, elapsed):
+    """Per-action and overall latency/error figures"""
+    by_action = defaultdict(list)
+    for persona, action, seconds, errors in samples:
+        by_action[(persona, action)].append((seconds, errors))
+
+    def describe(entries):
+        if not entries:
+            # A short run, or one where no persona got past login
+            return {'count': 0, 'throughput_per_s': 0.0, 'p50_ms': 0.0, 'p95_ms': 0.0,
+                    'p99_ms': 0.0, 'max_ms': 0.0, 'error_rate': 0.0}
+        timings = sorted(seconds for seconds, _ in entries)
+        failed = sum(1 for _, errors in entries if errors)
+        return {
+            'count': len(entries),
+            'throughput_per_s': round(len(entries) / elapsed, 2),
+            'p50_ms': round(percentile(timings, 0.50) * 1000, 2),
+            'p95_ms': round(percentile(timings, 0.95) * 1000, 2),
+            'p99_ms': round(percentile(timings, 0.99) * 1000, 2),
+            'max_ms': round(timings[-1] * 1000, 2),
+            'error_rate': round(failed / len(entries), 4),
+        }
+
+    actions = {f"{persona}/{action}": describe(entries) for (persona, action), entries in sorted(by_action.items())}
+    overall = describe([(seconds, errors) for _, _, seconds, errors in samples])
+    first_errors = [f"{persona}/{action}: {errors[0].splitlines()[0]}" for persona, action, _, errors in samples if errors][:5]
+    return overall, actions, first_errors
+
+def parse_mix(text):
+    """Parse 'citizen=70,lawyer=25,admin=5' into normalized weights"""
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        if name.strip() not in PERSONAS:
+            raise argparse.ArgumentTypeError(f"unknown persona {name!r}")
+        mix[name.strip()] = float(weight)
+    return mix
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=50, help="concurrent virtual users")
+    parser.add_argument("--duration", type=float, default=60, help="seconds of load")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix("citizen=70,lawyer=25,admin=5"))
+    parser.add_argument("--think", type=float, default=0.5, help="mean pause between actions in seconds")
+    parser.add_argument("--mode", choices=["service", "apptest"], default="service")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="write JSON results to this file")
+    args = parser.parse_args()
+
+    dsn = os.environ.get("DATABASE_URL")
+    if not dsn:
+        raise SystemExit("Set DATABASE_URL to a seeded PostgreSQL database")
+
+    # Services touch st.* outside a script run; drop the bare-mode warning
+    streamlit.logger.get_logger(script_run_context.__name__).addFilter(
+        lambda record: "missing ScriptRunContext" not in record.getMessage()
+    )
+    accounts = load_accounts(dsn)
+    rng = random.Random(args.seed)
+    personas = rng.choices(list(args.mix), list(args.mix.values()), k=args.users)
+
+    if args.mode == "service":
+        db_manager.get_pg_connection = counting_connection
+        prepared.connection_factory = CountingPreparedConnection
+        st.error = report_error
+
+    stop = threading.Event()
+    with ThreadPoolExecutor(max_workers=1) as monitor:
+        connection_samples = monitor.submit(watch_connections, dsn, stop)
+        recorder = Recorder()
+        began = time.time()
+        deadline = began + args.duration
+        print(f"{args.users} {args.mode} users for {args.duration:.0f} s: "
+              + ", ".join(f"{personas.count(name)} {name}" for name in args.mix))
+        users = [(persona, rng.choice(accounts[persona]), args.seed * 100003 + index)
+                 for index, persona in enumerate(personas)]
+
+        if args.mode == "service":
+            with ThreadPoolExecutor(max_workers=args.users, thread_name_prefix="vuser") as pool:
+                futures = [pool.submit(run_service_user, persona, account, accounts, recorder,
+                                       deadline, args.think, seed) for persona, account, seed in users]
+                for future in futures:
+                    future.result()
+        else:
+            with ProcessPoolExecutor(max_workers=args.users) as pool:
+                futures = [pool.submit(run_apptest_user, persona, account, deadline, args.think, seed)
+                           for persona, account, seed in users]
+                for future in futures:
+                    recorder.samples.extend(future.result())
+        elapsed = time.time() - began
+        stop.set()
+        connections = connection_samples.result()
+
+    overall, actions, first_errors = summarize(recorder.samples, elapsed)
+    backends = [total for total, _ in connections] or [0]
+    active = [busy for _, busy in connections] or [0]
+    database = {
+        'connections_opened': _connections['opened'] if args.mode == "service" else None,
+        'connections_opened_per_s': round(_connections['opened'] / elapsed, 1) if args.mode == "service" else None,
+        'backends_peak': max(backends),
+        'backends_mean': round(sum(backends) / len(backends), 1),
+        'active_peak': max(active),
+        'active_mean': round(sum(active) / len(active), 1),
+    }
+
+    print(f"\n{'action':<32} {'count':>7} {'ops/s':>7} {'p50':>8} {'p95':>8} {'p99':>8} {'errors':>7}")
+    for name, result in list(actions.items()) + [("overall", overall)]:
+        print(f"{name:<32} {result['count']:>7} {result['throughput_per_s']:>7.1f} {result['p50_ms']:>8.1f} "
+              f"{result['p95_ms']:>8.1f} {result['p99_ms']:>8.1f} {result['error_rate']:>7.1%}")
+    print("\ndatabase: " + ", ".join(f"{key} {value}" for key, value in database.items() if value is not None))
+    for message in first_errors:
+        print(f"error: {message}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            json.dump({
+                'settings': {'users': args.users, 'duration': args.duration, 'mix': args.mix,
+                             'think': args.think, 'mode': args.mode, 'seed': args.seed},
+                'elapsed_seconds': round(elapsed, 2),
+                'overall': overall,
+                'actions': actions,
+                'database': database,
+                'errors': first_errors,
+            }, handle, indent=2)
+        print(f"results written to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,304 @@
+"""End-to-end latency and query-count benchmarks for service-layer hot paths.
+
+Usage: DATABASE_URL=postgresql://... python -m benchmarks.service_suite
+       [--scales small medium] [--iterations 200] [--output results.json]
+       [--baseline baseline.json] [--tolerance 0.25] [--min-delta-ms 1] [--reseed]
+
+For every scale a database named legal_aid_bench_<scale> is created next to
+DATABASE_URL and seeded with database.seeder (skipped when it already
+exists, unless --reseed). Each case then runs against it with a counting
+cursor, and p50/p95/p99 latency plus queries and connections per call are
+written as JSON. With --baseline the run fails (exit 1) when a latency
+percentile grows beyond the tolerance or a case issues more queries than
+the baseline recorded. No baseline ships with the repo: record one on your
+own hardware with --output and pass it back with --baseline.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+import psycopg2
+import psycopg2.extensions
+import streamlit as st
+import streamlit.logger
+from streamlit.runtime.scriptrunner_utils import script_run_context
+from database import db_manager, prepared, seeder
+from services.case_service import get_available_cases, get_case_statistics
+from services.chatbot_service import get_legal_response
+from services.consultation_service import get_consultation_statistics
+from services.lawyer_service import get_lawyers
+from services.messaging_service import get_messages, get_user_conversations
+from utils.auth_manager import authenticate_user
+
+SCALES = {
+    "small": dict(citizens=1000, lawyers=100, cases=2000, consultations=5000, messages=10000, chats=5000),
+    "medium": dict(citizens=10000, lawyers=1000, cases=20000, consultations=50000, messages=100000, chats=50000),
+    "large": dict(citizens=100000, lawyers=10000, cases=200000, consultations=500000, messages=1000000, chats=500000),
+}
+
+PERCENTILES = ("p50_ms", "p95_ms", "p99_ms")
+
+# Counters bumped by the instrumented connections below
+_counts = {'queries': 0, 'connections': 0}
+
+class CountingCursor(psycopg2.extensions.cursor):
+    def execute(self, query, vars=None):
+        _counts['queries'] += 1
+        return super().execute(query, vars)
+
+def counting_connection():
+    """Drop-in for db_manager.get_pg_connection that counts connects and statements"""
+    _counts['connections'] += 1
+    return psycopg2.connect(os.environ["DATABASE_URL"], cursor_factory=CountingCursor)
+
+class CountingPreparedConnection(prepared.PreparedConnection):
+    """Pooled connection for execute_prepared that counts connects and statements"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.cursor_factory = CountingCursor
+        _counts['connections'] += 1
+
+def ensure_database(admin_dsn, scale, reseed):
+    """Create and seed the database for a scale; returns its DSN"""
+    name = f"legal_aid_bench_{scale}"
+    dsn = psycopg2.extensions.make_dsn(admin_dsn, dbname=name)
+
+    admin = psycopg2.connect(admin_dsn)
+    admin.autocommit = True
+    try:
+        with admin.cursor() as cur:
+            cur.execute("SELECT 1 FROM pg_database WHERE datname = %s", (name,))
+            exists = cur.fetchone() is not None
+            if exists and not reseed:
+                return dsn
+            if exists:
+                cur.execute(f"DROP DATABASE {name}")
+            cur.execute(f"CREATE DATABASE {name} TEMPLATE template0 ENCODING 'UTF8'")
+    finally:
+        admin.close()
+
+    os.environ["DATABASE_URL"] = dsn
+    db_manager.init_database()
+    sizes = dict(SCALES[scale])
+    citizens, lawyers = sizes.pop("citizens"), sizes.pop("lawyers")
+    counts = {'cases': sizes['cases'], 'consultations': sizes['consultations'],
+              'direct_messages': sizes['messages'], 'chat_messages': sizes['chats']}
+    conn = psycopg2.connect(dsn)
+    try:
+        began = time.perf_counter()
+        seeder.seed(conn, citizens, lawyers, counts)
+        print(f"  seeded {scale} in {time.perf_counter() - began:.1f} s")
+    finally:
+        conn.close()
+    return dsn
+
+def sample_inputs(dsn, size=20):
+    """Pick a deterministic spread of real ids to call the services with"""
+    conn = psycopg2.connect(dsn)
+    try:
+        with conn.cursor() as cur:
+            def ids(query):
+                cur.execute(query, (size,))
+                return [row[0] if len(row) == 1 else row for row in cur.fetchall()]
+
+            return {
+                'citizens': ids("""SELECT id, username FROM users WHERE user_type = 'Citizen'
+                                   AND username LIKE 'seed\\_%%' ORDER BY md5(id::text) LIMIT %s"""),
+                'pairs': ids("""SELECT DISTINCT ON (md5(sender_id::text || ':' || receiver_id::text))
+                                       sender_id, receiver_id
+                                FROM direct_messages
+                                ORDER BY md5(sender_id::text || ':' || receiver_id::text) LIMIT %s"""),
+                'lawyer_users': ids("SELECT user_id FROM lawyers ORDER BY md5(id::text) LIMIT %s"),
+                'lawyer_ids': ids("SELECT id FROM lawyers ORDER BY md5(id::text) LIMIT %s"),
+            }
+    finally:
+        conn.close()
+
+def build_cases(inputs):
+    """Case name -> list of zero-argument calls, cycled through while timing"""
+    questions = [q for texts in seeder.QUESTIONS.values() for q in texts] + [
+        "How to file an FIR?", "What is bail process?", "Divorce procedure in India"
+    ]
+    return {
+        'authenticate_user': [
+            lambda username=username: authenticate_user(username, seeder.SEED_PASSWORD)
+            for _, username in inputs['citizens'][:5]
+        ],
+        'get_user_conversations': [
+            lambda user_id=user_id: get_user_conversations(user_id) for user_id, _ in inputs['citizens']
+        ],
+        'get_messages': [
+            lambda pair=pair: get_messages(pair[1], pair[0]) for pair in inputs['pairs']
+        ],
+        'get_available_cases': [get_available_cases],
+        'get_lawyers': [
+            lambda: get_lawyers(),
+            lambda: get_lawyers("Family Law"),
+            lambda: get_lawyers("All", "Mumbai", "₹500-1500"),
+        ],
+        'get_case_statistics': [
+            lambda user_id=user_id: get_case_statistics(user_id, "Lawyer") for user_id in inputs['lawyer_users']
+        ] + [
+            lambda user_id=user_id: get_case_statistics(user_id, "Citizen") for user_id, _ in inputs['citizens']
+        ],
+        # consultations.lawyer_id holds lawyers.id
+        'get_consultation_statistics': [
+            lambda lawyer_id=lawyer_id: get_consultation_statistics(lawyer_id) for lawyer_id in inputs['lawyer_ids']
+        ],
+        'get_legal_response': [
+            lambda question=question: get_legal_response(question) for question in questions
+        ],
+    }
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    index = max(0, min(len(sorted_values) - 1, round(fraction * len(sorted_values) + 0.5) - 1))
+    return sorted_values[index]
+
+def run_case(calls, iterations, warmup):
+    """Time `iterations` calls (cycling through `calls`); returns a result dict"""
+    # Whole cycles only, so queries/call doesn't depend on where the run stopped
+    iterations = -(-iterations // len(calls)) * len(calls)
+    errors = []
+    original_error = st.error
+    st.error = errors.append  # services report failures through st.error
+    try:
+        for i in range(warmup):
+            calls[i % len(calls)]()
+
+        _counts['queries'] = _counts['connections'] = 0
+        errors.clear()
+        timings = []
+        for i in range(iterations):
+            call = calls[i % len(calls)]
+            began = time.perf_counter()
+            call()
+            timings.append((time.perf_counter() - began) * 1000)
+    finally:
+        st.error = original_error
+
+    timings.sort()
+    return {
+        'iterations': iterations,
+        'p50_ms': round(percentile(timings, 0.50), 4),
+        'p95_ms': round(percentile(timings, 0.95), 4),
+        'p99_ms': round(percentile(timings, 0.99), 4),
+        'mean_ms': round(sum(timings) / len(timings), 4),
+        'queries_per_call': round(_counts['queries'] / iterations, 2),
+        'connections_per_call': round(_counts['connections'] / iterations, 2),
+        'errors': len(errors),
+        'first_error': str(errors[0]) if errors else None,
+    }
+
+def compare(results, baseline, tolerance, min_delta_ms):
+    """
+    Return a list of regression messages against a baseline results document.
+    Latency only counts as regressed past both the relative tolerance and an
+    absolute floor, so sub-millisecond cases don't fail on timer noise.
+    """
+    regressions = []
+    for scale, cases in results['results'].items():
+        for case, current in cases.items():
+            previous = baseline.get('results', {}).get(scale, {}).get(case)
+            if not previous:
+                continue
+            for metric in PERCENTILES:
+                limit = max(previous[metric] * (1 + tolerance), previous[metric] + min_delta_ms)
+                if current[metric] > limit:
+                    regressions.append(
+                        f"{scale}/{case}: {metric} {previous[metric]:.2f} -> {current[metric]:.2f} ms"
+                    )
+            if current['queries_per_call'] > previous['queries_per_call']:
+                regressions.append(
+                    f"{scale}/{case}: queries/call {previous['queries_per_call']} -> {current['queries_per_call']}"
+                )
+    return regressions
+
+def environment():
+    """Describe the machine and revision the numbers came from"""
+    try:
+        revision = subprocess.run(["git", "rev-parse", "--short", "HEAD"],
+                                  capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        revision = None
+    return {
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        'revision': revision,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scales", nargs="+", choices=list(SCALES), default=["small", "medium"])
+    parser.add_argument("--cases", nargs="+", help="only run these cases")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument("--output", help="write JSON results to this file")
+    parser.add_argument("--baseline", help="JSON results to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed fractional growth of each latency percentile")
+    parser.add_argument("--min-delta-ms", type=float, default=1.0,
+                        help="ignore latency growth smaller than this many milliseconds")
+    parser.add_argument("--reseed", action="store_true", help="recreate the scale databases")
+    args = parser.parse_args()
+
+    admin_dsn = os.environ.get("DATABASE_URL")
+    if not admin_dsn:
+        raise SystemExit("Set DATABASE_URL to a PostgreSQL server where databases can be created")
+
+    # Services touch st.* outside a script run; drop the bare-mode warning
+    # (a filter, since Streamlit resets logger levels when it loads its config)
+    streamlit.logger.get_logger(script_run_context.__name__).addFilter(
+        lambda record: "missing ScriptRunContext" not in record.getMessage()
+    )
+
+    db_manager.get_pg_connection = counting_connection
+    prepared.connection_factory = CountingPreparedConnection
+    results = {'environment': environment(), 'results': {}}
+
+    for scale in args.scales:
+        print(f"scale={scale}")
+        dsn = ensure_database(admin_dsn, scale, args.reseed)
+        os.environ["DATABASE_URL"] = dsn
+        prepared.reset_pool()  # Pooled connections still point at the previous scale's database
+        cases = build_cases(sample_inputs(dsn))
+        scale_results = results['results'][scale] = {}
+
+        for name, calls in cases.items():
+            if args.cases and name not in args.cases:
+                continue
+            # Password hashing makes logins ~50 ms each, so time fewer of them
+            iterations = min(args.iterations, 40) if name == 'authenticate_user' else args.iterations
+            result = scale_results[name] = run_case(calls, iterations, args.warmup)
+            print(f"  {name:<28} p50 {result['p50_ms']:8.2f}  p95 {result['p95_ms']:8.2f}  "
+                  f"p99 {result['p99_ms']:8.2f} ms  queries/call {result['queries_per_call']:5.2f}"
+                  f"  conns/call {result['connections_per_call']:5.2f}"
+                  + (f"  errors {result['errors']}: {result['first_error']}" if result['errors'] else ""))
+        os.environ["DATABASE_URL"] = admin_dsn
+        prepared.reset_pool()
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            json.dump(results, handle, indent=2, ensure_ascii=False)
+        print(f"results written to {args.output}")
+
+    failed = any(result['errors'] for cases in results['results'].values() for result in cases.values())
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as handle:
+            regressions = compare(results, json.load(handle), args.tolerance, args.min_delta_ms)
+        for message in regressions:
+            print(f"REGRESSION {message}")
+        if not regressions:
+            print(f"no regressions against {args.baseline} (tolerance {args.tolerance:.0%})")
+        failed = failed or bool(regressions)
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
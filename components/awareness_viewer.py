@@ -0,0 +1,83 @@
+import html
+import json
+from functools import lru_cache
+import streamlit.components.v1 as components
+from config.settings import AWARENESS_SETTINGS
+from services.awareness_service import get_language_content
+
+VIEWER_STYLE = """
+body { font-family: "Source Sans Pro", sans-serif; color: #fafafa; background: transparent; margin: 0; }
+input { width: 100%; box-sizing: border-box; padding: 10px 14px; font-size: 16px; border-radius: 8px;
+        border: 1px solid #495057; background: #212529; color: #fafafa; margin-bottom: 12px; }
+details { background: #212529; border-radius: 10px; margin: 8px 0; padding: 4px 16px; }
+summary { cursor: pointer; font-size: 18px; font-weight: 600; padding: 10px 0; }
+details p.summary { color: #adb5bd; margin-top: 0; }
+.translation { font-size: 12px; color: #adb5bd; }
+#empty { display: none; color: #adb5bd; }
+"""
+
+# Ranks articles by summed best weight per query word, matching word prefixes
+# so results update from the first letters typed
+VIEWER_SCRIPT = """
+const index = JSON.parse(document.getElementById("search-index").textContent);
+const words = Object.keys(index);
+const list = document.getElementById("articles");
+const articles = Array.from(list.children);
+const tokenize = text => text.toLowerCase().match(/[\\p{L}\\p{M}\\p{N}]+/gu) || [];
+
+document.getElementById("search").addEventListener("input", event => {
+    const query = tokenize(event.target.value);
+    let scores = null;
+    for (const term of query) {
+        const best = new Map();
+        for (const word of words) {
+            if (!word.startsWith(term)) continue;
+            for (const [position, weight] of index[word]) {
+                best.set(position, Math.max(best.get(position) || 0, weight));
+            }
+        }
+        scores = scores === null ? best
+            : new Map([...best].filter(([position]) => scores.has(position))
+                               .map(([position, weight]) => [position, weight + scores.get(position)]));
+    }
+    const ranked = articles
+        .map((article, position) => [article, scores === null ? 0 : scores.get(position), position])
+        .filter(([, score]) => score !== undefined)
+        .sort((a, b) => (b[1] - a[1]) || (a[2] - b[2]));
+    articles.forEach(article => { article.style.display = "none"; });
+    ranked.forEach(([article]) => { article.style.display = ""; list.appendChild(article); });
+    document.getElementById("empty").style.display = ranked.length ? "none" : "block";
+});
+
+const opened = document.querySelector("details[open]");
+if (opened) opened.scrollIntoView();
+"""
+
+@lru_cache(maxsize=64)
+def awareness_page_html(language, open_slug=None):
+    """The article viewer document for a language, built once per process and article"""
+    content = get_language_content(language)
+    labels = content['labels']
+    articles = []
+    for article in content['articles']:
+        translation = ""
+        if article['language'] != language:
+            translation = f"<span class='translation'>({html.escape(article['language'])})</span>"
+        articles.append(
+            f"<details id='{html.escape(article['slug'])}'{' open' if article['slug'] == open_slug else ''}>"
+            f"<summary>{article['icon']} {html.escape(article['title'])} {translation}</summary>"
+            f"<p class='summary'>{html.escape(article['summary'])}</p>{article['html']}</details>"
+        )
+    # The index is JSON inside a non-executed script tag; escape "</" so text can't close it
+    index = json.dumps(content['index'], ensure_ascii=False, separators=(",", ":")).replace("</", "<\\/")
+    return f"""<!DOCTYPE html><html><head><meta charset="utf-8"><style>{VIEWER_STYLE}</style></head><body>
+<input id="search" type="search" placeholder="{html.escape(labels.get('search_placeholder', ''))}" autocomplete="off">
+<div id="articles">{''.join(articles)}</div>
+<p id="empty">{html.escape(labels.get('no_results', ''))}</p>
+<script type="application/json" id="search-index">{index}</script>
+<script>{VIEWER_SCRIPT}</script>
+</body></html>"""
+
+def render_awareness_viewer(language, open_slug=None):
+    """Show the searchable articles in an iframe; search runs in the browser"""
+    components.html(awareness_page_html(language, open_slug), height=AWARENESS_SETTINGS["page_height"], scrolling=True)
@@ -0,0 +1,118 @@
+import html
+import streamlit as st
+from config.settings import DOCUMENT_SETTINGS
+from services.document_service import (
+    HIGHLIGHT_START, HIGHLIGHT_STOP, download_url, get_case_documents, read_document, search_lawyer_documents,
+    store_document
+)
+from services.preview_service import get_preview
+
+def format_size(size_bytes):
+    """Human-readable file size"""
+    for unit in ("B", "KB", "MB"):
+        if size_bytes < 1024:
+            return f"{size_bytes:.0f} {unit}" if unit == "B" else f"{size_bytes:.1f} {unit}"
+        size_bytes /= 1024
+    return f"{size_bytes:.1f} GB"
+
+def render_document_link(document, key_prefix):
+    """
+    Offer one document for download: a signed link to the range-capable
+    download server when it runs, else an in-page button for small files.
+    """
+    label = f"📄 {document.filename} ({format_size(document.size_bytes)})"
+    url = download_url(document)
+    if url:
+        st.link_button(label, url)
+    else:
+        render_inline_download(document, label, key_prefix)
+
+    status = extraction_caption(document)
+    if status:
+        st.caption(status)
+
+def extraction_caption(document):
+    """One line on where background text extraction has got to"""
+    if document.extraction_status in ('pending', 'running'):
+        return "⏳ Reading document text…"
+    if document.extraction_status == 'failed':
+        return "⚠️ Text could not be extracted; this document won't appear in search"
+    if document.extraction_status == 'done':
+        pages = f"{document.page_count} page{'s' if document.page_count != 1 else ''}"
+        return f"{pages} · {document.language}" if document.language else pages
+    return None
+
+def render_inline_download(document, label, key_prefix):
+    """Download button for small files, read into memory only after the user asks"""
+    if document.size_bytes > DOCUMENT_SETTINGS["inline_download_max_mb"] * 1024 * 1024:
+        st.caption(f"{label} · too large to download here")
+        return
+
+    ready_key = f"{key_prefix}_download_{document.id}"
+    if st.session_state.get(ready_key):
+        st.download_button(
+            f"⬇️ {label}", read_document(document), file_name=document.filename,
+            mime=document.content_type or "application/octet-stream", key=f"{ready_key}_button"
+        )
+    elif st.button(label, key=f"{ready_key}_prepare"):
+        st.session_state[ready_key] = True
+        st.rerun()
+
+def render_document_previews(documents, key_prefix, columns=3):
+    """Documents as a grid of first-page thumbnails, each with its download link"""
+    for start in range(0, len(documents), columns):
+        for column, document in zip(st.columns(columns), documents[start:start + columns]):
+            with column:
+                preview = get_preview(document)
+                if preview is not None:
+                    st.image(preview, use_container_width=True)
+                else:
+                    st.markdown("<div class='document-icon'>📄</div>", unsafe_allow_html=True)
+                render_document_link(document, key_prefix)
+
+def render_case_documents(case_id, can_upload=True, show_previews=False):
+    """List a case's documents, with an uploader for the case's participants"""
+    if can_upload:
+        # Rotated after an upload so the same files can't be stored again by another click
+        version_key = f"case_upload_version_{case_id}"
+        uploaded = st.file_uploader(
+            "Add documents", accept_multiple_files=True,
+            key=f"case_upload_{case_id}_{st.session_state.get(version_key, 0)}",
+            help=f"Up to {DOCUMENT_SETTINGS['max_upload_mb']} MB per file"
+        )
+        if uploaded and st.button("Upload", key=f"case_upload_button_{case_id}"):
+            for file in uploaded:
+                success, message = store_document(
+                    file, file.name, file.type, st.session_state.user_id, case_id=case_id
+                )
+                (st.success if success else st.error)(message)
+            st.session_state[version_key] = st.session_state.get(version_key, 0) + 1
+
+    documents = get_case_documents(case_id)
+    if not documents:
+        st.caption("No documents uploaded yet.")
+        return
+    if show_previews:
+        render_document_previews(documents, f"case_{case_id}")
+        return
+    for document in documents:
+        render_document_link(document, f"case_{case_id}")
+
+def render_snippet(snippet):
+    """Search snippet with the matched words highlighted"""
+    text = html.escape(snippet or "").replace(HIGHLIGHT_START, "<mark>").replace(HIGHLIGHT_STOP, "</mark>")
+    st.markdown(f"<small>…{text}…</small>", unsafe_allow_html=True)
+
+def render_document_search(lawyer_user_id):
+    """Search box over the text of every document in a lawyer's cases"""
+    query = st.text_input("🔎 Search inside case documents", key="document_search",
+                          placeholder="e.g. FIR number, survey number, party name")
+    if not query.strip():
+        return
+    results = search_lawyer_documents(lawyer_user_id, query)
+    if not results:
+        st.info("No documents mention that.")
+        return
+    for result in results:
+        st.markdown(f"**{html.escape(result.filename)}** · {html.escape(result.case_title)}")
+        render_snippet(result.snippet)
@@ -5,7 +5,7 @@ def render_footer():
     """Render the application footer"""
     st.markdown("---")
     st.markdown(f"""
-    <div style="text-align: center; color: #666; padding: 1rem;">
+    <div class="app-footer">
         <p>Legal Aid India Platform | Empowering Justice for All</p>
         <p>For emergency legal assistance, contact: <strong>Emergency Legal Helpline: {APP_SETTINGS['emergency_helpline']}</strong></p>
     </div>
@@ -0,0 +1,76 @@
+import html
+from datetime import datetime
+import streamlit as st
+from utils.profiler import get_history
+
+SPAN_COLORS = {
+    "phase": "#1f77b4",
+    "service": "#ff7f0e"
+}
+
+def render_waterfall(profile):
+    """Render the rerun's spans as horizontal bars on a shared time axis"""
+    total_ms = max(profile['seconds'] * 1000, 0.001)
+    rows = []
+    for span in profile['spans']:
+        start_ms = span['start'] * 1000
+        width_ms = span['seconds'] * 1000
+        left = min(start_ms / total_ms * 100, 100)
+        width = max(min(width_ms / total_ms * 100, 100 - left), 0.3)
+        queries = f" · {span['queries']} q" if span.get('queries') else ""
+        errors = f" · {span['errors']} err" if span.get('errors') else ""
+        title = html.escape(span.get('caller', span['name']))
+        rows.append(f"""
+        <div style="display: flex; align-items: center; font-size: 12px; margin: 2px 0;" title="{title}">
+            <div style="width: 30%; padding-left: {span['depth'] * 12}px; white-space: nowrap; overflow: hidden; text-overflow: ellipsis;">
+                {html.escape(span['name'])}
+            </div>
+            <div style="width: 50%; position: relative; height: 14px; background: #f1f3f5;">
+                <div style="position: absolute; left: {left:.2f}%; width: {width:.2f}%; height: 100%; background: {SPAN_COLORS[span['kind']]};"></div>
+            </div>
+            <div style="width: 20%; padding-left: 8px; white-space: nowrap;">{width_ms:.1f} ms{queries}{errors}</div>
+        </div>""")
+    st.markdown("".join(rows), unsafe_allow_html=True)
+
+def render_history(page):
+    """Compare the retained reruns of a page, newest first"""
+    history = get_history(page)
+    if len(history) < 2:
+        return
+
+    phase_names = []
+    for profile in history:
+        for span in profile['spans']:
+            if span['kind'] == 'phase' and span['depth'] == 0 and span['name'] not in phase_names:
+                phase_names.append(span['name'])
+
+    table = []
+    for profile in reversed(history):
+        row = {
+            "At": datetime.fromtimestamp(profile['at']).strftime("%H:%M:%S"),
+            "Total (ms)": round(profile['seconds'] * 1000, 1),
+            "Queries": profile['queries'],
+            "DB (ms)": round(profile['db_seconds'] * 1000, 1),
+        }
+        for name in phase_names:
+            row[f"{name} (ms)"] = round(sum(
+                span['seconds'] for span in profile['spans']
+                if span['kind'] == 'phase' and span['depth'] == 0 and span['name'] == name
+            ) * 1000, 1)
+        table.append(row)
+
+    st.markdown(f"**Last {len(history)} reruns of {page}**")
+    st.dataframe(table, use_container_width=True, hide_index=True)
+
+def render_profiler_panel(profile):
+    """Render the profile of the rerun that just finished, if one was taken"""
+    if profile is None:
+        return
+
+    with st.expander(
+        f"⏱️ Rerun profile: {profile['seconds'] * 1000:.0f} ms · "
+        f"{profile['queries']} queries · {profile['db_seconds'] * 1000:.0f} ms in the database"
+    ):
+        st.caption("🟦 app phases · 🟧 service calls (back-to-back queries from one function)")
+        render_waterfall(profile)
+        render_history(profile['page'])
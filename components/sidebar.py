@@ -1,6 +1,6 @@
 import streamlit as st
 from utils.session_manager import get_navigation_menu, logout_user, demo_login
-from utils.auth_manager import authenticate_user
+from utils.auth_manager import login_user
 from config.settings import APP_SETTINGS
 
 def render_sidebar():
@@ -40,16 +40,12 @@ def render_guest_sidebar():
         with col1:
             if st.button("Login", key="sidebar_login", use_container_width=True):
                 if quick_username and quick_password:
-                    result = authenticate_user(quick_username, quick_password)
-                    if result:
-                        st.session_state.authenticated = True
-                        st.session_state.user_id = result[0]
-                        st.session_state.user_type = result[1]
-                        st.session_state.username = quick_username
+                    success, message = login_user(quick_username, quick_password)
+                    if success:
                         st.success("✅ Login successful!")
                         st.rerun()
                     else:
-                        st.error("❌ Invalid credentials")
+                        st.error(message)
                 else:
                     st.warning("⚠️ Enter credentials")
 
@@ -1,15 +1,14 @@
+import html
 import streamlit as st
-from config.styles import STATUS_COLORS, PRIORITY_COLORS
+from config.styles import badge_class
 
 def render_status_badge(status):
     """Render a status badge with appropriate color"""
-    color = STATUS_COLORS.get(status, '#6c757d')
-    return f'<span style="background-color: {color}; color: white; padding: 3px 8px; border-radius: 15px; font-size: 12px;">{status}</span>'
+    return f'<span class="badge {badge_class("status", status)}">{html.escape(str(status))}</span>'
 
 def render_priority_badge(priority):
     """Render a priority badge with appropriate color"""
-    color = PRIORITY_COLORS.get(priority, '#6c757d')
-    return f'<span style="background-color: {color}; color: white; padding: 3px 8px; border-radius: 15px; font-size: 12px;">{priority}</span>'
+    return f'<span class="badge {badge_class("priority", priority)}">{html.escape(str(priority))}</span>'
 
 def render_card(title, content, card_type="default"):
     """Render a styled card component"""
@@ -45,7 +44,7 @@ def render_user_info_card(user_data):
     location = user_data.get('location', 'Not specified')
 
     st.markdown(f"""
-    <div style="border: 1px solid #ddd; padding: 15px; margin: 10px 0; border-radius: 10px; background-color: #212529;">
+    <div class="record-card dark">
         <h4>👤 {name}</h4>
         <p><strong>📧 Email:</strong> {email}</p>
         <p><strong>📱 Phone:</strong> {phone}</p>
@@ -53,23 +52,16 @@ def render_user_info_card(user_data):
     </div>
     """, unsafe_allow_html=True)
 
-def render_case_card(case_data, show_actions=True, action_callbacks=None):
-    """Render a case information card with optional actions"""
-    case_id = case_data[0]
-    title = case_data[3] if len(case_data) > 3 else "Unknown Case"
-    description = case_data[4] if len(case_data) > 4 else "No description"
-    category = case_data[5] if len(case_data) > 5 else "General"
-    status = case_data[6] if len(case_data) > 6 else "Unknown"
-    priority = case_data[7] if len(case_data) > 7 else "Medium"
-
-    status_badge = render_status_badge(status)
-    priority_badge = render_priority_badge(priority)
+def render_case_card(case, show_actions=True, action_callbacks=None):
+    """Render a case information card (a get_user_cases record) with optional actions"""
+    status_badge = render_status_badge(case.status)
+    priority_badge = render_priority_badge(case.priority)
 
     st.markdown(f"""
-    <div style="border: 1px solid #ddd; padding: 15px; margin: 10px 0; border-radius: 10px; background-color: #212529;">
-        <h4>{title} {status_badge}</h4>
-        <p><strong>Category:</strong> {category} | <strong>Priority:</strong> {priority_badge}</p>
-        <p><strong>Description:</strong> {description}</p>
+    <div class="record-card dark">
+        <h4>{case.title} {status_badge}</h4>
+        <p><strong>Category:</strong> {case.category} | <strong>Priority:</strong> {priority_badge}</p>
+        <p><strong>Description:</strong> {case.description}</p>
     </div>
     """, unsafe_allow_html=True)
 
@@ -77,28 +69,19 @@ def render_case_card(case_data, show_actions=True, action_callbacks=None):
         cols = st.columns(len(action_callbacks))
         for i, (label, callback) in enumerate(action_callbacks.items()):
             with cols[i]:
-                if st.button(label, key=f"{label}_{case_id}"):
-                    callback(case_id)
-
-def render_lawyer_card(lawyer_data, show_actions=True, action_callbacks=None):
-    """Render a lawyer information card with optional actions"""
-    lawyer_id = lawyer_data.get('id') if isinstance(lawyer_data, dict) else lawyer_data[0]
-    name = lawyer_data.get('name') if isinstance(lawyer_data, dict) else lawyer_data[1]
-    specialization = lawyer_data.get('specialization') if isinstance(lawyer_data, dict) else lawyer_data[4]
-    experience = lawyer_data.get('experience') if isinstance(lawyer_data, dict) else lawyer_data[5]
-    location = lawyer_data.get('location') if isinstance(lawyer_data, dict) else lawyer_data[6]
-    rating = lawyer_data.get('rating') if isinstance(lawyer_data, dict) else lawyer_data[7]
-    fee_range = lawyer_data.get('fee_range') if isinstance(lawyer_data, dict) else lawyer_data[8]
-    languages = lawyer_data.get('languages') if isinstance(lawyer_data, dict) else lawyer_data[10]
+                if st.button(label, key=f"{label}_{case.id}"):
+                    callback(case.id)
 
+def render_lawyer_card(lawyer, show_actions=True, action_callbacks=None):
+    """Render a lawyer information card (a get_lawyers record) with optional actions"""
     st.markdown(f"""
     <div class="lawyer-card">
-        <h4>{name} ⭐ {rating}/5.0</h4>
-        <p><strong>Specialization:</strong> {specialization} |
-           <strong>Experience:</strong> {experience} years |
-           <strong>Location:</strong> {location}</p>
-        <p><strong>Fee Range:</strong> {fee_range} |
-           <strong>Languages:</strong> {languages}</p>
+        <h4>{lawyer.name} ⭐ {lawyer.rating}/5.0</h4>
+        <p><strong>Specialization:</strong> {lawyer.specialization} |
+           <strong>Experience:</strong> {lawyer.experience} years |
+           <strong>Location:</strong> {lawyer.location}</p>
+        <p><strong>Fee Range:</strong> {lawyer.fee_range} |
+           <strong>Languages:</strong> {lawyer.languages}</p>
     </div>
     """, unsafe_allow_html=True)
 
@@ -106,8 +89,8 @@ def render_lawyer_card(lawyer_data, show_actions=True, action_callbacks=None):
         cols = st.columns(len(action_callbacks))
         for i, (label, callback) in enumerate(action_callbacks.items()):
             with cols[i]:
-                if st.button(label, key=f"{label}_{lawyer_id}"):
-                    callback(lawyer_data)
+                if st.button(label, key=f"{label}_{lawyer.id}"):
+                    callback(lawyer)
 
 def render_confirmation_dialog(message, confirm_callback, cancel_callback=None):
     """Render a confirmation dialog"""
@@ -0,0 +1,67 @@
+import textwrap
+import streamlit as st
+from config.settings import VIRTUAL_LIST_SETTINGS
+
+def _window(key, total, page_size):
+    """The (start, end) slice shown for a list, clamped to its current length"""
+    start, end = st.session_state.get(f"{key}_window", (0, page_size))
+    end = min(end, total)
+    if start >= end:
+        start, end = 0, min(page_size, total)
+    return start, end
+
+def _show_more(key, total, page_size, max_window):
+    start, end = _window(key, total, page_size)
+    end = min(end + page_size, total)
+    st.session_state[f"{key}_window"] = (max(start, end - max_window), end)
+
+def _show_earlier(key, total, page_size, max_window):
+    start, end = _window(key, total, page_size)
+    start = max(start - page_size, 0)
+    st.session_state[f"{key}_window"] = (start, min(end, start + max_window))
+
+def render_virtual_list(key, rows, row_id, row_html, row_label, render_actions=None, page_size=None, max_window=None):
+    """
+    Render a long list of cards as a window of at most max_window rows. All
+    visible cards go out as one HTML element, and "Show more" appends the
+    next page_size rows; past max_window the earliest rows drop out of the
+    window. Instead of buttons on every card, a single select keyed by row
+    id picks a row and render_actions(row) draws that row's controls.
+    Returns the selected row or None.
+    """
+    page_size = page_size or VIRTUAL_LIST_SETTINGS["page_size"]
+    max_window = max_window or VIRTUAL_LIST_SETTINGS["max_window"]
+    total = len(rows)
+    if not total:
+        st.caption("Nothing to show.")
+        return None
+    start, end = _window(key, total, page_size)
+    visible = rows[start:end]
+
+    if start > 0:
+        st.button("⬆️ Show earlier", key=f"{key}_earlier",
+                  on_click=_show_earlier, args=(key, total, page_size, max_window))
+    # Cards must stay unindented HTML blocks once joined, or Markdown reads them as code
+    st.markdown("\n".join(textwrap.dedent(row_html(row)).strip() for row in visible), unsafe_allow_html=True)
+
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        st.caption(f"Showing {start + 1}–{end} of {total}")
+    with col2:
+        if end < total:
+            st.button(f"⬇️ Show {min(page_size, total - end)} more", key=f"{key}_more", use_container_width=True,
+                      on_click=_show_more, args=(key, total, page_size, max_window))
+
+    if render_actions is None:
+        return None
+
+    by_id = {row_id(row): row for row in visible}
+    selected_id = st.selectbox(
+        "Select", list(by_id), index=None, key=f"{key}_selected",
+        format_func=lambda value: row_label(by_id[value]), placeholder="Choose one to act on…"
+    )
+    if selected_id is None:
+        return None
+    with st.container(border=True):
+        render_actions(by_id[selected_id])
+    return by_id[selected_id]
@@ -55,3 +55,159 @@ MAJOR_CITIES = [
     "Mumbai", "Delhi", "Bangalore", "Chennai",
     "Pune", "Hyderabad", "Kolkata", "Other"
 ]
+
+# Consultation scheduling
+SCHEDULING_SETTINGS = {
+    "day_start": "09:00",
+    "day_end": "18:30",
+    "break_start": "13:00",
+    "break_end": "14:00",
+    "slot_step_minutes": 30,
+    "default_duration_minutes": 30,
+    "working_days": [0, 1, 2, 3, 4, 5],  # Monday to Saturday
+    "horizon_days": 60,
+    "cache_ttl_seconds": 60
+}
+
+# Calendar (iCalendar) sync
+CALENDAR_SETTINGS = {
+    "prodid": "-//Legal Aid India//Consultations//EN",
+    "timezone_offset_minutes": 330,  # Stored times are IST (UTC+05:30)
+    "stream_batch_size": 500,
+    "sync_overlap_seconds": 5
+}
+
+# Password hashing (scrypt). Raising the cost re-hashes users on their next login.
+PASSWORD_HASH_SETTINGS = {
+    "n": 2 ** 14,
+    "r": 8,
+    "p": 1,
+    "salt_bytes": 16,
+    "key_bytes": 32,
+    "verify_workers": 4,  # Concurrent hashes; each scrypt call holds ~16 MB
+    "verify_timeout_seconds": 10
+}
+
+# Login throttling (token buckets). "shared" keeps buckets in PostgreSQL so
+# every replica enforces the same limits; "memory" is per process.
+RATE_LIMIT_SETTINGS = {
+    "backend": "memory",
+    "username_capacity": 30,  # Burst of attempts per username from all clients; roomy so attackers can't easily lock the owner out
+    "username_refill_seconds": 10,
+    "client_username_capacity": 5,  # Burst of attempts per username from one client; a successful login refills it
+    "client_username_refill_seconds": 60,  # One attempt regained per minute
+    "client_capacity": 20,  # Burst of attempts per IP address / browser session
+    "client_refill_seconds": 10,
+    "trusted_proxies": [],  # Reverse proxy addresses or networks whose X-Forwarded-For is believed, e.g. "10.0.0.0/8"
+    "max_tracked_keys": 100000,
+    "shared_cleanup_every": 1000  # Attempts between purges of idle shared buckets
+}
+
+# Signed session tokens kept in the page URL so logins survive reconnects.
+# Each token names a row in user_sessions: restoring one revokes it and
+# issues the next, and logout revokes it, so a leaked link stops working
+SESSION_SETTINGS = {
+    "secret_key": "session_secret",  # st.secrets key holding the signing secret
+    "token_ttl_hours": 2,
+    "query_param": "session"
+}
+
+# Query instrumentation for execute_query (see database/instrumentation.py)
+QUERY_METRICS_SETTINGS = {
+    "enabled": True,
+    "slow_query_ms": 250,  # Queries slower than this go to the slow-query log
+    "slow_log_size": 200,
+    "explain_sample_rate": 0.1,  # Share of slow SELECTs that also capture EXPLAIN
+    "max_fingerprints": 500,  # Distinct statements tracked before new ones are lumped together
+    "histogram_buckets": (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5),  # seconds
+    "metrics_port_env": "METRICS_PORT",  # Serve Prometheus text on this port when set
+    # Bind address, 127.0.0.1 unless set. The endpoint has no authentication:
+    # set 0.0.0.0 only where a firewall limits who can reach the port
+    "metrics_host_env": "METRICS_HOST"
+}
+
+# Prepared statements on pooled connections for hot queries (database/prepared.py).
+# Session-level PREPARE needs direct connections: disable behind a
+# transaction-mode pooler such as PgBouncer or Supavisor on port 6543
+PREPARED_STATEMENT_SETTINGS = {
+    "enabled": True,
+    "min_connections": 1,
+    "max_connections": 20,  # Above PAGE_DATA_SETTINGS["max_workers"]; when all are busy, calls fall back to execute_query
+    "custom_plan_executions": 5  # PostgreSQL re-plans this many executions per connection before using a generic plan
+}
+
+# Per-rerun profiler (utils/profiler.py): on for every session when the
+# environment variable is set, otherwise per admin session from Diagnostics
+PROFILER_SETTINGS = {
+    "env_var": "PROFILE_RERUNS",
+    "history_size": 10,  # Reruns kept per page for comparison
+    "service_gap_ms": 1  # Back-to-back queries from one function closer than this form one call
+}
+
+# Concurrent page data loading (utils/page_data.py)
+PAGE_DATA_SETTINGS = {
+    "max_workers": 16,  # Shared by all sessions; each running loader holds a DB connection
+    "timeout_seconds": 5
+}
+
+# Case documents and message attachments (services/document_service.py)
+DOCUMENT_SETTINGS = {
+    "store_root": "data/objects",  # Filesystem object store; one directory per bucket
+    "bucket": "documents",
+    "chunk_bytes": 1024 * 1024,  # Read/write size when streaming uploads and downloads
+    "max_upload_mb": 200,
+    "download_port_env": "DOCUMENT_PORT",  # Serve range-capable download links on this port when set
+    "download_base_url_env": "DOCUMENT_BASE_URL",  # Public URL of that server, if not http://localhost:<port>
+    "link_ttl_minutes": 15,
+    "inline_download_max_mb": 20  # Without the download server, larger files can't be offered
+}
+
+# Background text extraction for documents (python -m services.document_jobs)
+DOCUMENT_PIPELINE_SETTINGS = {
+    "workers": 1,  # Worker processes; keep below the CPU count so pages stay responsive
+    "niceness": 10,  # Added to each worker's scheduling priority
+    "max_pages_per_second": 0,  # Per worker; 0 for no cap
+    "poll_seconds": 2,  # Idle wait before looking for new jobs
+    "max_attempts": 3,
+    "stale_minutes": 30,  # A running job older than this is assumed lost and claimed again
+    "min_text_chars": 20,  # PDF pages with less text than this are treated as scanned and OCRed
+    "max_indexed_chars": 500000  # tsvector values are limited to 1 MB
+}
+
+# First-page previews of documents (services/preview_service.py)
+PREVIEW_SETTINGS = {
+    "cache_root": "data/previews",
+    "max_cache_mb": 256,  # Least recently viewed previews are evicted past this
+    "thumbnail_px": 320,  # Longest side
+    "max_source_mb": 50  # Larger documents are previewed only by the background worker
+}
+
+# Home page statistics (services/platform_service.py)
+PLATFORM_COUNTER_SETTINGS = {
+    "cache_ttl_seconds": 60,  # Each app process reads the counters table at most this often
+    "refresh_seconds": 300,  # Counters older than this are recomputed by the next reader
+    "lock_id": 440001  # pg advisory lock so only one process recomputes at a time
+}
+
+# Legal Awareness articles (assets/awareness/<Language>.json), prebuilt with
+# python -m utils.awareness_bundle
+AWARENESS_SETTINGS = {
+    "source_dir": "assets/awareness",
+    "bundle_path": "assets/awareness/bundle.json.gz",
+    "page_height": 900  # Pixels for the article viewer
+}
+
+# Stylesheets (assets/styles/*.css), minified once per process by config/styles.py
+THEME_SETTINGS = {
+    "source_dir": "assets/styles",
+    "files": ["base.css", "cards.css", "messages.css"],
+    # "once": add the CSS to the page <head> on a session's first run;
+    # "every_run": resend it in the page on every rerun, for deployments that block component scripts
+    "inject": "once"
+}
+
+# Long card lists (components/virtual_list.py)
+VIRTUAL_LIST_SETTINGS = {
+    "page_size": 20,  # Rows rendered at first and added by each "Show more"
+    "max_window": 100  # Rows kept on screen; earlier ones drop out past this
+}
@@ -1,95 +1,12 @@
+import hashlib
+import json
+import os
+from functools import lru_cache
 import streamlit as st
-
-def apply_custom_styles():
-    """Apply custom CSS styles to the application"""
-    st.markdown("""
-    <style>
-        .main-header {
-            background: linear-gradient(90deg, #1e3c72 0%, #2a5298 100%);
-            padding: 1rem;
-            border-radius: 10px;
-            color: white;
-            text-align: center;
-            margin-bottom: 2rem;
-        }
-
-        .feature-card {
-            background: #212529;
-            color: white;
-            padding: 1.5rem;
-            border-radius: 10px;
-            box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-            margin: 1rem 0;
-            border-left: 4px solid #2a5298;
-        }
-
-        .lawyer-card {
-            background: #212529;
-            padding: 1rem;
-            border-radius: 8px;
-            margin: 0.5rem 0;
-            border: 1px solid #e9ecef;
-        }
-
-        .case-status {
-            padding: 0.25rem 0.75rem;
-            border-radius: 15px;
-            color: white;
-            font-size: 0.8rem;
-            font-weight: bold;
-        }
-
-        .status-active { background-color: #28a745; }
-        .status-open { background-color: #28a745; }
-        .status-pending { background-color: #ffc107; color: #212529; }
-        .status-closed { background-color: #6c757d; }
-        .status-in-progress { background-color: #17a2b8; }
-
-        .chat-message {
-            padding: 0.5rem;
-            margin: 0.5rem 0;
-            border-radius: 8px;
-        }
-
-        .user-message {
-            background-color: #212529;
-            margin-left: 2rem;
-        }
-
-        .bot-message {
-            background-color: #212529;
-            margin-right: 2rem;
-        }
-
-        .chat-container {
-            max-height: 400px;
-            overflow-y: auto;
-            border: 1px solid #ddd;
-            border-radius: 8px;
-            padding: 1rem;
-            margin: 1rem 0;
-        }
-
-        .message-sent {
-            background-color: #007bff;
-            color: white;
-            padding: 0.5rem 1rem;
-            border-radius: 15px;
-            margin: 0.25rem 0;
-            text-align: right;
-            margin-left: 20%;
-        }
-
-        .message-received {
-            background-color: #f8f9fa;
-            color: #333;
-            padding: 0.5rem 1rem;
-            border-radius: 15px;
-            margin: 0.25rem 0;
-            margin-right: 20%;
-        }
-    </style>
-    """, unsafe_allow_html=True)
+import streamlit.components.v1 as components
+from config.settings import THEME_SETTINGS
+from utils.css import class_slug, minify_css
+from utils.profiler import profiled
 
 # Status color mappings
 STATUS_COLORS = {
@@ -110,3 +27,58 @@ PRIORITY_COLORS = {
     'High': '#fd7e14',
     'Urgent': '#dc3545'
 }
+
+# Adds or updates the theme <style> in the app page itself, outside the
+# component iframe, so it outlives the iframe and later reruns
+_INJECT_SCRIPT = """<script>
+const doc = window.parent.document;
+let style = doc.getElementById("legal-aid-theme");
+if (!style) {
+    style = doc.createElement("style");
+    style.id = "legal-aid-theme";
+    doc.head.appendChild(style);
+}
+if (style.dataset.version !== %(version)s) {
+    style.textContent = %(css)s;
+    style.dataset.version = %(version)s;
+}
+</script>"""
+
+def badge_class(kind, value):
+    """Class for a status or priority pill, e.g. badge-status-in-progress"""
+    return f"badge-{kind}-{class_slug(value)}"
+
+def _badge_rules():
+    rules = [f".{badge_class('status', status)}{{background-color:{color}}}" for status, color in STATUS_COLORS.items()]
+    rules += [f".{badge_class('priority', priority)}{{background-color:{color}}}" for priority, color in PRIORITY_COLORS.items()]
+    return "".join(rules)
+
+@lru_cache(maxsize=1)
+def theme_css():
+    """The app stylesheet, bundled and minified once per process: (css, version)"""
+    sources = []
+    for name in THEME_SETTINGS["files"]:
+        with open(os.path.join(THEME_SETTINGS["source_dir"], name), encoding="utf-8") as handle:
+            sources.append(handle.read())
+    css = minify_css("\n".join(sources)) + _badge_rules()
+    return css, hashlib.sha1(css.encode("utf-8")).hexdigest()[:12]
+
+@profiled("apply_custom_styles")
+def apply_custom_styles():
+    """
+    Apply custom CSS styles to the application. The stylesheet goes into the
+    page head on a session's first run and stays there across reruns, so
+    later calls send nothing.
+    """
+    css, version = theme_css()
+    if THEME_SETTINGS["inject"] == "every_run":
+        st.markdown(f"<style>{css}</style>", unsafe_allow_html=True)
+        return
+    if st.session_state.get("theme_version") == version:
+        return
+    script = _INJECT_SCRIPT % {
+        'css': json.dumps(css).replace("</", "<\\/"),
+        'version': json.dumps(version),
+    }
+    components.html(script, height=0)
+    st.session_state.theme_version = version
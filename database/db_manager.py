@@ -1,29 +1,117 @@
+import os
+import threading
+import time
+from contextlib import contextmanager
 import streamlit as st
 import psycopg2
-import pandas as pd
-from config.settings import DB_CONFIG
+from config.settings import DB_CONFIG, QUERY_METRICS_SETTINGS
+from database.instrumentation import QueryMetrics, Timer, calling_function, start_metrics_server
+from database.records import rows_to_records
+
+# Process-wide query timings, shown on the admin Diagnostics page
+query_metrics = QueryMetrics(
+    QUERY_METRICS_SETTINGS["histogram_buckets"],
+    slow_query_ms=QUERY_METRICS_SETTINGS["slow_query_ms"],
+    slow_log_size=QUERY_METRICS_SETTINGS["slow_log_size"],
+    explain_sample_rate=QUERY_METRICS_SETTINGS["explain_sample_rate"],
+    max_fingerprints=QUERY_METRICS_SETTINGS["max_fingerprints"],
+    enabled=QUERY_METRICS_SETTINGS["enabled"]
+)
+
+# Monotonic deadline for queries issued by this thread (see statement_deadline)
+_deadline = threading.local()
+
+@contextmanager
+def statement_deadline(deadline):
+    """
+    Give queries opened by this thread a server-side statement_timeout that
+    ends at `deadline` (a time.monotonic() value), so work abandoned by a
+    caller that stopped waiting is cancelled by PostgreSQL too.
+    """
+    previous = getattr(_deadline, "at", None)
+    _deadline.at = deadline
+    try:
+        yield
+    finally:
+        _deadline.at = previous
+
+# Error messages collected for another thread instead of shown (see collect_errors)
+_errors = threading.local()
+
+@contextmanager
+def collect_errors(errors):
+    """
+    Append errors reported by this thread to the list `errors` instead of
+    showing them. For threads without the page's script context, whose
+    caller shows the messages from the script thread.
+    """
+    previous = getattr(_errors, "sink", None)
+    _errors.sink = errors
+    try:
+        yield errors
+    finally:
+        _errors.sink = previous
+
+def report_error(message):
+    """Show an error with st.error, or collect it when this thread is inside collect_errors()"""
+    sink = getattr(_errors, "sink", None)
+    if sink is None:
+        st.error(message)
+    else:
+        sink.append(message)
+
+def deadline_timeout_ms():
+    """Milliseconds left before this thread's statement_deadline, or None without one"""
+    deadline = getattr(_deadline, "at", None)
+    if deadline is None:
+        return None
+    return max(int((deadline - time.monotonic()) * 1000), 1)
+
+def _connect_options():
+    """Extra connect() arguments for the current thread"""
+    remaining_ms = deadline_timeout_ms()
+    if remaining_ms is None:
+        return {}
+    return {'options': f"-c statement_timeout={remaining_ms}"}
+
+def connection_args():
+    """(args, kwargs) for psycopg2.connect(); DATABASE_URL overrides the settings"""
+    if os.environ.get("DATABASE_URL"):
+        return (os.environ["DATABASE_URL"],), {}
+    return (), {
+        'host': DB_CONFIG["host"],
+        'port': DB_CONFIG["port"],
+        'dbname': DB_CONFIG["dbname"],
+        'user': DB_CONFIG["user"],
+        'password': st.secrets[DB_CONFIG["password_key"]],
+    }
 
 def get_pg_connection():
-    """Create a new PostgreSQL connection"""
+    """Create a new PostgreSQL connection (DATABASE_URL overrides the settings)"""
     try:
-        return psycopg2.connect(
-            host=DB_CONFIG["host"],
-            port=DB_CONFIG["port"],
-            dbname=DB_CONFIG["dbname"],
-            user=DB_CONFIG["user"],
-            password=st.secrets[DB_CONFIG["password_key"]]
-        )
+        args, kwargs = connection_args()
+        return psycopg2.connect(*args, **kwargs, **_connect_options())
     except Exception as e:
-        st.error(f"Database connection error: {e}")
+        report_error(f"Database connection error: {e}")
         return None
 
 def execute_query(query, params=None, fetch=False):
-    """Execute a query with proper connection management"""
+    """
+    Execute a query with proper connection management.
+    fetch: False, 'one', 'all', or 'records' for a list of named tuples.
+    """
     conn = None
     cur = None
+    timer = Timer()
+    timings = {'connect': 0.0, 'execute': 0.0, 'fetch': 0.0}
+    rows = 0
+    error = None
+    plan = None
     try:
         conn = get_pg_connection()
+        timings['connect'] = timer.lap()
         if conn is None:
+            error = "no connection"
             return None
 
         cur = conn.cursor()
@@ -31,31 +119,127 @@ def execute_query(query, params=None, fetch=False):
             cur.execute(query, params)
         else:
             cur.execute(query)
+        timings['execute'] = timer.lap()
 
-        if fetch:
+        if fetch == 'records':
+            result = rows_to_records(cur.description, cur.fetchall())
+            rows = len(result)
+        elif fetch:
             result = cur.fetchall() if fetch == 'all' else cur.fetchone()
+            rows = len(result) if fetch == 'all' else int(result is not None)
         else:
             result = None
+            rows = max(cur.rowcount, 0)
 
         conn.commit()
+        timings['fetch'] = timer.lap()
+
+        # Sampled plan for slow reads, taken after the commit so a failing
+        # EXPLAIN can't roll back the statement's own work
+        if query_metrics.should_explain(query, sum(timings.values())):
+            plan = _explain(cur, query, params)
+            conn.rollback()
         return result
 
     except psycopg2.IntegrityError as e:
+        error = type(e).__name__
         if conn:
             conn.rollback()
         raise e
     except Exception as e:
+        error = type(e).__name__
         if conn:
             conn.rollback()
-        st.error(f"Database query error: {e}")
+        report_error(f"Database query error: {e}")
         return None
     finally:
         if cur:
             cur.close()
         if conn:
             conn.close()
+        if error:
+            # Charge the failed phase (and the rollback) to where it stopped
+            timings['fetch' if timings['execute'] else 'execute'] += timer.lap()
+        query_metrics.record(query, calling_function(), rows=rows, error=error, plan=plan, **timings)
+
+def _explain(cur, query, params):
+    """Get the text plan for a statement, or the reason it couldn't be explained"""
+    try:
+        cur.execute("EXPLAIN " + query, params or None)
+        return "\n".join(row[0] for row in cur.fetchall())
+    except Exception as e:
+        return f"(EXPLAIN failed: {e})"
+
+def stream_query(query, params=None, batch_size=500):
+    """Yield rows from a server-side cursor without loading the full result"""
+    timer = Timer()
+    caller = calling_function()
+    conn = get_pg_connection()
+    connect = timer.lap()
+    if conn is None:
+        query_metrics.record(query, caller, connect=connect, error="no connection")
+        return
+
+    # A named cursor keeps the result set on the server and fetches in batches
+    cur = conn.cursor(name="stream_query")
+    cur.itersize = batch_size
+    rows = 0
+    error = None
+    execute = fetch = 0.0
+    try:
+        cur.execute(query, params)
+        execute = timer.lap()
+        for row in cur:
+            rows += 1
+            yield row
+        cur.close()  # Before the commit, which ends the named cursor with the transaction
+        conn.commit()
+    except Exception as e:
+        error = type(e).__name__
+        conn.rollback()
+        report_error(f"Database query error: {e}")
+    finally:
+        # Closing the connection also drops a cursor left open by an error or
+        # a consumer that stopped early
+        conn.close()
+        # Includes the time the consumer spent between batches
+        fetch = timer.lap()
+        query_metrics.record(query, caller, connect, execute, fetch, rows, error)
+
+def start_metrics_endpoint():
+    """Serve query metrics in Prometheus format when METRICS_PORT is set"""
+    port = os.environ.get(QUERY_METRICS_SETTINGS["metrics_port_env"])
+    if not port:
+        return
+    try:
+        host = os.environ.get(QUERY_METRICS_SETTINGS["metrics_host_env"]) or "127.0.0.1"
+        start_metrics_server(query_metrics.prometheus, int(port), host)
+    except (OSError, ValueError) as e:
+        st.warning(f"Metrics endpoint not started on port {port}: {e}")
+
+# Databases whose tables this process has created and migrated
+_schema_ready = set()
+_schema_lock = threading.Lock()
 
 def init_database():
+    """
+    Create and migrate the tables once per process and database; later
+    calls return at once. If the database can't be reached, a later call
+    tries again.
+    """
+    args, kwargs = connection_args()
+    target = (args, tuple(sorted(kwargs.items())))
+    with _schema_lock:
+        if target in _schema_ready:
+            return
+        conn = get_pg_connection()
+        if conn is None:
+            return
+        conn.close()
+        _create_schema()
+        _schema_ready.add(target)
+
+def _create_schema():
     """Initialize database tables"""
     try:
         # Users table
@@ -130,10 +314,126 @@ def init_database():
                 status VARCHAR(100),
                 notes TEXT,
                 fee_amount DECIMAL(10,2),
+                duration_minutes INTEGER DEFAULT 30,
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
         ''')
 
+        execute_query(
+            "CREATE INDEX IF NOT EXISTS idx_consultations_lawyer_date ON consultations (lawyer_id, consultation_date)"
+        )
+
+        # Change tracking for incremental calendar sync
+        execute_query(
+            "ALTER TABLE consultations ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP"
+        )
+        execute_query(
+            "CREATE INDEX IF NOT EXISTS idx_consultations_lawyer_updated ON consultations (lawyer_id, updated_at)"
+        )
+
+        # Reject overlapping bookings for the same lawyer atomically
+        execute_query(
+            "ALTER TABLE consultations ADD COLUMN IF NOT EXISTS duration_minutes INTEGER DEFAULT 30"
+        )
+        execute_query("CREATE EXTENSION IF NOT EXISTS btree_gist")
+        try:
+            # Only a concurrent start adding the same constraint is ignored; other
+            # failures reach execute_query's error, or the warning below
+            execute_query('''
+                DO $$
+                BEGIN
+                    IF NOT EXISTS (
+                        SELECT 1 FROM pg_constraint WHERE conname = 'consultations_no_overlap'
+                    ) THEN
+                        ALTER TABLE consultations ADD CONSTRAINT consultations_no_overlap
+                        EXCLUDE USING gist (
+                            lawyer_id WITH =,
+                            tsrange(consultation_date,
+                                    consultation_date + COALESCE(duration_minutes, 30) * INTERVAL '1 minute') WITH &&
+                        ) WHERE (status IS DISTINCT FROM 'Cancelled' AND consultation_date IS NOT NULL);
+                    END IF;
+                EXCEPTION WHEN duplicate_object OR duplicate_table THEN
+                    NULL;
+                END
+                $$;
+            ''')
+        except psycopg2.IntegrityError as e:
+            st.warning(f"Overlapping consultations already exist, so double bookings are not blocked "
+                       f"by the database until they are resolved: {e}")
+
+        # Appointment requests from clients to lawyers
+        execute_query('''
+            CREATE TABLE IF NOT EXISTS appointments (
+                id SERIAL PRIMARY KEY,
+                client_id INTEGER REFERENCES users(id),
+                lawyer_id INTEGER REFERENCES lawyers(id),
+                appointment_date DATE NOT NULL,
+                appointment_time TIME NOT NULL,
+                appointment_type VARCHAR(255),
+                meeting_method VARCHAR(100),
+                duration INTEGER DEFAULT 30,
+                notes TEXT,
+                response_notes TEXT,
+                status VARCHAR(50) DEFAULT 'pending',
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        execute_query(
+            "CREATE INDEX IF NOT EXISTS idx_appointments_lawyer_date ON appointments (lawyer_id, appointment_date)"
+        )
+        execute_query(
+            "CREATE INDEX IF NOT EXISTS idx_appointments_client_date ON appointments (client_id, appointment_date)"
+        )
+
+        # Busy blocks imported from lawyers' external calendars
+        execute_query('''
+            CREATE TABLE IF NOT EXISTS lawyer_busy_blocks (
+                id SERIAL PRIMARY KEY,
+                lawyer_id INTEGER REFERENCES lawyers(id) ON DELETE CASCADE,
+                source_uid VARCHAR(500) NOT NULL,
+                starts_at TIMESTAMP NOT NULL,
+                ends_at TIMESTAMP NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                CONSTRAINT unique_busy_block UNIQUE (lawyer_id, source_uid)
+            )
+        ''')
+        execute_query(
+            "CREATE INDEX IF NOT EXISTS idx_busy_blocks_lawyer_start ON lawyer_busy_blocks (lawyer_id, starts_at)"
+        )
+
+        # Login rate-limit buckets shared by all app replicas
+        execute_query('''
+            CREATE TABLE IF NOT EXISTS login_rate_limits (
+                bucket_key VARCHAR(300) PRIMARY KEY,
+                tokens DOUBLE PRECISION NOT NULL,
+                allowed BOOLEAN NOT NULL DEFAULT TRUE,
+                updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+
+        # Server side of URL session tokens, so they can be revoked (utils/session_manager.py)
+        execute_query('''
+            CREATE TABLE IF NOT EXISTS user_sessions (
+                id CHAR(32) PRIMARY KEY,
+                user_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+                client_hash CHAR(32) NOT NULL,
+                created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                expires_at TIMESTAMP NOT NULL,
+                revoked_at TIMESTAMP
+            )
+        ''')
+        execute_query("CREATE INDEX IF NOT EXISTS idx_user_sessions_user ON user_sessions (user_id)")
+
+        # Platform-wide totals for the home page, recomputed periodically
+        execute_query('''
+            CREATE TABLE IF NOT EXISTS platform_counters (
+                name VARCHAR(50) PRIMARY KEY,
+                value BIGINT NOT NULL,
+                updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+
         # Direct messages table for chat system
         execute_query('''
             CREATE TABLE IF NOT EXISTS direct_messages (
@@ -146,30 +446,77 @@ def init_database():
             )
         ''')
 
+        # Case documents and message attachments; the bytes live in the
+        # object store under their SHA-256, so identical uploads share one object
+        execute_query('''
+            CREATE TABLE IF NOT EXISTS documents (
+                id SERIAL PRIMARY KEY,
+                sha256 CHAR(64) NOT NULL,
+                size_bytes BIGINT NOT NULL,
+                filename VARCHAR(255) NOT NULL,
+                content_type VARCHAR(255),
+                case_id INTEGER REFERENCES cases(id) ON DELETE CASCADE,
+                message_id INTEGER REFERENCES direct_messages(id) ON DELETE CASCADE,
+                uploaded_by INTEGER REFERENCES users(id),
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        execute_query("CREATE INDEX IF NOT EXISTS idx_documents_case ON documents (case_id)")
+        execute_query("CREATE INDEX IF NOT EXISTS idx_documents_message ON documents (message_id)")
+        execute_query("CREATE INDEX IF NOT EXISTS idx_documents_sha256 ON documents (sha256)")
+
+        # Text extracted in the background, for full-text search inside documents
+        execute_query('''
+            ALTER TABLE documents
+                ADD COLUMN IF NOT EXISTS extracted_text TEXT,
+                ADD COLUMN IF NOT EXISTS language VARCHAR(50),
+                ADD COLUMN IF NOT EXISTS page_count INTEGER,
+                ADD COLUMN IF NOT EXISTS search_vector TSVECTOR
+        ''')
+        execute_query("CREATE INDEX IF NOT EXISTS idx_documents_search ON documents USING GIN (search_vector)")
+
+        # Background work on documents, claimed by workers with SKIP LOCKED
+        execute_query('''
+            CREATE TABLE IF NOT EXISTS document_jobs (
+                id SERIAL PRIMARY KEY,
+                document_id INTEGER NOT NULL REFERENCES documents(id) ON DELETE CASCADE,
+                kind VARCHAR(20) NOT NULL,
+                status VARCHAR(20) NOT NULL DEFAULT 'pending',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                error TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                claimed_at TIMESTAMP,
+                finished_at TIMESTAMP,
+                UNIQUE (document_id, kind)
+            )
+        ''')
+        execute_query(
+            "CREATE INDEX IF NOT EXISTS idx_document_jobs_open ON document_jobs (id) WHERE status IN ('pending', 'running')"
+        )
+
     except Exception as e:
         st.error(f"Database initialization error: {e}")
 
 def init_sample_data():
     """Initialize sample data if tables are empty"""
     try:
-        count_result = execute_query("SELECT COUNT(*) FROM lawyers", fetch='one')
-
-        if count_result and count_result[0] == 0:
-            sample_lawyers = [
-                ("Advocate Priya Sharma", "priya.sharma@email.com", "+91-9876543210", "Family Law", 8, "Mumbai", 4.5, "₹500-2000", True, "English, Hindi, Marathi"),
-                ("Advocate Rajesh Kumar", "rajesh.kumar@email.com", "+91-9876543211", "Criminal Law", 12, "Delhi", 4.7, "₹1000-3000", True, "English, Hindi"),
-                ("Advocate Meera Nair", "meera.nair@email.com", "+91-9876543212", "Property Law", 6, "Bangalore", 4.3, "₹800-2500", True, "English, Hindi, Tamil"),
-                ("Advocate Arjun Singh", "arjun.singh@email.com", "+91-9876543213", "Consumer Rights", 5, "Chennai", 4.2, "₹300-1500", True, "English, Hindi, Telugu"),
-                ("Advocate Kavita Patel", "kavita.patel@email.com", "+91-9876543214", "Employment Law", 10, "Pune", 4.6, "₹600-2000", True, "English, Hindi, Gujarati")
-            ]
-
-            for lawyer in sample_lawyers:
-                execute_query(
-                    """INSERT INTO lawyers (name, email, phone, specialization, experience,
-                       location, rating, fee_range, verified, languages)
-                       VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)""", 
-                    lawyer
-                )
+        sample_lawyers = [
+            ("Advocate Priya Sharma", "priya.sharma@email.com", "+91-9876543210", "Family Law", 8, "Mumbai", 4.5, "₹500-2000", True, "English, Hindi, Marathi"),
+            ("Advocate Rajesh Kumar", "rajesh.kumar@email.com", "+91-9876543211", "Criminal Law", 12, "Delhi", 4.7, "₹1000-3000", True, "English, Hindi"),
+            ("Advocate Meera Nair", "meera.nair@email.com", "+91-9876543212", "Property Law", 6, "Bangalore", 4.3, "₹800-2500", True, "English, Hindi, Tamil"),
+            ("Advocate Arjun Singh", "arjun.singh@email.com", "+91-9876543213", "Consumer Rights", 5, "Chennai", 4.2, "₹300-1500", True, "English, Hindi, Telugu"),
+            ("Advocate Kavita Patel", "kavita.patel@email.com", "+91-9876543214", "Employment Law", 10, "Pune", 4.6, "₹600-2000", True, "English, Hindi, Gujarati")
+        ]
+
+        # One statement: the emptiness check and all rows share a round-trip
+        placeholders = ", ".join(["(%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)"] * len(sample_lawyers))
+        execute_query(
+            f"""INSERT INTO lawyers (name, email, phone, specialization, experience,
+                   location, rating, fee_range, verified, languages)
+                SELECT * FROM (VALUES {placeholders}) AS sample
+                WHERE NOT EXISTS (SELECT 1 FROM lawyers)""",
+            [value for lawyer in sample_lawyers for value in lawyer]
+        )
 
     except Exception as e:
         st.error(f"Sample data initialization error: {e}")
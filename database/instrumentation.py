@@ -0,0 +1,310 @@
+import hashlib
+import random
+import re
+import sys
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+from datetime import datetime
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+_COMMENTS = re.compile(r"--[^\n]*|/\*.*?\*/", re.S)
+_STRINGS = re.compile(r"'(?:[^']|'')*'")
+_NUMBERS = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PARAMS = re.compile(r"%\(\w+\)s|%s")
+_LISTS = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_REPEATED_LISTS = re.compile(r"\(\.\.\.\)(?:\s*,\s*\(\.\.\.\))+")
+_SPACE = re.compile(r"\s+")
+
+# Frames from these modules are plumbing, not the caller we want to report
+_PLUMBING = ("database.db_manager", "database.instrumentation", "database.prepared")
+
+# Per-thread list of individual calls, collected while a trace is active
+_trace = threading.local()
+
+def start_trace():
+    """Start collecting (started_at, seconds, caller, rows, error) for this thread's queries"""
+    _trace.events = []
+    return _trace.events
+
+def current_trace():
+    """Get this thread's active event list (None when not tracing)"""
+    return getattr(_trace, "events", None)
+
+def attach_trace(events):
+    """Record this thread's queries into another thread's trace (None detaches)"""
+    _trace.events = events
+
+def stop_trace():
+    """Stop collecting and return the events gathered since start_trace()"""
+    events = getattr(_trace, "events", None)
+    _trace.events = None
+    return events or []
+
+@lru_cache(maxsize=2048)
+def fingerprint(query):
+    """
+    Normalize a statement so calls differing only in literals share a key.
+    Returns (fingerprint_id, normalized_text).
+    """
+    text = _COMMENTS.sub(" ", query)
+    text = _STRINGS.sub("?", text)
+    text = _PARAMS.sub("?", text)
+    text = _NUMBERS.sub("?", text)
+    text = _LISTS.sub("(...)", text)
+    text = _REPEATED_LISTS.sub("(...), ...", text)
+    text = _SPACE.sub(" ", text).strip()
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()[:12], text
+
+def calling_function(depth=2):
+    """Name the first function outside the database layer, as module.function"""
+    frame = sys._getframe(depth)
+    while frame is not None:
+        module = frame.f_globals.get("__name__", "")
+        if module not in _PLUMBING:
+            return f"{module}.{frame.f_code.co_name}"
+        frame = frame.f_back
+    return "unknown"
+
+class Histogram:
+    """Cumulative-bucket latency histogram in seconds, Prometheus style"""
+
+    def __init__(self, buckets):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # Last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        if value > self.max:
+            self.max = value
+
+    def quantile(self, q):
+        """Estimate a quantile by interpolating inside its bucket"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            if seen + count >= rank and count:
+                if index == len(self.buckets):
+                    return self.max
+                lower = self.buckets[index - 1] if index else 0.0
+                upper = min(self.buckets[index], self.max)
+                return lower + (upper - lower) * (rank - seen) / count
+            seen += count
+        return self.max
+
+    def cumulative(self):
+        """Yield (upper_bound, cumulative_count), ending with +Inf"""
+        total = 0
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            total += count
+            yield bound, total
+
+class QueryStats:
+    """Aggregates for one statement fingerprint"""
+
+    def __init__(self, text, buckets):
+        self.text = text
+        self.calls = 0
+        self.errors = 0
+        self.rows = 0
+        self.callers = {}
+        self.phases = {phase: Histogram(buckets) for phase in ("connect", "execute", "fetch", "total")}
+
+class QueryMetrics:
+    """
+    Thread-safe, in-process registry of query timings.
+    Every call is folded into per-fingerprint histograms (connect, execute,
+    fetch and total); calls over `slow_query_ms` are also kept, newest
+    first, in a bounded slow-query log.
+    """
+
+    OVERFLOW = "other"
+
+    def __init__(self, buckets, slow_query_ms=250, slow_log_size=200,
+                 explain_sample_rate=0.1, max_fingerprints=500, enabled=True):
+        self.buckets = tuple(buckets)
+        self.slow_query_seconds = slow_query_ms / 1000
+        self.explain_sample_rate = explain_sample_rate
+        self.max_fingerprints = max_fingerprints
+        self.enabled = enabled
+        self.started_at = datetime.now()
+        self._stats = {}
+        self._slow = deque(maxlen=slow_log_size)
+        self._lock = threading.Lock()
+
+    def is_slow(self, seconds):
+        return seconds >= self.slow_query_seconds
+
+    def should_explain(self, query, seconds):
+        """Decide whether to capture a plan for this (slow) call"""
+        # Plain EXPLAIN never runs the statement, but DDL can't be explained at all
+        return (self.is_slow(seconds) and random.random() < self.explain_sample_rate
+                and query.lstrip()[:6].upper().startswith(("SELECT", "WITH")))
+
+    def record(self, query, caller, connect=0.0, execute=0.0, fetch=0.0, rows=0, error=None, plan=None):
+        """Fold one call into the aggregates; timings are in seconds"""
+        total = connect + execute + fetch
+        events = getattr(_trace, "events", None)
+        if events is not None:
+            events.append((time.perf_counter() - total, total, caller, rows, error))
+        if not self.enabled:
+            return
+        key, text = fingerprint(query)
+
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                if len(self._stats) >= self.max_fingerprints:
+                    key, text = self.OVERFLOW, "(statements beyond max_fingerprints)"
+                    stats = self._stats.get(key)
+                if stats is None:
+                    stats = self._stats[key] = QueryStats(text, self.buckets)
+
+            stats.calls += 1
+            stats.rows += rows
+            stats.callers[caller] = stats.callers.get(caller, 0) + 1
+            if error:
+                stats.errors += 1
+            for phase, seconds in (("connect", connect), ("execute", execute),
+                                   ("fetch", fetch), ("total", total)):
+                stats.phases[phase].observe(seconds)
+
+            if self.is_slow(total) or error:
+                self._slow.appendleft({
+                    'at': datetime.now(),
+                    'fingerprint': key,
+                    'query': text,
+                    'caller': caller,
+                    'total_ms': total * 1000,
+                    'connect_ms': connect * 1000,
+                    'execute_ms': execute * 1000,
+                    'fetch_ms': fetch * 1000,
+                    'rows': rows,
+                    'error': error,
+                    'plan': plan,
+                })
+
+    def snapshot(self):
+        """Per-fingerprint summary rows, slowest total time first"""
+        with self._lock:
+            rows = []
+            for key, stats in self._stats.items():
+                total = stats.phases["total"]
+                rows.append({
+                    'fingerprint': key,
+                    'query': stats.text,
+                    'callers': ", ".join(sorted(stats.callers, key=stats.callers.get, reverse=True)),
+                    'calls': stats.calls,
+                    'errors': stats.errors,
+                    'rows': stats.rows,
+                    'total_ms': total.sum * 1000,
+                    'mean_ms': total.sum * 1000 / stats.calls,
+                    'p50_ms': total.quantile(0.50) * 1000,
+                    'p95_ms': total.quantile(0.95) * 1000,
+                    'p99_ms': total.quantile(0.99) * 1000,
+                    'max_ms': total.max * 1000,
+                    'connect_mean_ms': stats.phases["connect"].sum * 1000 / stats.calls,
+                    'execute_mean_ms': stats.phases["execute"].sum * 1000 / stats.calls,
+                    'fetch_mean_ms': stats.phases["fetch"].sum * 1000 / stats.calls,
+                })
+        rows.sort(key=lambda row: row['total_ms'], reverse=True)
+        return rows
+
+    def slow_queries(self):
+        """Slow or failed calls, newest first"""
+        with self._lock:
+            return list(self._slow)
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+            self._slow.clear()
+            self.started_at = datetime.now()
+
+    def prometheus(self, prefix="legal_aid_db"):
+        """Render the aggregates in the Prometheus text exposition format"""
+        lines = [
+            f"# HELP {prefix}_query_seconds Query latency by fingerprint and phase.",
+            f"# TYPE {prefix}_query_seconds histogram",
+        ]
+        counters = {'queries': [], 'query_errors': [], 'query_rows': []}
+        with self._lock:
+            for key, stats in self._stats.items():
+                for phase, histogram in stats.phases.items():
+                    labels = f'fingerprint="{key}",phase="{phase}"'
+                    for bound, count in histogram.cumulative():
+                        le = "+Inf" if bound == float("inf") else repr(float(bound))
+                        lines.append(f'{prefix}_query_seconds_bucket{{{labels},le="{le}"}} {count}')
+                    lines.append(f"{prefix}_query_seconds_sum{{{labels}}} {histogram.sum!r}")
+                    lines.append(f"{prefix}_query_seconds_count{{{labels}}} {histogram.count}")
+                for caller, calls in stats.callers.items():
+                    counters['queries'].append(f'{{fingerprint="{key}",caller="{caller}"}} {calls}')
+                counters['query_errors'].append(f'{{fingerprint="{key}"}} {stats.errors}')
+                counters['query_rows'].append(f'{{fingerprint="{key}"}} {stats.rows}')
+            slow = len(self._slow)
+
+        for name, help_text in (('queries', "Queries executed by fingerprint and calling function."),
+                                ('query_errors', "Queries that raised an error."),
+                                ('query_rows', "Rows returned or affected.")):
+            lines.append(f"# HELP {prefix}_{name}_total {help_text}")
+            lines.append(f"# TYPE {prefix}_{name}_total counter")
+            lines.extend(f"{prefix}_{name}_total{sample}" for sample in counters[name])
+        lines.append(f"# HELP {prefix}_slow_log_entries Entries currently held in the slow-query log.")
+        lines.append(f"# TYPE {prefix}_slow_log_entries gauge")
+        lines.append(f"{prefix}_slow_log_entries {slow}")
+        return "\n".join(lines) + "\n"
+
+class Timer:
+    """Split a call into phases: `lap()` returns seconds since the previous lap"""
+
+    __slots__ = ("_last",)
+
+    def __init__(self):
+        self._last = time.perf_counter()
+
+    def lap(self):
+        now = time.perf_counter()
+        elapsed, self._last = now - self._last, now
+        return elapsed
+
+_server = None
+_server_lock = threading.Lock()
+
+def start_metrics_server(render, port, host="127.0.0.1"):
+    """
+    Serve `render()` as text/plain on http://host:port/metrics from a daemon
+    thread. Safe to call on every rerun; only the first call binds the port.
+    """
+    global _server
+    with _server_lock:
+        if _server is not None:
+            return _server
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # Scrapes every few seconds would flood the app log
+
+        _server = ThreadingHTTPServer((host, port), MetricsHandler)
+        _server.daemon_threads = True
+        threading.Thread(target=_server.serve_forever, name="metrics-server", daemon=True).start()
+        return _server
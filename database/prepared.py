@@ -0,0 +1,314 @@
+import hashlib
+import os
+import re
+import threading
+from datetime import datetime
+from functools import lru_cache
+import psycopg2
+from psycopg2 import errorcodes, extensions, pool
+from config.settings import PREPARED_STATEMENT_SETTINGS
+from database.db_manager import (
+    _explain, connection_args, deadline_timeout_ms, execute_query, query_metrics, report_error
+)
+from database.instrumentation import Timer, calling_function, fingerprint
+from database.records import rows_to_records
+
+_NAMED_PARAMS = re.compile(r"%\(\w+\)s")
+_PLACEHOLDERS = re.compile(r"%s|%%")
+_PLANNING_TIME = re.compile(r"Planning Time: ([\d.]+) ms")
+
+# Statements PREPARE accepts
+_PREPARABLE = ("SELECT", "WITH", "INSERT", "UPDATE", "DELETE", "VALUES")
+
+# EXECUTE errors fixed by preparing again: the backend doesn't know the name
+# (DISCARD ALL, a restarted server) or the cached plan's result type changed (ALTER TABLE)
+_REPREPARE = (errorcodes.INVALID_SQL_STATEMENT_NAME, errorcodes.FEATURE_NOT_SUPPORTED)
+
+# PREPARE errors that mean the statement itself can't be prepared, e.g. a
+# parameter whose type only the literal psycopg2 sends would settle
+_NOT_PREPARABLE = (errorcodes.INDETERMINATE_DATATYPE, errorcodes.AMBIGUOUS_PARAMETER,
+                   errorcodes.SYNTAX_ERROR, errorcodes.FEATURE_NOT_SUPPORTED)
+
+# statement_timeout state lost by a rollback; the next call sets it again
+_UNKNOWN = object()
+
+class _Unpreparable(Exception):
+    """PREPARE rejected the statement; it runs through execute_query from now on"""
+
+class PreparedConnection(extensions.connection):
+    """A pooled connection that remembers the statements prepared in its session"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.prepared = {}  # Statement name -> executions on this connection
+        self.timeout_ms = None  # statement_timeout set in this session; None is the server default
+
+class PreparedStats:
+    """
+    Thread-safe counters for prepared execution, by statement fingerprint.
+    Planning time is measured once per statement with EXPLAIN (SUMMARY);
+    the time saved counts only executions past PostgreSQL's custom-plan
+    warm-up on each connection, so parse time saved is not included.
+    """
+
+    def __init__(self, custom_plan_executions):
+        self.custom_plan_executions = custom_plan_executions
+        self.started_at = datetime.now()
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def _entry(self, query):
+        key, text = fingerprint(query)
+        entry = self._stats.get(key)
+        if entry is None:
+            entry = self._stats[key] = {
+                'fingerprint': key, 'query': text, 'prepares': 0, 'executions': 0, 'generic_eligible': 0,
+                'reprepares': 0, 'fallbacks': 0, 'planning_ms': None, 'planning_measured': False,
+            }
+        return entry
+
+    def count(self, query, **increments):
+        with self._lock:
+            entry = self._entry(query)
+            for name, value in increments.items():
+                entry[name] += value
+
+    def claim_planning(self, query):
+        """True for the first caller only, who then measures the statement's planning time"""
+        with self._lock:
+            entry = self._entry(query)
+            claimed, entry['planning_measured'] = not entry['planning_measured'], True
+            return claimed
+
+    def set_planning(self, query, planning_ms):
+        with self._lock:
+            self._entry(query)['planning_ms'] = planning_ms
+
+    def snapshot(self):
+        """Per-fingerprint rows, most planning time saved first"""
+        with self._lock:
+            rows = [
+                {**entry, 'saved_ms': (entry['planning_ms'] or 0.0) * entry['generic_eligible']}
+                for entry in self._stats.values()
+            ]
+        return sorted(rows, key=lambda row: (row['saved_ms'], row['executions']), reverse=True)
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+            self.started_at = datetime.now()
+
+prepared_stats = PreparedStats(PREPARED_STATEMENT_SETTINGS["custom_plan_executions"])
+
+# Class of pooled connections; benchmarks swap in a subclass that counts
+# connections and statements
+connection_factory = PreparedConnection
+
+_pool = None
+_pool_key = None
+_pool_lock = threading.Lock()
+_unpreparable = set()  # Names of statements PREPARE rejected
+
+def _get_pool():
+    """
+    The process's connection pool, built on first use and again after a
+    fork or when the database settings or connection_factory change.
+    """
+    global _pool, _pool_key
+    args, kwargs = connection_args()
+    key = (os.getpid(), connection_factory, args, tuple(sorted(kwargs.items())))
+    with _pool_lock:
+        if _pool is None or _pool_key != key:
+            if _pool is not None and _pool_key[0] == os.getpid():
+                _pool.closeall()  # A forked child must leave its parent's sockets alone
+            _pool = pool.ThreadedConnectionPool(
+                PREPARED_STATEMENT_SETTINGS["min_connections"], PREPARED_STATEMENT_SETTINGS["max_connections"],
+                *args, connection_factory=connection_factory, **kwargs
+            )
+            _pool_key = key
+        return _pool
+
+def reset_pool():
+    """Close the pool's connections; the next call opens new ones"""
+    global _pool, _pool_key
+    with _pool_lock:
+        if _pool is not None and _pool_key[0] == os.getpid():
+            _pool.closeall()
+        _pool = _pool_key = None
+
+def _release(connection_pool, conn):
+    try:
+        connection_pool.putconn(conn, close=bool(conn.closed))
+    except pool.PoolError:
+        conn.close()  # The pool was replaced while this call held the connection
+
+@lru_cache(maxsize=256)
+def _statement(query):
+    """(name, PREPARE text, EXECUTE text) for a %s-style query, or None when it can't be prepared"""
+    if _NAMED_PARAMS.search(query) or not query.lstrip()[:6].upper().startswith(_PREPARABLE):
+        return None
+    count = 0
+
+    def number(match):
+        nonlocal count
+        if match.group() == "%%":
+            return "%"
+        count += 1
+        return f"${count}"
+
+    body = _PLACEHOLDERS.sub(number, query)
+    # Named by the exact text: fingerprints would merge statements differing in literals
+    name = "ps_" + hashlib.sha1(query.encode("utf-8")).hexdigest()[:16]
+    arguments = f" ({', '.join(['%s'] * count)})" if count else ""
+    return name, f"PREPARE {name} AS {body}", f"EXECUTE {name}{arguments}"
+
+def _deadline_prefix(conn):
+    """SET for this thread's statement_deadline when the session's differs, sent with the next statement"""
+    timeout_ms = deadline_timeout_ms()
+    if timeout_ms == conn.timeout_ms:
+        return ""
+    conn.timeout_ms = timeout_ms
+    return "SET statement_timeout = DEFAULT; " if timeout_ms is None else f"SET statement_timeout = {timeout_ms}; "
+
+def _is_read(query):
+    return query.lstrip()[:6].upper().startswith(("SELECT", "WITH"))
+
+def _run(conn, statement, query, params, fetch):
+    """PREPARE on first use in this session, then EXECUTE; returns (result, rows)"""
+    name, prepare_sql, execute_sql = statement
+    with conn.cursor() as cur:
+        prefix = _deadline_prefix(conn)
+        if name not in conn.prepared:
+            try:
+                cur.execute(prefix + prepare_sql)
+            except psycopg2.Error as e:
+                if e.pgcode in _NOT_PREPARABLE:
+                    raise _Unpreparable(e) from e
+                raise
+            conn.prepared[name] = 0
+            prefix = ""
+            prepared_stats.count(query, prepares=1)
+        cur.execute(prefix + execute_sql, params or None)
+
+        if fetch == 'records':
+            result = rows_to_records(cur.description, cur.fetchall())
+            rows = len(result)
+        elif fetch:
+            result = cur.fetchall() if fetch == 'all' else cur.fetchone()
+            rows = len(result) if fetch == 'all' else int(result is not None)
+        else:
+            result = None
+            rows = max(cur.rowcount, 0)
+    conn.commit()
+
+    conn.prepared[name] += 1
+    prepared_stats.count(
+        query, executions=1, generic_eligible=int(conn.prepared[name] > prepared_stats.custom_plan_executions)
+    )
+    return result, rows
+
+def _measure_planning(conn, query, params):
+    """Record the statement's planning time from EXPLAIN (SUMMARY), which doesn't run it"""
+    try:
+        with conn.cursor() as cur:
+            cur.execute("EXPLAIN (SUMMARY) " + query, params or None)
+            plan = "\n".join(row[0] for row in cur.fetchall())
+        match = _PLANNING_TIME.search(plan)
+        if match:
+            prepared_stats.set_planning(query, float(match.group(1)))
+    except psycopg2.Error:
+        pass
+    finally:
+        conn.rollback()  # Only the EXPLAIN is undone; the statement itself was committed
+
+def execute_prepared(query, params=None, fetch=False):
+    """
+    Drop-in for execute_query for statements run many times with different
+    parameters. Each pooled connection PREPAREs the statement once and then
+    EXECUTEs it, skipping parsing and, once PostgreSQL settles on a generic
+    plan, planning. A statement the backend lost is prepared again, and a
+    read whose connection dropped is retried on a new one. Falls back to
+    execute_query when disabled, when every pooled connection is busy, and
+    for statements with named parameters or that PREPARE rejects.
+    """
+    statement = _statement(query) if PREPARED_STATEMENT_SETTINGS["enabled"] else None
+    if statement is None or statement[0] in _unpreparable:
+        return execute_query(query, params, fetch)
+
+    timer = Timer()
+    try:
+        connection_pool = _get_pool()
+        conn = connection_pool.getconn()
+    except Exception:
+        prepared_stats.count(query, fallbacks=1)
+        return execute_query(query, params, fetch)
+
+    timings = {'connect': timer.lap(), 'execute': 0.0, 'fetch': 0.0}
+    rows = 0
+    error = None
+    plan = None
+    result = None
+    fallback = False
+    try:
+        for attempt in range(2):
+            try:
+                result, rows = _run(conn, statement, query, params, fetch)
+                break
+            except _Unpreparable:
+                conn.rollback()
+                conn.timeout_ms = _UNKNOWN
+                _unpreparable.add(statement[0])
+                fallback = True
+                break
+            except psycopg2.Error as e:
+                if not conn.closed:
+                    conn.rollback()
+                conn.timeout_ms = _UNKNOWN
+                if attempt:
+                    raise
+                if conn.closed and _is_read(query):
+                    # Dropped connection: a new one starts with nothing prepared
+                    connection_pool.putconn(conn, close=True)
+                    conn = None  # Not returned twice if getconn fails
+                    conn = connection_pool.getconn()
+                elif e.pgcode in _REPREPARE and not conn.closed:
+                    # Start the session's statements over; this one is prepared again below
+                    with conn.cursor() as cur:
+                        cur.execute("DEALLOCATE ALL")
+                    conn.commit()
+                    conn.prepared.clear()
+                else:
+                    raise
+                prepared_stats.count(query, reprepares=1)
+        timings['execute'] = timer.lap()
+
+        if not fallback:
+            if prepared_stats.claim_planning(query):
+                _measure_planning(conn, query, params)
+            # Sampled plan for slow reads, as in execute_query
+            if query_metrics.should_explain(query, sum(timings.values())):
+                with conn.cursor() as cur:
+                    plan = _explain(cur, query, params)
+                conn.rollback()
+
+    except psycopg2.IntegrityError as e:
+        error = type(e).__name__
+        raise e
+    except Exception as e:
+        error = type(e).__name__
+        if conn is not None and not conn.closed:
+            conn.rollback()
+        report_error(f"Database query error: {e}")
+        return None
+    finally:
+        if conn is not None:
+            _release(connection_pool, conn)
+        if error:
+            timings['execute'] += timer.lap()
+        if not fallback:
+            query_metrics.record(query, calling_function(), rows=rows, error=error, plan=plan, **timings)
+
+    if fallback:
+        prepared_stats.count(query, fallbacks=1)
+        return execute_query(query, params, fetch)
+    return result
@@ -0,0 +1,28 @@
+from functools import lru_cache
+
+class Projection:
+    """
+    The columns a query may return, as {field: SQL expression}. Pages
+    declare the fields they render and queries select only those, so the
+    record type and the bytes on the wire follow the page instead of the
+    table.
+    """
+
+    def __init__(self, name, columns):
+        self.name = name
+        self.columns = dict(columns)
+
+    @lru_cache(maxsize=64)
+    def select_list(self, fields):
+        """SELECT list for a tuple of field names, aliased so records use those names"""
+        unknown = [field for field in fields if field not in self.columns]
+        if unknown:
+            raise ValueError(f"{self.name} has no field(s) {', '.join(unknown)}")
+        return ", ".join(
+            expression if expression.rsplit(".", 1)[-1] == field else f"{expression} AS {field}"
+            for field, expression in ((field, self.columns[field]) for field in fields)
+        )
+
+    def extend(self, name, columns):
+        """A projection with extra joined columns, e.g. the other party of an appointment"""
+        return Projection(name, {**self.columns, **columns})
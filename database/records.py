@@ -0,0 +1,13 @@
+from collections import namedtuple
+from functools import lru_cache
+
+@lru_cache(maxsize=256)
+def record_type(columns):
+    """Get a namedtuple class for a tuple of column names (one class per column set)"""
+    # rename=True turns duplicate or invalid names (e.g. from SELECT *) into _0, _1, ...
+    return namedtuple("Record", columns, rename=True)
+
+def rows_to_records(description, rows):
+    """Map cursor rows onto named tuples using the cursor description"""
+    make = record_type(tuple(column[0] for column in description))._make
+    return list(map(make, rows))
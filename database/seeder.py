@@ -0,0 +1,332 @@
+"""Seed PostgreSQL with a synthetic, reproducible dataset for load and benchmark runs.
+
+Usage: DATABASE_URL=postgresql://... python -m database.seeder [--citizens 20000]
+       [--lawyers 2000] [--cases 50000] [--consultations 100000]
+       [--messages 200000] [--chats 100000] [--seed 42] [--init-schema]
+
+Rows are streamed into COPY FROM STDIN, so nothing is built in memory, and
+the whole dataset loads in one transaction. New ids continue after the current
+maximum of each table, so a seed can be layered onto an existing database.
+Every seeded account uses the password printed at the end.
+"""
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+from database.db_manager import get_pg_connection, init_database
+from utils.auth_manager import hash_password
+
+SEED_PASSWORD = "seed-password"
+
+CITIES = ["Mumbai", "Delhi", "Bangalore", "Chennai", "Pune", "Hyderabad", "Kolkata", "Other"]
+LANGUAGES = ["English", "Hindi", "Bengali", "Telugu", "Marathi", "Tamil", "Gujarati",
+             "Kannada", "Malayalam", "Punjabi"]
+SPECIALIZATIONS = ["Family Law", "Criminal Law", "Property Law", "Consumer Rights",
+                   "Employment Law", "Cyber Crime", "Civil Rights", "Tax Law"]
+CASE_STATUSES = ["Open", "Open", "In Progress", "In Progress", "Closed"]
+PRIORITIES = ["Low", "Medium", "High", "Urgent"]
+CONSULTATION_STATUSES = ["Pending", "Confirmed", "Completed", "Completed", "Cancelled"]
+FIRST_NAMES = ["Aarav", "Priya", "Rohan", "Ananya", "Vikram", "Kavya", "Arjun", "Meera",
+               "Ishaan", "Lakshmi", "Sanjay", "Fatima", "Harpreet", "Sourav", "Deepa"]
+LAST_NAMES = ["Sharma", "Iyer", "Banerjee", "Reddy", "Patil", "Khan", "Singh", "Nair",
+              "Das", "Gupta", "Menon", "Joshi", "Kulkarni", "Chatterjee", "Rao"]
+
+# Chat questions per language, so seeded text exercises multi-byte scripts
+QUESTIONS = {
+    "Hindi": ["मेरे मकान मालिक ने जमा राशि वापस नहीं की, मैं क्या करूँ?",
+              "क्या मैं ऑनलाइन एफआईआर दर्ज कर सकता हूँ?"],
+    "Bengali": ["আমার নিয়োগকর্তা বেতন দিচ্ছেন না, আমি কী করতে পারি?"],
+    "Tamil": ["என் நில உரிமை ஆவணங்களை எப்படி சரிபார்ப்பது?"],
+    "Telugu": ["వినియోగదారుల ఫిర్యాదు ఎలా దాఖలు చేయాలి?"],
+    "Marathi": ["घटस्फोटासाठी कोणती कागदपत्रे लागतात?"],
+    "Gujarati": ["ભાડા કરારમાં કઈ શરતો હોવી જોઈએ?"],
+    "English": ["How do I apply for free legal aid?",
+                "What should I do if I receive a cheque bounce notice?"],
+}
+QUESTION_LANGUAGES = list(QUESTIONS)
+RESPONSE = "You may be eligible for free legal aid under the Legal Services Authorities Act, 1987. "
+
+def _copy_text(value):
+    # Chained replace is several times faster than str.translate here
+    return (value.replace("\\", "\\\\").replace("\t", "\\t")
+            .replace("\n", "\\n").replace("\r", "\\r"))
+
+# Exact-type dispatch: one dict lookup per value instead of an isinstance chain
+_COPY_FORMATTERS = {
+    str: _copy_text,
+    int: str,
+    float: repr,
+    bool: lambda value: "t" if value else "f",
+    datetime: lambda value: value.isoformat(" "),
+    type(None): lambda value: "\\N",
+}
+
+def copy_line(row):
+    """Encode one row as a line of COPY text format"""
+    formatters = _COPY_FORMATTERS
+    return ("\t".join([formatters.get(type(value), str)(value) for value in row]) + "\n").encode("utf-8")
+
+class RowStream:
+    """File-like reader that encodes rows on demand for copy_expert"""
+
+    def __init__(self, rows):
+        self._rows = iter(rows)
+        self._pending = b""
+        self.count = 0
+
+    def read(self, size=-1):
+        parts = [self._pending]
+        filled = len(self._pending)
+        for row in self._rows:
+            line = copy_line(row)
+            parts.append(line)
+            filled += len(line)
+            self.count += 1
+            if 0 <= size <= filled:
+                break
+        data = b"".join(parts)
+        if size < 0:
+            size = len(data)
+        self._pending = data[size:]
+        return data[:size]
+
+# random.choice/randrange validate their arguments on every call; these are
+# several times cheaper and still reproducible for a given seed
+def pick(rng, items):
+    return items[int(rng.random() * len(items))]
+
+def below(rng, limit):
+    return int(rng.random() * limit)
+
+def between(rng, low, high):
+    """Random integer in [low, high)"""
+    return low + int(rng.random() * (high - low))
+
+def full_name(rng):
+    return f"{pick(rng, FIRST_NAMES)} {pick(rng, LAST_NAMES)}"
+
+def generate_users(rng, first_id, citizens, lawyers, password, now):
+    """Citizens first, then lawyer accounts"""
+    for offset in range(citizens + lawyers):
+        user_id = first_id + offset
+        user_type = "Citizen" if offset < citizens else "Lawyer"
+        yield (user_id, f"seed_{user_id}", password, f"seed_{user_id}@example.com",
+               f"+91-9{below(rng, 10 ** 9):09d}", pick(rng, CITIES), pick(rng, LANGUAGES),
+               user_type, now - timedelta(days=between(rng, 1, 720)))
+
+def generate_lawyers(rng, first_id, lawyer_user_ids, now):
+    for offset, user_id in enumerate(lawyer_user_ids):
+        low = pick(rng, [300, 500, 800, 1000, 1500])
+        yield (first_id + offset, f"Adv. {full_name(rng)}", f"seed_{user_id}@example.com",
+               f"+91-8{below(rng, 10 ** 9):09d}", pick(rng, SPECIALIZATIONS),
+               between(rng, 1, 36), pick(rng, CITIES), round(rng.uniform(3.0, 5.0), 2),
+               f"₹{low}-{low * 3}", rng.random() < 0.9,
+               ", ".join(rng.sample(LANGUAGES, between(rng, 1, 4))), user_id,
+               now - timedelta(days=between(rng, 1, 720)))
+
+def generate_cases(rng, first_id, count, citizen_ids, lawyer_user_ids, now):
+    for offset in range(count):
+        created = now - timedelta(days=below(rng, 365), minutes=below(rng, 1440))
+        status = pick(rng, CASE_STATUSES)
+        lawyer = pick(rng, lawyer_user_ids) if status != "Open" or rng.random() < 0.3 else None
+        category = pick(rng, SPECIALIZATIONS)
+        yield (first_id + offset, pick(rng, citizen_ids), lawyer,
+               f"{category} matter #{first_id + offset}",
+               f"Client needs help with a {category.lower()} dispute in {pick(rng, CITIES)}.",
+               category, status, pick(rng, PRIORITIES), created,
+               created + timedelta(days=below(rng, 30)))
+
+def generate_consultations(rng, first_id, count, citizen_ids, lawyer_ids, now):
+    """Non-overlapping hourly slots per lawyer, spread around today"""
+    per_lawyer = -(-count // len(lawyer_ids))
+    days_back = per_lawyer // 16  # about half of each lawyer's slots are in the past
+    produced = 0
+    for lawyer_id in lawyer_ids:
+        slot = datetime.combine(now.date() - timedelta(days=days_back), datetime.min.time())
+        for _ in range(min(per_lawyer, count - produced)):
+            # Hourly slots from 09:00 to 17:00, so durations of up to an hour never overlap
+            slot += timedelta(hours=1)
+            if slot.hour >= 18:
+                slot += timedelta(hours=15)
+            elif slot.hour < 9:
+                slot = slot.replace(hour=9)
+            status = pick(rng, CONSULTATION_STATUSES) if slot < now else pick(rng, ["Pending", "Confirmed"])
+            created = min(slot, now) - timedelta(days=between(rng, 1, 14))
+            yield (first_id + produced, pick(rng, citizen_ids), lawyer_id, slot, status,
+                   "Initial consultation", pick(rng, [0, 500, 1000, 1500]),
+                   pick(rng, [30, 60]), created, created)
+            produced += 1
+
+def generate_direct_messages(rng, first_id, count, citizen_ids, lawyer_user_ids, now):
+    """Short conversations between a citizen and a lawyer"""
+    produced = 0
+    while produced < count:
+        citizen, lawyer = pick(rng, citizen_ids), pick(rng, lawyer_user_ids)
+        sent = now - timedelta(days=below(rng, 180), minutes=below(rng, 1440))
+        for turn in range(min(between(rng, 2, 13), count - produced)):
+            sender, receiver = (citizen, lawyer) if turn % 2 == 0 else (lawyer, citizen)
+            sent += timedelta(minutes=between(rng, 1, 241))
+            read_at = sent + timedelta(minutes=between(rng, 1, 601)) if rng.random() < 0.8 else None
+            yield (first_id + produced, sender, receiver,
+                   pick(rng, QUESTIONS[pick(rng, QUESTION_LANGUAGES)]), sent, read_at)
+            produced += 1
+
+def generate_chat_logs(rng, first_id, count, citizen_ids, now):
+    for offset in range(count):
+        language = pick(rng, QUESTION_LANGUAGES)
+        yield (first_id + offset, pick(rng, citizen_ids), pick(rng, QUESTIONS[language]),
+               RESPONSE * between(rng, 1, 4), language,
+               now - timedelta(days=below(rng, 365), minutes=below(rng, 1440)))
+
+TABLES = {
+    'users': "id, username, password, email, phone, location, language, user_type, created_at",
+    'lawyers': "id, name, email, phone, specialization, experience, location, rating, "
+               "fee_range, verified, languages, user_id, created_at",
+    'cases': "id, user_id, lawyer_id, title, description, category, status, priority, "
+             "created_at, updated_at",
+    'consultations': "id, user_id, lawyer_id, consultation_date, status, notes, fee_amount, "
+                     "duration_minutes, created_at, updated_at",
+    'direct_messages': "id, sender_id, receiver_id, message, sent_at, read_at",
+    'chat_messages': "id, user_id, message, response, language, created_at",
+}
+
+def table_rows(table, plan):
+    """Row generator for one table; each table has its own seeded stream"""
+    rng = random.Random(f"{plan['seed']}:{table}")
+    first, now = plan['first'][table], plan['now']
+    if table == 'users':
+        return generate_users(rng, first, len(plan['citizen_ids']), len(plan['lawyer_user_ids']),
+                              plan['password'], now)
+    if table == 'lawyers':
+        return generate_lawyers(rng, first, plan['lawyer_user_ids'], now)
+    if table == 'cases':
+        return generate_cases(rng, first, plan['counts']['cases'], plan['citizen_ids'],
+                              plan['lawyer_user_ids'], now)
+    if table == 'consultations':
+        return generate_consultations(rng, first, plan['counts']['consultations'],
+                                      plan['citizen_ids'], plan['lawyer_ids'], now)
+    if table == 'direct_messages':
+        return generate_direct_messages(rng, first, plan['counts']['direct_messages'],
+                                        plan['citizen_ids'], plan['lawyer_user_ids'], now)
+    return generate_chat_logs(rng, first, plan['counts']['chat_messages'], plan['citizen_ids'], now)
+
+def copy_rows(cur, table, rows):
+    """Stream rows into a table; returns (table, row count, seconds)"""
+    stream = RowStream(rows)
+    began = time.perf_counter()
+    cur.copy_expert(f"COPY {table} ({TABLES[table]}) FROM STDIN", stream, size=1 << 16)
+    return table, stream.count, time.perf_counter() - began
+
+def make_plan(conn, citizens, lawyers, counts, random_seed):
+    """Fix ids and shared values so every table can be generated independently"""
+    with conn.cursor() as cur:
+        first = {}
+        for table in TABLES:
+            cur.execute(f"SELECT COALESCE(MAX(id), 0) + 1 FROM {table}")
+            first[table] = cur.fetchone()[0]
+
+    users_end = first['users'] + citizens + lawyers
+    return {
+        'seed': random_seed,
+        'now': datetime.now().replace(microsecond=0),
+        'first': first,
+        'counts': counts,
+        'citizen_ids': range(first['users'], first['users'] + citizens),
+        'lawyer_user_ids': range(first['users'] + citizens, users_end),
+        # consultations.lawyer_id holds lawyers.id
+        'lawyer_ids': range(first['lawyers'], first['lawyers'] + lawyers),
+        # One real scrypt hash shared by every seeded account
+        'password': hash_password(SEED_PASSWORD),
+    }
+
+def foreign_keys(cur, tables):
+    """Get (table, name, definition) for the foreign keys on the given tables"""
+    cur.execute(
+        """SELECT conrelid::regclass::text, conname, pg_get_constraintdef(oid)
+           FROM pg_constraint
+           WHERE contype = 'f' AND conrelid::regclass::text = ANY(%s)""",
+        (list(tables),)
+    )
+    return cur.fetchall()
+
+def seed(conn, citizens, lawyers, counts, random_seed=42):
+    """
+    Load one synthetic dataset in a single transaction and return per-table
+    (table, rows, seconds). Foreign keys are dropped for the load and added
+    back afterwards, which validates them in one pass instead of firing a
+    trigger per row; the tables are locked until the commit.
+    """
+    plan = make_plan(conn, citizens, lawyers, counts, random_seed)
+    stats = []
+
+    with conn.cursor() as cur:
+        constraints = foreign_keys(cur, TABLES)
+        for table, name, _ in constraints:
+            cur.execute(f'ALTER TABLE {table} DROP CONSTRAINT "{name}"')
+
+        for table in TABLES:
+            stats.append(copy_rows(cur, table, table_rows(table, plan)))
+
+        began = time.perf_counter()
+        for table, name, definition in constraints:
+            cur.execute(f'ALTER TABLE {table} ADD CONSTRAINT "{name}" {definition}')
+        stats.append(("foreign keys", None, time.perf_counter() - began))
+
+        # Explicit ids bypass the sequences, so move them past the new rows
+        for table in TABLES:
+            cur.execute(
+                f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), (SELECT MAX(id) FROM {table}))"
+            )
+    conn.commit()
+
+    # Fresh statistics so benchmarks see realistic plans straight away
+    conn.autocommit = True
+    with conn.cursor() as cur:
+        for table in TABLES:
+            cur.execute(f"ANALYZE {table}")
+    return stats
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--citizens", type=int, default=20000)
+    parser.add_argument("--lawyers", type=int, default=2000)
+    parser.add_argument("--cases", type=int, default=50000)
+    parser.add_argument("--consultations", type=int, default=100000)
+    parser.add_argument("--messages", type=int, default=200000)
+    parser.add_argument("--chats", type=int, default=100000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--init-schema", action="store_true", help="create tables first")
+    args = parser.parse_args()
+
+    if args.citizens < 1 or args.lawyers < 1:
+        parser.error("--citizens and --lawyers must be at least 1")
+
+    if args.init_schema:
+        init_database()
+
+    conn = get_pg_connection()
+    if conn is None:
+        raise SystemExit("Unable to connect to database; set DATABASE_URL")
+
+    try:
+        began = time.perf_counter()
+        counts = {
+            'cases': args.cases, 'consultations': args.consultations,
+            'direct_messages': args.messages, 'chat_messages': args.chats
+        }
+        stats = seed(conn, args.citizens, args.lawyers, counts, args.seed)
+        total = time.perf_counter() - began
+    finally:
+        conn.close()
+
+    for table, count, elapsed in stats:
+        if count is None:
+            print(f"  {table:<16} {'validated':>14}  {elapsed:7.2f} s")
+        else:
+            print(f"  {table:<16} {count:>9} rows  {elapsed:7.2f} s  {count / max(elapsed, 1e-9):>10.0f} rows/s")
+    rows = sum(count or 0 for _, count, _ in stats)
+    print(f"seeded {rows} rows in {total:.1f} s ({rows / total:.0f} rows/s, seed={args.seed}); "
+          f"password for seed_<id> users: {SEED_PASSWORD}")
+
+if __name__ == "__main__":
+    main()
@@ -1,29 +1,49 @@
 import streamlit as st
 from config.settings import configure_page
-from database.db_manager import init_database, init_sample_data
+from config.styles import apply_custom_styles
+from database.db_manager import init_database, init_sample_data, start_metrics_endpoint
+from services.document_service import start_download_endpoint
 from utils.session_manager import init_session_state
 from components.sidebar import render_sidebar
 from router import route_to_page
 from components.footer import render_footer
+from components.profiler_panel import render_profiler_panel
+from utils.profiler import phase, start_rerun, finish_rerun
 
 def main():
     """Main application entry point"""
     # Configure page
     configure_page()
+    start_rerun()
 
-    # Initialize database and session
-    init_database()
-    init_session_state()
-    init_sample_data()
+    page = None
+    try:
+        # Initialize database and session
+        with phase("bootstrap"):
+            init_database()
+            init_session_state()
+            init_sample_data()
+            start_metrics_endpoint()
+            start_download_endpoint()
+            apply_custom_styles()
 
-    # Render sidebar navigation
-    render_sidebar()
+        # Render sidebar navigation
+        with phase("sidebar"):
+            render_sidebar()
 
-    # Route to appropriate page
-    route_to_page()
+        # Route to appropriate page
+        page = st.session_state.current_page
+        with phase(f"route: {page}"):
+            route_to_page()
 
-    # Render footer
-    render_footer()
+        # Render footer
+        with phase("footer"):
+            render_footer()
+    finally:
+        # Also on st.rerun(), st.stop() and errors, so no trace outlives its rerun
+        profile = finish_rerun(page)
+
+    render_profiler_panel(profile)
 
 if __name__ == "__main__":
     main()
@@ -1,4 +1,8 @@
 import streamlit as st
+from database.db_manager import query_metrics
+from database.prepared import prepared_stats
+from utils.auth_manager import get_rate_limit_metrics
+from utils.profiler import is_enabled, set_enabled
 
 def show_admin_pages(page_name):
     """Show admin pages based on page name"""
@@ -14,6 +18,8 @@ def show_admin_pages(page_name):
         show_admin_analytics()
     elif page_name == "AdminSettings":
         show_admin_settings()
+    elif page_name == "AdminDiagnostics":
+        show_admin_diagnostics()
     else:
         st.error(f"Admin page not found: {page_name}")
 
@@ -57,3 +63,108 @@ def show_admin_settings():
     """Display admin settings"""
     st.title("⚙️ Settings")
     st.info("⚙️ System settings and configuration coming soon!")
+
+def show_admin_diagnostics():
+    """Display query timings, the slow-query log and login throttling counters"""
+    st.title("🩺 Diagnostics")
+    st.caption(f"Collected by this app process since {query_metrics.started_at:%Y-%m-%d %H:%M:%S}")
+
+    st.toggle(
+        "⏱️ Profile my reruns",
+        value=is_enabled(),
+        key="profiling_toggle",
+        on_change=lambda: set_enabled(st.session_state.profiling_toggle),
+        help="Adds a timing waterfall under every page you open in this session."
+    )
+
+    stats = query_metrics.snapshot()
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Queries", sum(row['calls'] for row in stats))
+    with col2:
+        st.metric("Errors", sum(row['errors'] for row in stats))
+    with col3:
+        st.metric("Distinct Statements", len(stats))
+    with col4:
+        st.metric("DB Time", f"{sum(row['total_ms'] for row in stats) / 1000:.1f} s")
+
+    tab1, tab2, tab3, tab4 = st.tabs(["⏱️ Queries", "🐢 Slow Queries", "🔐 Login Throttling", "♻️ Prepared Statements"])
+
+    with tab1:
+        if stats:
+            st.dataframe(
+                [{
+                    "Statement": row['query'],
+                    "Called From": row['callers'],
+                    "Calls": row['calls'],
+                    "Errors": row['errors'],
+                    "Rows": row['rows'],
+                    "Total (ms)": round(row['total_ms'], 1),
+                    "p50 (ms)": round(row['p50_ms'], 2),
+                    "p95 (ms)": round(row['p95_ms'], 2),
+                    "p99 (ms)": round(row['p99_ms'], 2),
+                    "Connect (ms)": round(row['connect_mean_ms'], 2),
+                    "Execute (ms)": round(row['execute_mean_ms'], 2),
+                    "Fetch (ms)": round(row['fetch_mean_ms'], 2),
+                } for row in stats],
+                use_container_width=True,
+                hide_index=True
+            )
+        else:
+            st.info("No queries recorded yet.")
+
+    with tab2:
+        slow = query_metrics.slow_queries()
+        st.caption(f"Calls over {query_metrics.slow_query_seconds * 1000:.0f} ms or failing, newest first. "
+                   f"{query_metrics.explain_sample_rate:.0%} of slow reads include their plan.")
+        if not slow:
+            st.success("✅ No slow or failing queries recorded.")
+        for entry in slow:
+            label = entry['error'] or f"{entry['total_ms']:.0f} ms"
+            with st.expander(f"{entry['at']:%H:%M:%S} · {label} · {entry['caller']}"):
+                st.code(entry['query'], language="sql")
+                st.write(f"**Connect:** {entry['connect_ms']:.1f} ms · **Execute:** {entry['execute_ms']:.1f} ms"
+                         f" · **Fetch:** {entry['fetch_ms']:.1f} ms · **Rows:** {entry['rows']}")
+                if entry['plan']:
+                    st.code(entry['plan'], language="text")
+
+    with tab3:
+        for scope, counters in get_rate_limit_metrics().items():
+            st.write(f"**{scope.replace('_', ' ').title()}:** " + " · ".join(f"{name} {value}" for name, value in counters.items()))
+
+    with tab4:
+        prepared = prepared_stats.snapshot()
+        st.caption(f"Planning time from EXPLAIN (SUMMARY), saved on executions after the first "
+                   f"{prepared_stats.custom_plan_executions} on each connection.")
+        if prepared:
+            st.metric("Planning Time Saved", f"{sum(row['saved_ms'] for row in prepared):.0f} ms")
+            st.dataframe(
+                [{
+                    "Statement": row['query'],
+                    "Executions": row['executions'],
+                    "Prepares": row['prepares'],
+                    "Re-prepares": row['reprepares'],
+                    "Fallbacks": row['fallbacks'],
+                    "Planning (ms)": None if row['planning_ms'] is None else round(row['planning_ms'], 3),
+                    "Saved (ms)": round(row['saved_ms'], 1),
+                } for row in prepared],
+                use_container_width=True,
+                hide_index=True
+            )
+        else:
+            st.info("No prepared statements executed yet.")
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.download_button(
+            "📥 Prometheus Metrics",
+            data=query_metrics.prometheus(),
+            file_name="metrics.txt",
+            mime="text/plain",
+            use_container_width=True
+        )
+    with col2:
+        if st.button("🔄 Reset Counters", use_container_width=True):
+            query_metrics.reset()
+            prepared_stats.reset()
+            st.rerun()
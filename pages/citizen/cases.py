@@ -1,7 +1,11 @@
+import html
 import streamlit as st
 from services.case_service import create_case, get_user_cases
 from config.settings import LEGAL_CATEGORIES, CASE_PRIORITIES
 from config.styles import apply_custom_styles, STATUS_COLORS
+from components.documents import render_case_documents
+from components.virtual_list import render_virtual_list
+from utils.css import class_slug
 
 def show_case_tracking():
     """Display case tracking and management page"""
@@ -49,50 +53,46 @@ def render_existing_cases():
 
         st.subheader("My Cases")
 
-        for case in cases:
-            render_case_card(case)
+        render_virtual_list(
+            "citizen_cases", cases, row_id=lambda case: case.id, row_html=case_card_html,
+            row_label=lambda case: case.title, render_actions=render_case_actions
+        )
 
     except Exception as e:
         st.error(f"Error loading cases: {e}")
 
-def render_case_card(case):
-    """Render individual case card"""
-    # Handle the case as a tuple/list - access by index to avoid unpacking errors
-    case_id = case[0]
-    user_id = case[1]
-    lawyer_id = case[2] if len(case) > 2 else None
-    title = case[3] if len(case) > 3 else "No Title"
-    description = case[4] if len(case) > 4 else "No Description"
-    category = case[5] if len(case) > 5 else "Unknown"
-    status = case[6] if len(case) > 6 else "Pending"
-    priority = case[7] if len(case) > 7 else "Low"
-    created_at = case[8] if len(case) > 8 else "Unknown"
-    updated_at = case[9] if len(case) > 9 else None
-    lawyer_name = case[10] if len(case) > 10 else None
+def case_card_html(case):
+    """Individual case card"""
+    status_class = f"status-{class_slug(case.status)}" if case.status else "status-pending"
 
-    status_class = f"status-{status.lower().replace(' ', '-')}" if status else "status-pending"
-
-    st.markdown(f"""
+    return f"""
     <div class="feature-card">
-        <h4>{title} <span class="case-status {status_class}">{status or 'Pending'}</span></h4>
-        <p><strong>Category:</strong> {category} | <strong>Priority:</strong> {priority}</p>
-        <p><strong>Description:</strong> {description}</p>
-        <p><strong>Lawyer:</strong> {lawyer_name or 'Not assigned'}</p>
-        <p><strong>Created:</strong> {created_at}</p>
+        <h4>{html.escape(str(case.title))} <span class="case-status {status_class}">{html.escape(case.status or 'Pending')}</span></h4>
+        <p><strong>Category:</strong> {html.escape(str(case.category))} | <strong>Priority:</strong> {html.escape(str(case.priority))}</p>
+        <p><strong>Description:</strong> {html.escape(str(case.description))}</p>
+        <p><strong>Lawyer:</strong> {html.escape(case.lawyer_name or 'Not assigned')}</p>
+        <p><strong>Created:</strong> {case.created_at}</p>
     </div>
-    """, unsafe_allow_html=True)
+    """
+
+def render_case_actions(case):
+    """Action buttons for the selected case"""
+    case_id = case.id
 
-    # Action buttons
     col1, col2, col3 = st.columns(3)
     with col1:
         if st.button(f"Update Status", key=f"update_{case_id}"):
             st.info("Status update feature - to be implemented")
     with col2:
         if st.button(f"Upload Documents", key=f"docs_{case_id}"):
-            st.info("Document upload feature - to be implemented")
+            st.session_state[f"show_docs_{case_id}"] = not st.session_state.get(f"show_docs_{case_id}", False)
     with col3:
-        if lawyer_id and st.button(f"Contact Lawyer", key=f"contact_lawyer_{case_id}"):
-            st.session_state.chat_with = lawyer_id
-            st.session_state.chat_with_name = lawyer_name
+        if case.lawyer_id and st.button(f"Contact Lawyer", key=f"contact_lawyer_{case_id}"):
+            st.session_state.chat_with = case.lawyer_id
+            st.session_state.chat_with_name = case.lawyer_name
             st.session_state.current_page = "Messages"
             st.rerun()
+
+    if st.session_state.get(f"show_docs_{case_id}"):
+        with st.container(border=True):
+            render_case_documents(case_id)
@@ -1,6 +1,12 @@
 import streamlit as st
 from services.consultation_service import get_user_consultations
-from config.styles import apply_custom_styles, STATUS_COLORS
+from services.appointment_service import get_user_appointments
+from config.styles import apply_custom_styles
+from components.ui_components import render_status_badge
+
+# Appointment fields the request cards show
+APPOINTMENT_REQUEST_FIELDS = ("appointment_date", "appointment_time", "appointment_type", "duration",
+                              "status", "lawyer_name")
 
 def show_consultations_page():
     """Display user consultations page"""
@@ -22,22 +28,34 @@ def show_consultations_page():
             st.info("No consultations booked yet.")
             render_booking_help()
 
+        render_appointment_requests()
+
     except Exception as e:
         st.error(f"Error loading consultations: {e}")
 
-def render_consultation_card(consultation):
-    """Render individual consultation card"""
-    consultation_id, date, status, notes, fee, lawyer_name, lawyer_phone = consultation
+def render_appointment_requests():
+    """Render appointment requests sent to lawyers"""
+    appointments = get_user_appointments(st.session_state.user_id, st.session_state.user_type or 'Citizen',
+                                         fields=APPOINTMENT_REQUEST_FIELDS)
 
-    # Determine status color
-    status_color = STATUS_COLORS.get(status, '#6c757d')
+    if appointments:
+        st.subheader("Appointment Requests")
+        for appointment in appointments:
+            st.markdown(f"""
+            <div class="record-card dark">
+                <h4>{appointment.appointment_type} with {appointment.lawyer_name} {render_status_badge(appointment.status.title())}</h4>
+                <p><strong>Date:</strong> {appointment.appointment_date} {appointment.appointment_time.strftime('%H:%M')} | <strong>Duration:</strong> {appointment.duration} min</p>
+            </div>
+            """, unsafe_allow_html=True)
 
+def render_consultation_card(consultation):
+    """Render individual consultation card"""
     st.markdown(f"""
-    <div style="border: 1px solid #ddd; padding: 15px; margin: 10px 0; border-radius: 10px; background-color: #212529;">
-        <h4>Consultation with {lawyer_name} <span style="background-color: {status_color}; color: white; padding: 3px 8px; border-radius: 15px; font-size: 12px;">{status}</span></h4>
-        <p><strong>Date:</strong> {date} | <strong>Fee:</strong> ₹{fee or 'TBD'}</p>
-        <p><strong>Notes:</strong> {notes or 'No notes'}</p>
-        <p><strong>Lawyer Contact:</strong> {lawyer_phone}</p>
+    <div class="record-card dark">
+        <h4>Consultation with {consultation.lawyer_name} {render_status_badge(consultation.status)}</h4>
+        <p><strong>Date:</strong> {consultation.consultation_date} | <strong>Fee:</strong> ₹{consultation.fee_amount or 'TBD'}</p>
+        <p><strong>Notes:</strong> {consultation.notes or 'No notes'}</p>
+        <p><strong>Lawyer Contact:</strong> {consultation.lawyer_phone}</p>
     </div>
     """, unsafe_allow_html=True)
 
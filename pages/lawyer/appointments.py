@@ -1,20 +1,33 @@
 # ==========================================
 
 # pages/lawyer/appointments.py
+import html
 import streamlit as st
 from datetime import datetime, timedelta, date, time
 from services.consultation_service import (
-    get_lawyer_consultations, update_consultation_status,
-    schedule_consultation, get_lawyer_clients
+    get_upcoming_consultations, get_past_consultations, get_todays_consultations,
+    update_consultation_status, schedule_consultation, get_lawyer_clients, get_lawyer_id
 )
+from services.scheduling_service import get_free_slots_on, parse_duration_minutes
+from services.calendar_service import (
+    CALENDAR_FILENAME, calendar_feed_url, import_busy_blocks, iter_calendar_feed, next_sync_token
+)
+from services.appointment_service import (
+    get_lawyer_appointments_page, update_appointment_status,
+    accept_appointment_request, APPOINTMENT_STATUSES
+)
+from utils.session_manager import get_current_lawyer_id
+from config.settings import SCHEDULING_SETTINGS
 from config.styles import apply_custom_styles, STATUS_COLORS
 
+UPCOMING_PAGE_SIZE = 25
+
 def show_lawyer_appointments():
     """Display lawyer appointments page"""
     apply_custom_styles()
     st.title("📅 Appointments & Consultations")
 
-    tab1, tab2, tab3 = st.tabs(["Upcoming", "Past", "Schedule New"])
+    tab1, tab2, tab3, tab4, tab5 = st.tabs(["Upcoming", "Past", "Requests", "Schedule New", "Calendar Sync"])
 
     with tab1:
         render_upcoming_appointments()
@@ -23,23 +36,34 @@ def show_lawyer_appointments():
         render_past_appointments()
 
     with tab3:
+        render_appointment_requests()
+
+    with tab4:
         render_schedule_form()
 
+    with tab5:
+        render_calendar_sync()
+
 def render_upcoming_appointments():
     """Render upcoming appointments"""
     st.subheader("📅 Upcoming Appointments")
     try:
-        upcoming = get_lawyer_consultations(st.session_state.user_id, upcoming_only=True)
+        todays = get_todays_consultations(st.session_state.user_id)
+        if todays:
+            agenda = ", ".join(f"{apt[1].strftime('%H:%M')} {apt[5]}" for apt in todays)
+            st.caption(f"Today ({len(todays)}): {agenda}")
+
+        upcoming = get_upcoming_consultations(st.session_state.user_id, limit=UPCOMING_PAGE_SIZE)
 
         if upcoming:
             for appointment in upcoming:
                 consultation_id, date, status, notes, fee, client_name, phone, email = appointment
                 st.markdown(f"""
-                <div style="border: 1px solid #007bff; padding: 15px; margin: 10px 0; border-radius: 10px;">
+                <div class="record-card appointment">
                     <h4>📅 {date}</h4>
-                    <p><strong>Client:</strong> {client_name} | <strong>Status:</strong> {status}</p>
-                    <p><strong>Contact:</strong> {phone} | {email}</p>
-                    <p><strong>Fee:</strong> ₹{fee or 'TBD'} | <strong>Notes:</strong> {notes or 'None'}</p>
+                    <p><strong>Client:</strong> {html.escape(str(client_name))} | <strong>Status:</strong> {html.escape(str(status))}</p>
+                    <p><strong>Contact:</strong> {html.escape(str(phone))} | {html.escape(str(email))}</p>
+                    <p><strong>Fee:</strong> ₹{fee or 'TBD'} | <strong>Notes:</strong> {html.escape(notes or 'None')}</p>
                 </div>
                 """, unsafe_allow_html=True)
 
@@ -66,13 +90,10 @@ def render_past_appointments():
     """Render past appointments"""
     st.subheader("📋 Past Appointments")
     try:
-        past = get_lawyer_consultations(st.session_state.user_id, upcoming_only=False)
-
-        # Filter only past appointments
-        past_appointments = [apt for apt in past if apt[1] < datetime.now()]
+        past_appointments = get_past_consultations(st.session_state.user_id, limit=10)
 
         if past_appointments:
-            for appointment in past_appointments[:10]:  # Show last 10
+            for appointment in past_appointments:  # Show last 10
                 date, status, client_name, fee = appointment[1], appointment[2], appointment[5], appointment[4]
                 st.markdown(f"**{date}** - {client_name} | {status} | ₹{fee or 'Free'}")
         else:
@@ -80,19 +101,112 @@ def render_past_appointments():
     except Exception as e:
         st.error(f"Error loading past appointments: {e}")
 
+def render_appointment_requests():
+    """Render appointment requests for a calendar range, one page at a time"""
+    st.subheader("📨 Appointment Requests")
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        start_date = st.date_input("From", value=date.today(), key="requests_from")
+    with col2:
+        end_date = st.date_input("To", value=date.today() + timedelta(days=30), key="requests_to")
+    with col3:
+        status_filter = st.selectbox("Status", ["All"] + APPOINTMENT_STATUSES, index=1, key="requests_status")
+
+    # Keyset cursors of the pages visited so far; reset whenever the filters change
+    filters = (start_date, end_date, status_filter)
+    if st.session_state.get('requests_filters') != filters:
+        st.session_state.requests_filters = filters
+        st.session_state.requests_cursors = [None]
+
+    cursors = st.session_state.requests_cursors
+    try:
+        appointments, next_cursor = get_lawyer_appointments_page(
+            st.session_state.user_id, start_date, end_date,
+            after=cursors[-1], status_filter=status_filter
+        )
+
+        if not appointments:
+            st.info("No appointment requests in this range")
+
+        for appointment in appointments:
+            (appointment_id, client_id, lawyer_id, appointment_date, appointment_time,
+             appointment_type, meeting_method, duration, notes, response_notes,
+             status, created_at, client_name, client_email) = appointment
+
+            st.markdown(f"""
+            <div class="record-card appointment">
+                <h4>📅 {appointment_date} {appointment_time.strftime('%H:%M')} ({duration} min)</h4>
+                <p><strong>Client:</strong> {html.escape(str(client_name))} | <strong>Status:</strong> {html.escape(status.title())}</p>
+                <p><strong>Type:</strong> {html.escape(str(appointment_type))} | <strong>Method:</strong> {html.escape(str(meeting_method))}</p>
+                <p><strong>Contact:</strong> {html.escape(str(client_email))} | <strong>Notes:</strong> {html.escape(notes or 'None')}</p>
+            </div>
+            """, unsafe_allow_html=True)
+
+            if status == 'pending':
+                col1, col2 = st.columns(2)
+                with col1:
+                    if st.button("Accept", key=f"accept_appointment_{appointment_id}"):
+                        success, message = accept_appointment_request(appointment_id)
+                        if success:
+                            st.success(message)
+                            st.rerun()
+                        else:
+                            st.error(message)
+                with col2:
+                    if st.button("Decline", key=f"decline_appointment_{appointment_id}"):
+                        update_appointment_status(appointment_id, 'declined')
+                        st.warning("Appointment request declined")
+                        st.rerun()
+
+        col1, col2 = st.columns(2)
+        with col1:
+            if len(cursors) > 1 and st.button("← Previous", key="requests_prev"):
+                cursors.pop()
+                st.rerun()
+        with col2:
+            if next_cursor and st.button("Next →", key="requests_next"):
+                cursors.append(next_cursor)
+                st.rerun()
+    except Exception as e:
+        st.error(f"Error loading appointment requests: {e}")
+
 def render_schedule_form():
     """Render consultation scheduling form with proper date/time input"""
     st.subheader("➕ Schedule New Consultation")
 
-    # First, validate that lawyer profile exists
-    from services.consultation_service import validate_lawyer_exists
-    if not validate_lawyer_exists(st.session_state.user_id):
+    # The session identity carries the lawyer id; profiles created after login need a lookup
+    lawyer_id = get_current_lawyer_id() or get_lawyer_id(st.session_state.user_id)
+    if not lawyer_id:
         st.error("❌ Lawyer profile not found. Please complete your profile first.")
         if st.button("Go to Profile"):
             st.session_state.current_page = "Lawyer Profile"
             st.rerun()
         return
 
+    # Date and duration live outside the form so the free slots refresh on change
+    col1, col2 = st.columns(2)
+
+    with col1:
+        consultation_date = st.date_input(
+            "Consultation Date",
+            min_value=date.today() + timedelta(days=1),
+            # Free slots are only worked out this far ahead
+            max_value=date.today() + timedelta(days=SCHEDULING_SETTINGS["horizon_days"]),
+            value=date.today() + timedelta(days=1),
+            key="schedule_consultation_date"
+        )
+
+    with col2:
+        duration = st.selectbox(
+            "Duration",
+            ["30 minutes", "1 hour", "1.5 hours", "2 hours"],
+            key="schedule_consultation_duration"
+        )
+
+    duration_minutes = parse_duration_minutes(duration)
+    free_slots = get_free_slots_on(lawyer_id, consultation_date, duration_minutes)
+
     with st.form("schedule_consultation"):
         # Get list of clients
         try:
@@ -102,36 +216,16 @@ def render_schedule_form():
                 client_options = {f"{client[1]} (ID: {client[0]})": client[0] for client in clients}
                 selected_client = st.selectbox("Select Client", list(client_options.keys()))
 
-                # FIXED: Replace st.datetime_input with separate date and time inputs
-                col1, col2 = st.columns(2)
+                if not free_slots:
+                    st.warning("No free slots on this date. Please pick another day.")
 
-                with col1:
-                    consultation_date = st.date_input(
-                        "Consultation Date",
-                        min_value=date.today() + timedelta(days=1),
-                        value=date.today() + timedelta(days=1)
-                    )
-
-                with col2:
-                    # Time slots for better UX
-                    time_slots = [
-                        "09:00", "09:30", "10:00", "10:30", "11:00", "11:30",
-                        "12:00", "12:30", "14:00", "14:30", "15:00", "15:30",
-                        "16:00", "16:30", "17:00", "17:30", "18:00"
-                    ]
-
-                    selected_time_str = st.selectbox(
-                        "Consultation Time",
-                        time_slots,
-                        index=0
-                    )
-
-                    # Convert to time object
-                    hour, minute = map(int, selected_time_str.split(':'))
-                    consultation_time = time(hour, minute)
-
-                # Combine date and time into datetime
-                consultation_datetime = datetime.combine(consultation_date, consultation_time)
+                # Only offer slots that do not overlap existing bookings
+                slot_options = {slot.strftime("%H:%M"): slot for slot in free_slots}
+                selected_time_str = st.selectbox(
+                    "Consultation Time",
+                    list(slot_options.keys()),
+                    index=0 if slot_options else None
+                )
 
                 fee_amount = st.number_input("Fee Amount (₹)", min_value=0, value=500)
                 notes = st.text_area("Notes", placeholder="Additional notes for the consultation...")
@@ -139,10 +233,15 @@ def render_schedule_form():
                 submitted = st.form_submit_button("📅 Schedule Consultation", type="primary")
 
                 if submitted:
+                    if not selected_time_str:
+                        st.error("Please select an available time slot.")
+                        return
+
                     client_id = client_options[selected_client]
                     success, message = schedule_consultation(
                         client_id, st.session_state.user_id,
-                        consultation_datetime, fee_amount, notes
+                        slot_options[selected_time_str], fee_amount, notes,
+                        duration_minutes
                     )
                     if success:
                         st.success(message)
@@ -155,6 +254,52 @@ def render_schedule_form():
         except Exception as e:
             st.error(f"Error in schedule form: {e}")
 
+def render_calendar_sync():
+    """Render iCalendar export and busy-block import"""
+    st.subheader("🔄 Calendar Sync")
+    st.write("Export your consultations to Google Calendar, Outlook or Apple Calendar, "
+             "and import your busy times so clients cannot book over them.")
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.markdown("**📤 Export**")
+        sync_token = st.session_state.get('calendar_sync_token')
+        changes_only = st.checkbox("Only changes since my last export", value=bool(sync_token),
+                                   disabled=not sync_token, key="calendar_changes_only")
+
+        if st.button("Prepare calendar file", key="prepare_ics"):
+            since = sync_token if changes_only else None
+            next_token = next_sync_token()
+            feed_url = calendar_feed_url(st.session_state.user_id, since)
+            if feed_url:
+                # The download server streams the file when the link is opened
+                st.session_state.calendar_feed_url = feed_url
+            else:
+                # Built for this run only; "ignore" keeps the button (and its file) until the next rerun
+                st.download_button(
+                    "⬇️ Download .ics",
+                    "".join(iter_calendar_feed(st.session_state.user_id, since)),
+                    file_name=CALENDAR_FILENAME,
+                    mime="text/calendar",
+                    on_click="ignore",
+                    key="download_ics"
+                )
+            st.session_state.calendar_sync_token = next_token
+
+        if st.session_state.get('calendar_feed_url'):
+            st.link_button("⬇️ Download .ics", st.session_state.calendar_feed_url)
+
+    with col2:
+        st.markdown("**📥 Import busy times**")
+        uploaded = st.file_uploader("Calendar file (.ics)", type=["ics"], key="import_ics")
+        if uploaded and st.button("Import", key="import_ics_button"):
+            success, message = import_busy_blocks(st.session_state.user_id, uploaded)
+            if success:
+                st.success(message)
+            else:
+                st.error(message)
+
 def render_alternative_schedule_form():
     """Alternative scheduling form with manual time input"""
     st.subheader("➕ Schedule New Consultation (Alternative)")
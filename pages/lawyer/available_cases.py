@@ -1,6 +1,7 @@
 import streamlit as st
 from services.case_service import get_available_cases, assign_case_to_lawyer
-from config.styles import apply_custom_styles, PRIORITY_COLORS
+from config.styles import apply_custom_styles
+from components.ui_components import render_priority_badge
 from database.db_manager import execute_query
 
 def show_available_cases():
@@ -31,12 +32,9 @@ def render_available_case_card(case):
     """Render individual available case card"""
     case_id, title, description, category, priority, created_at, client_name, location = case
 
-    # Priority colors
-    priority_color = PRIORITY_COLORS.get(priority, '#6c757d')
-
     st.markdown(f"""
-    <div style="border: 1px solid #ddd; padding: 15px; margin: 10px 0; border-radius: 10px; background-color: #f8f9fa;">
-        <h4>{title} <span style="background-color: {priority_color}; color: white; padding: 3px 8px; border-radius: 15px; font-size: 12px;">{priority}</span></h4>
+    <div class="record-card light">
+        <h4>{title} {render_priority_badge(priority)}</h4>
         <p><strong>Client:</strong> {client_name} | <strong>Category:</strong> {category} | <strong>Location:</strong> {location}</p>
         <p><strong>Description:</strong> {description}</p>
         <p><small><strong>Created:</strong> {created_at}</small></p>
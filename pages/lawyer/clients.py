@@ -27,7 +27,7 @@ def render_client_card(client):
     user_id, username, email, phone, location, total_cases, active_cases = client
 
     st.markdown(f"""
-    <div style="border: 1px solid #ddd; padding: 15px; margin: 10px 0; border-radius: 10px;">
+    <div class="record-card">
         <h4>👤 {username}</h4>
         <p><strong>📧 Email:</strong> {email} | <strong>📱 Phone:</strong> {phone}</p>
         <p><strong>📍 Location:</strong> {location}</p>
@@ -1,9 +1,10 @@
 
 import streamlit as st
-from services.case_service import get_case_statistics
-from services.consultation_service import get_consultation_statistics, get_lawyer_consultations
-from database.db_manager import execute_query
+from services.case_service import get_case_statistics, get_recent_case_updates
+from services.consultation_service import get_consultation_statistics, get_upcoming_consultations, get_lawyer_id
 from config.styles import apply_custom_styles
+from utils.page_data import fetch_all
+from utils.session_manager import get_current_lawyer_id
 
 def show_lawyer_dashboard():
     """Display lawyer dashboard"""
@@ -13,17 +14,30 @@ def show_lawyer_dashboard():
     # Welcome message
     st.markdown(f"### Welcome back, Advocate {st.session_state.get('username', 'User')}!")
 
-    render_quick_stats()
-    render_recent_activities()
-
-def render_quick_stats():
+    data = load_dashboard_data(st.session_state.user_id)
+    render_quick_stats(data['case_stats'], data['consultation_stats'])
+    render_recent_activities(data['recent_cases'], data['upcoming_appointments'])
+
+def load_dashboard_data(user_id):
+    """Fetch everything the dashboard shows at once instead of query after query"""
+    # consultations.lawyer_id holds lawyers.id, not the user id. Looked up
+    # here: get_lawyer_id may create a profile and tell the user, which a
+    # loader thread can't do
+    lawyer_id = get_current_lawyer_id() or get_lawyer_id(user_id)
+    return fetch_all(
+        {
+            'case_stats': lambda: get_case_statistics(user_id, "Lawyer"),
+            'consultation_stats': lambda: get_consultation_statistics(lawyer_id),
+            'recent_cases': lambda: get_recent_case_updates(user_id, limit=5),
+            'upcoming_appointments': lambda: get_upcoming_consultations(user_id, limit=5),
+        },
+        defaults={'case_stats': {}, 'consultation_stats': {}, 'recent_cases': [], 'upcoming_appointments': []}
+    )
+
+def render_quick_stats(case_stats, consultation_stats):
     """Render quick statistics for lawyers"""
     col1, col2, col3, col4 = st.columns(4)
 
-    # Get statistics
-    case_stats = get_case_statistics(st.session_state.user_id, "Lawyer")
-    consultation_stats = get_consultation_statistics(st.session_state.user_id)
-
     with col1:
         st.metric("Active Cases", case_stats.get('active_cases', 0))
 
@@ -36,37 +50,28 @@ def render_quick_stats():
     with col4:
         st.metric("Available Cases", case_stats.get('available_cases', 0))
 
-def render_recent_activities():
+def render_recent_activities(recent_cases, upcoming_appointments):
     """Render recent activities section"""
     st.markdown("---")
 
     col1, col2 = st.columns(2)
 
     with col1:
-        render_recent_cases()
+        render_recent_cases(recent_cases)
 
     with col2:
-        render_upcoming_appointments()
+        render_upcoming_appointments(upcoming_appointments)
 
-def render_recent_cases():
+def render_recent_cases(recent_cases):
     """Render recent case updates"""
     st.subheader("🔄 Recent Case Updates")
 
     try:
-        recent_cases = execute_query("""
-            SELECT c.title, c.status, c.updated_at, u.username as client_name
-            FROM cases c
-            JOIN users u ON c.user_id = u.id
-            WHERE c.lawyer_id = %s
-            ORDER BY c.updated_at DESC LIMIT 5
-        """, (st.session_state.user_id,), fetch='all')
-
         if recent_cases:
             for case in recent_cases:
                 title, status, updated_at, client_name = case
                 st.markdown(f"""
-                <div style="border: 1px solid #ddd; padding: 10px; margin: 5px 0;
-                            border-radius: 5px; background-color: rgb(14, 17, 23); color: white;">
+                <div class="compact-card">
                     <strong>{title}</strong><br>
                     Client: {client_name} | Status: {status}<br>
                     <small>Updated: {updated_at}</small>
@@ -77,19 +82,16 @@ def render_recent_cases():
     except Exception as e:
         st.error(f"Error loading recent cases: {e}")
 
-def render_upcoming_appointments():
+def render_upcoming_appointments(upcoming_appointments):
     """Render upcoming appointments"""
     st.subheader("📅 Upcoming Appointments")
 
     try:
-        upcoming_appointments = get_lawyer_consultations(st.session_state.user_id, upcoming_only=True)
-
         if upcoming_appointments:
-            for appointment in upcoming_appointments[:5]:  # Show only first 5
+            for appointment in upcoming_appointments:
                 consultation_id, date, status, notes, fee, client_name, phone, email = appointment
                 st.markdown(f"""
-                <div style="border: 1px solid #ddd; padding: 10px; margin: 5px 0;
-                            border-radius: 5px; background-color: rgb(14, 17, 23); color: white;">
+                <div class="compact-card">
                     <strong>{client_name}</strong><br>
                     Date: {date}<br>
                     <small>{notes or 'No notes'}</small>
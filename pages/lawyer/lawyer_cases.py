@@ -2,10 +2,14 @@
 # FILE: pages/lawyer/lawyer_cases.py
 # ===========================================
 
+import html
 import streamlit as st
 from services.case_service import get_lawyer_cases, update_case_status
 from config.settings import CASE_STATUSES, LEGAL_CATEGORIES, CASE_PRIORITIES
-from config.styles import apply_custom_styles, STATUS_COLORS
+from config.styles import apply_custom_styles
+from components.ui_components import render_status_badge
+from components.documents import render_case_documents, render_document_search
+from components.virtual_list import render_virtual_list
 
 def show_lawyer_cases():
     """Display lawyer's cases management page"""
@@ -21,6 +25,8 @@ def show_lawyer_cases():
     with col3:
         priority_filter = st.selectbox("Filter by Priority", ["All"] + CASE_PRIORITIES)
 
+    render_document_search(st.session_state.user_id)
+
     try:
         cases = get_lawyer_cases(
             st.session_state.user_id,
@@ -33,34 +39,34 @@ def show_lawyer_cases():
             st.info("No cases found matching your criteria.")
             return
 
-        # Display cases
-        for case in cases:
-            render_lawyer_case_card(case)
+        render_virtual_list(
+            "lawyer_cases", cases, row_id=lambda case: case.id, row_html=lawyer_case_card_html,
+            row_label=lambda case: f"{case.title} — {case.client_name}", render_actions=render_lawyer_case_actions
+        )
 
     except Exception as e:
         st.error(f"Error loading cases: {e}")
 
-def render_lawyer_case_card(case):
-    """Render lawyer case card with management options"""
-    case_id, title, description, category, status, priority, created_at, updated_at, client_name, phone, email, client_user_id = case
-
-    status_color = STATUS_COLORS.get(status, '#6c757d')
-
-    st.markdown(f"""
-    <div style="border: 1px solid #ddd; padding: 15px; margin: 10px 0; border-radius: 10px; background-color: #212529;">
-        <h4>{title} <span style="background-color: {status_color}; color: white; padding: 3px 8px; border-radius: 15px; font-size: 12px;">{status}</span></h4>
-        <p><strong>Client:</strong> {client_name} | <strong>Category:</strong> {category} | <strong>Priority:</strong> {priority}</p>
-        <p><strong>Description:</strong> {description}</p>
-        <p><strong>Contact:</strong> {phone} | {email}</p>
-        <p><small><strong>Created:</strong> {created_at} | <strong>Updated:</strong> {updated_at}</small></p>
+def lawyer_case_card_html(case):
+    """Lawyer case card"""
+    return f"""
+    <div class="record-card dark">
+        <h4>{html.escape(str(case.title))} {render_status_badge(case.status)}</h4>
+        <p><strong>Client:</strong> {html.escape(str(case.client_name))} | <strong>Category:</strong> {html.escape(str(case.category))} | <strong>Priority:</strong> {html.escape(str(case.priority))}</p>
+        <p><strong>Description:</strong> {html.escape(str(case.description))}</p>
+        <p><strong>Contact:</strong> {html.escape(str(case.phone))} | {html.escape(str(case.email))}</p>
+        <p><small><strong>Created:</strong> {case.created_at} | <strong>Updated:</strong> {case.updated_at}</small></p>
     </div>
-    """, unsafe_allow_html=True)
+    """
+
+def render_lawyer_case_actions(case):
+    """Management options for the selected case"""
+    case_id = case.id
 
-    # Action buttons
     col1, col2, col3, col4 = st.columns(4)
     with col1:
         # Status update dropdown
-        current_index = CASE_STATUSES.index(status) if status in CASE_STATUSES else 0
+        current_index = CASE_STATUSES.index(case.status) if case.status in CASE_STATUSES else 0
         new_status = st.selectbox("Update Status", CASE_STATUSES,
                                 index=current_index, key=f"status_select_{case_id}")
         if st.button("Update", key=f"status_update_{case_id}"):
@@ -81,11 +87,15 @@ def render_lawyer_case_card(case):
 
     with col4:
         if st.button(f"Contact Client", key=f"contact_{case_id}"):
-            st.session_state.chat_with = client_user_id
-            st.session_state.chat_with_name = client_name
+            st.session_state.chat_with = case.client_user_id
+            st.session_state.chat_with_name = case.client_name
             st.session_state.current_page = "Messages"
             st.rerun()
 
+    # A toggle rather than an expander: collapsed expanders still run their contents
+    if st.toggle("📎 Case documents", key=f"docs_toggle_{case_id}"):
+        render_case_documents(case_id, show_previews=True)
+
 # ===========================================
 # FILE: pages/lawyer/clients.py
 # ===========================================
@@ -117,7 +127,7 @@ def render_client_card(client):
     user_id, username, email, phone, location, total_cases, active_cases = client
 
     st.markdown(f"""
-    <div style="border: 1px solid #ddd; padding: 15px; margin: 10px 0; border-radius: 10px;">
+    <div class="record-card">
         <h4>👤 {username}</h4>
         <p><strong>📧 Email:</strong> {email} | <strong>📱 Phone:</strong> {phone}</p>
         <p><strong>📍 Location:</strong> {location}</p>
@@ -176,7 +186,7 @@ def render_upcoming_appointments():
         for appointment in upcoming:
             consultation_id, date, status, notes, fee, client_name, phone, email = appointment
             st.markdown(f"""
-            <div style="border: 1px solid #007bff; padding: 15px; margin: 10px 0; border-radius: 10px;">
+            <div class="record-card appointment">
                 <h4>📅 {date}</h4>
                 <p><strong>Client:</strong> {client_name} | <strong>Status:</strong> {status}</p>
                 <p><strong>Contact:</strong> {phone} | {email}</p>
@@ -307,7 +317,10 @@ def show_lawyer_profile():
     st.title("👤 Lawyer Profile Management")
 
     try:
-        profile = get_lawyer_profile(st.session_state.user_id)
+        profile = get_lawyer_profile(
+            st.session_state.user_id,
+            fields=("name", "email", "phone", "specialization", "experience", "location", "languages", "username")
+        )
 
         if profile:
             name, email, phone, specialization, experience, location, languages, username = profile
@@ -1,8 +1,15 @@
+import html
 import streamlit as st
-from services.lawyer_service import get_lawyers, get_lawyer_user_id
+from services.lawyer_service import get_lawyers
 from config.settings import LEGAL_CATEGORIES, MAJOR_CITIES
 from config.styles import apply_custom_styles
 from database.db_manager import execute_query
+from utils.profiler import phase
+from components.virtual_list import render_virtual_list
+
+# Lawyer fields the cards, actions and booking form use
+LAWYER_FIELDS = ("id", "user_id", "name", "email", "phone", "specialization", "experience",
+                 "location", "rating", "fee_range", "languages")
 
 def show_lawyer_marketplace():
     """Enhanced lawyer marketplace with better UI and debugging"""
@@ -76,74 +83,62 @@ def render_lawyers_list():
     """Enhanced lawyers list with better error handling"""
     try:
         # Get filtered lawyers
-        lawyers_df = get_lawyers(
+        lawyers = get_lawyers(
             st.session_state.get('specialization_filter'),
             st.session_state.get('location_filter'),
-            st.session_state.get('fee_filter')
+            st.session_state.get('fee_filter'),
+            fields=LAWYER_FIELDS
         )
 
-        if lawyers_df.empty:
+        if not lawyers:
             st.warning("🚫 No lawyers found matching your criteria.")
             st.info("💡 Try adjusting your filters or check back later for new lawyers.")
             return
 
-        st.success(f"✅ Found {len(lawyers_df)} lawyer(s)")
+        st.success(f"✅ Found {len(lawyers)} lawyer(s)")
 
-        # Display lawyers in a grid-like layout
-        for idx, lawyer in lawyers_df.iterrows():
-            render_enhanced_lawyer_card(lawyer)
-            st.markdown("---")
+        with phase("lawyer cards"):
+            render_virtual_list(
+                "marketplace_lawyers", lawyers, row_id=lambda lawyer: lawyer.id, row_html=lawyer_card_html,
+                row_label=lambda lawyer: f"{lawyer.name} — {lawyer.specialization}", render_actions=render_lawyer_actions
+            )
 
     except Exception as e:
         st.error(f"❌ Error loading lawyers: {e}")
         st.info("Please try refreshing the page or contact support if the issue persists.")
 
-def render_enhanced_lawyer_card(lawyer):
-    """Enhanced lawyer card with better UI"""
-
-    # Main card container
-    with st.container():
-        # Header row
-        col1, col2 = st.columns([3, 1])
-
-        with col1:
-            st.markdown(f"""
-            ### {lawyer['name']}
-            **{lawyer['specialization']}**
-            """)
-
-        with col2:
-            rating = lawyer.get('rating', 4.5)
-            st.metric("Rating", f"⭐ {rating}/5.0")
-
-        # Details row
-        st.markdown(f"""
-        **📍 Location:** {lawyer['location']} |
-        **💼 Experience:** {lawyer['experience']} years |
-        **💬 Languages:** {lawyer['languages']}
-        """)
-
-        if lawyer.get('fee_range'):
-            st.markdown(f"**💰 Fee Range:** {lawyer['fee_range']}")
-
-        # Action buttons
-        col1, col2, col3, col4 = st.columns(4)
+def lawyer_card_html(lawyer):
+    """Lawyer card for the marketplace list"""
+    fee = f"<p><strong>💰 Fee Range:</strong> {html.escape(lawyer.fee_range)}</p>" if lawyer.fee_range else ""
+    return f"""
+    <div class="lawyer-card">
+        <h3>{html.escape(str(lawyer.name))} <small>⭐ {lawyer.rating or 4.5}/5.0</small></h3>
+        <p><strong>{html.escape(str(lawyer.specialization))}</strong></p>
+        <p><strong>📍 Location:</strong> {html.escape(str(lawyer.location))} |
+           <strong>💼 Experience:</strong> {lawyer.experience} years |
+           <strong>💬 Languages:</strong> {html.escape(str(lawyer.languages))}</p>{fee}
+    </div>
+    """
+
+def render_lawyer_actions(lawyer):
+    """Actions for the selected lawyer"""
+    col1, col2, col3, col4 = st.columns(4)
 
-        with col1:
-            if st.button(f"📅 Book Consultation", key=f"book_{lawyer['id']}", type="primary"):
-                handle_consultation_booking(lawyer)
+    with col1:
+        if st.button(f"📅 Book Consultation", key=f"book_{lawyer.id}", type="primary"):
+            handle_consultation_booking(lawyer)
 
-        with col2:
-            if st.button(f"👤 View Profile", key=f"profile_{lawyer['id']}"):
-                handle_view_profile(lawyer)
+    with col2:
+        if st.button(f"👤 View Profile", key=f"profile_{lawyer.id}"):
+            handle_view_profile(lawyer)
 
-        with col3:
-            if st.button(f"💬 Start Chat", key=f"chat_{lawyer['id']}"):
-                handle_lawyer_chat(lawyer)
+    with col3:
+        if st.button(f"💬 Start Chat", key=f"chat_{lawyer.id}"):
+            handle_lawyer_chat(lawyer)
 
-        with col4:
-            if st.button(f"📞 Contact Info", key=f"contact_{lawyer['id']}"):
-                handle_contact_info(lawyer)
+    with col4:
+        if st.button(f"📞 Contact Info", key=f"contact_{lawyer.id}"):
+            handle_contact_info(lawyer)
 
 def handle_consultation_booking(lawyer):
     """Enhanced consultation booking"""
@@ -156,28 +151,28 @@ def handle_consultation_booking(lawyer):
     st.session_state.show_booking_form = True
 
     # Show success message
-    st.success(f"✅ Opening booking form for {lawyer['name']}")
+    st.success(f"✅ Opening booking form for {lawyer.name}")
     st.info("💡 A booking form will appear. Please fill in your preferred date and time.")
 
 def handle_view_profile(lawyer):
     """Handle viewing lawyer profile"""
-    with st.expander(f"👤 {lawyer['name']}'s Profile", expanded=True):
+    with st.expander(f"👤 {lawyer.name}'s Profile", expanded=True):
         col1, col2 = st.columns(2)
 
         with col1:
             st.markdown(f"""
-            **📧 Email:** {lawyer.get('email', 'Not provided')}
-            **📱 Phone:** {lawyer.get('phone', 'Not provided')}
-            **🎓 Experience:** {lawyer['experience']} years
-            **📍 Location:** {lawyer['location']}
+            **📧 Email:** {lawyer.email or 'Not provided'}
+            **📱 Phone:** {lawyer.phone or 'Not provided'}
+            **🎓 Experience:** {lawyer.experience} years
+            **📍 Location:** {lawyer.location}
             """)
 
         with col2:
             st.markdown(f"""
-            **⚖️ Specialization:** {lawyer['specialization']}
-            **🗣️ Languages:** {lawyer['languages']}
-            **💰 Fee Range:** {lawyer.get('fee_range', 'Contact for details')}
-            **⭐ Rating:** {lawyer.get('rating', 4.5)}/5.0
+            **⚖️ Specialization:** {lawyer.specialization}
+            **🗣️ Languages:** {lawyer.languages}
+            **💰 Fee Range:** {lawyer.fee_range or 'Contact for details'}
+            **⭐ Rating:** {lawyer.rating or 4.5}/5.0
             """)
 
 def handle_lawyer_chat(lawyer):
@@ -187,19 +182,18 @@ def handle_lawyer_chat(lawyer):
         return
 
     try:
-        # Find lawyer's user_id
-        lawyer_user_id = get_lawyer_user_id(lawyer['id'])
+        lawyer_user_id = lawyer.user_id
 
         if lawyer_user_id:
             # Set chat session data
             st.session_state.chat_with = lawyer_user_id
-            st.session_state.chat_with_name = lawyer['name']
+            st.session_state.chat_with_name = lawyer.name
             st.session_state.current_page = "Messages"
 
             # Create initial chat record if needed
-            create_initial_chat_record(lawyer_user_id, lawyer['name'])
+            create_initial_chat_record(lawyer_user_id, lawyer.name)
 
-            st.success(f"✅ Starting chat with {lawyer['name']}")
+            st.success(f"✅ Starting chat with {lawyer.name}")
             st.info("🔄 Redirecting to messages...")
 
             # Add a small delay before redirect
@@ -215,17 +209,17 @@ def handle_lawyer_chat(lawyer):
 
 def handle_contact_info(lawyer):
     """Show contact information"""
-    with st.expander(f"📞 Contact {lawyer['name']}", expanded=True):
+    with st.expander(f"📞 Contact {lawyer.name}", expanded=True):
         st.markdown(f"""
         ### Contact Information
 
-        **📧 Email:** {lawyer.get('email', 'Not provided')}
+        **📧 Email:** {lawyer.email or 'Not provided'}
 
-        **📱 Phone:** {lawyer.get('phone', 'Not provided')}
+        **📱 Phone:** {lawyer.phone or 'Not provided'}
 
-        **📍 Office Location:** {lawyer['location']}
+        **📍 Office Location:** {lawyer.location}
 
-        **💼 Specialization:** {lawyer['specialization']}
+        **💼 Specialization:** {lawyer.specialization}
 
         ---
 
@@ -275,7 +269,7 @@ def show_booking_form():
     st.markdown("### 📅 Book Consultation")
 
     with st.form(key="booking_form"):
-        st.markdown(f"**Booking consultation with: {lawyer['name']}**")
+        st.markdown(f"**Booking consultation with: {lawyer.name}**")
 
         col1, col2 = st.columns(2)
 
@@ -310,7 +304,7 @@ def show_booking_form():
             )
 
             if success:
-                st.success(f"✅ Booking request sent to {lawyer['name']}!")
+                st.success(f"✅ Booking request sent to {lawyer.name}!")
                 st.info("📧 You will receive a confirmation email shortly.")
                 # Clear the booking form
                 st.session_state.show_booking_form = False
@@ -333,7 +327,7 @@ def process_booking_request(lawyer, preferred_date, preferred_time, case_type, u
                 case_type, urgency, description, contact_preference,
                 status, created_at)
                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, NOW())""",
-            (current_user_id, lawyer['id'], preferred_date, preferred_time,
+            (current_user_id, lawyer.id, preferred_date, preferred_time,
              case_type, urgency, description, contact_preference, 'pending')
         )
 
@@ -6,65 +6,31 @@ from services.lawyer_service import get_lawyer_profile, update_lawyer_profile
 from config.settings import LEGAL_CATEGORIES, MAJOR_CITIES, SUPPORTED_LANGUAGES
 from config.styles import apply_custom_styles
 
+# Profile fields the form edits
+PROFILE_FIELDS = ("name", "email", "phone", "specialization", "experience", "location",
+                  "languages", "username", "fee_range")
+
 def show_lawyer_profile():
     """Display lawyer profile management page"""
     apply_custom_styles()
     st.title("👤 Lawyer Profile Management")
 
     try:
-        profile = get_lawyer_profile(st.session_state.user_id)
+        profile = get_lawyer_profile(st.session_state.user_id, fields=PROFILE_FIELDS)
 
         if profile:
-            # FIXED: Handle the correct number of columns from your database schema
-            # Based on your lawyers table, the profile might return different columns
-            # Let's use a safe unpacking approach
-
-            if len(profile) == 8:
-                # Original expected format
-                name, email, phone, specialization, experience, location, languages, username = profile
-                bar_registration = ""
-                bio = ""
-                fee_range = ""
-                rating = None
-                verified = False
-
-            elif len(profile) >= 10:
-                # Extended format - adjust based on what get_lawyer_profile actually returns
-                # Check your services/lawyer_service.py to see the exact SELECT query
-                try:
-                    # Common approach: unpack what we know and handle extras safely
-                    profile_data = list(profile)
-                    name = profile_data[0] if len(profile_data) > 0 else ""
-                    email = profile_data[1] if len(profile_data) > 1 else ""
-                    phone = profile_data[2] if len(profile_data) > 2 else ""
-                    specialization = profile_data[3] if len(profile_data) > 3 else ""
-                    experience = profile_data[4] if len(profile_data) > 4 else 0
-                    location = profile_data[5] if len(profile_data) > 5 else ""
-                    languages = profile_data[6] if len(profile_data) > 6 else ""
-                    username = profile_data[7] if len(profile_data) > 7 else ""
-                    bar_registration = profile_data[8] if len(profile_data) > 8 else ""
-                    bio = profile_data[9] if len(profile_data) > 9 else ""
-                    fee_range = profile_data[10] if len(profile_data) > 10 else ""
-                    rating = profile_data[11] if len(profile_data) > 11 else None
-                    verified = profile_data[12] if len(profile_data) > 12 else False
-                except Exception as e:
-                    st.error(f"Error unpacking profile data: {e}")
-                    st.info(f"Profile contains {len(profile)} fields: {profile}")
-                    return
-            else:
-                st.error(f"Unexpected profile data format. Expected 8+ fields, got {len(profile)}")
-                st.info(f"Profile data: {profile}")
-                return
+            name, email, phone, specialization = profile.name, profile.email, profile.phone, profile.specialization
+            experience, location, languages = profile.experience, profile.location, profile.languages
+            username, fee_range = profile.username, profile.fee_range
         else:
             # No profile found - set defaults
-            name = email = phone = specialization = location = languages = ""
+            name = email = phone = specialization = location = languages = fee_range = ""
             experience = 0
             username = st.session_state.get('username', '')
-            bar_registration = ""
-            bio = ""
-            fee_range = ""
-            rating = None
-            verified = False
+
+        # Not stored yet; the form collects them
+        bar_registration = ""
+        bio = ""
 
         render_profile_form(name, email, phone, specialization, experience, location,
                           languages, username, bar_registration, bio, fee_range)
@@ -1,9 +1,14 @@
+import html
 import streamlit as st
 from services.messaging_service import (
     get_user_conversations, get_messages, send_message,
-    create_appointment_request, get_user_appointments,
     get_conversation_stats, is_user_blocked
 )
+from services.appointment_service import create_appointment_request
+from services.document_service import get_message_attachments, send_attachment
+from components.documents import render_document_link
+from components.virtual_list import render_virtual_list
+from config.settings import DOCUMENT_SETTINGS
 from config.styles import apply_custom_styles
 from datetime import datetime, timedelta
 
@@ -14,54 +19,6 @@ def show_messages_page():
     # Initialize blocked_users table if it doesn't exist
     initialize_blocked_users_table()
 
-    # Custom CSS for better chat appearance
-    st.markdown("""
-    <style>
-    .chat-container {
-        height: 400px;
-        overflow-y: auto;
-        border: 1px solid #ddd;
-        border-radius: 10px;
-        padding: 10px;
-        background-color: #f9f9f9;
-    }
-    .message-sent {
-        background-color: #007bff;
-        color: white;
-        padding: 8px 12px;
-        border-radius: 15px;
-        margin: 5px 0;
-        text-align: right;
-        margin-left: 20%;
-    }
-    .message-received {
-        background-color: #e9ecef;
-        color: black;
-        padding: 8px 12px;
-        border-radius: 15px;
-        margin: 5px 0;
-        margin-right: 20%;
-    }
-    .conversation-item {
-        border: 1px solid #ddd;
-        border-radius: 8px;
-        padding: 10px;
-        margin: 5px 0;
-        cursor: pointer;
-    }
-    .conversation-item:hover {
-        background-color: #f0f0f0;
-    }
-    .unread-badge {
-        background-color: #dc3545;
-        color: white;
-        border-radius: 50%;
-        padding: 2px 6px;
-        font-size: 12px;
-    }
-    </style>
-    """, unsafe_allow_html=True)
-
     st.title("💬 Messages")
 
     if not st.session_state.get('authenticated', False):
@@ -145,48 +102,13 @@ def render_enhanced_conversations_list():
         conversations = get_user_conversations(st.session_state.user_id)
 
         if conversations:
-            for conv in conversations:
-                other_user_id, other_username, other_user_type, last_message_time, last_message, unread_count = conv
-
-                # Filter by search term if provided
-                if search_term and search_term.lower() not in other_username.lower():
-                    continue
-
-                # Create conversation card
-                with st.container():
-                    # Conversation header
-                    col1, col2 = st.columns([3, 1])
-
-                    with col1:
-                        user_display = f"{other_username}"
-                        if other_user_type:
-                            user_display += f" ({other_user_type.title()})"
-
-                        if st.button(
-                            user_display,
-                            key=f"conv_{other_user_id}",
-                            use_container_width=True
-                        ):
-                            st.session_state.chat_with = other_user_id
-                            st.session_state.chat_with_name = other_username
-                            st.session_state.chat_with_type = other_user_type
-                            st.rerun()
-
-                    with col2:
-                        if unread_count > 0:
-                            st.markdown(f'<span class="unread-badge">{unread_count}</span>',
-                                      unsafe_allow_html=True)
-
-                    # Last message preview
-                    if last_message:
-                        preview = last_message[:40] + "..." if len(last_message) > 40 else last_message
-                        st.caption(f"💬 {preview}")
-
-                    # Timestamp
-                    if last_message_time:
-                        st.caption(f"🕒 {format_timestamp(last_message_time)}")
-
-                    st.markdown("---")
+            # Filter by search term if provided
+            if search_term:
+                conversations = [conv for conv in conversations if search_term.lower() in conv[1].lower()]
+            render_virtual_list(
+                "conversations", conversations, row_id=lambda conv: conv[0], row_html=conversation_html,
+                row_label=conversation_label, render_actions=render_conversation_actions, page_size=10
+            )
         else:
             st.info("🔭 No conversations yet. Start messaging from the lawyers marketplace!")
             if st.button("🔍 Find Lawyers"):
@@ -195,6 +117,33 @@ def render_enhanced_conversations_list():
     except Exception as e:
         st.error(f"Error loading conversations: {e}")
 
+def conversation_label(conv):
+    other_user_id, other_username, other_user_type, last_message_time, last_message, unread_count = conv
+    user_display = f"{other_username}"
+    if other_user_type:
+        user_display += f" ({other_user_type.title()})"
+    return user_display
+
+def conversation_html(conv):
+    """Conversation preview: who, unread count, last message and when"""
+    other_user_id, other_username, other_user_type, last_message_time, last_message, unread_count = conv
+    unread = f' <span class="unread-badge">{unread_count}</span>' if unread_count > 0 else ""
+    preview = ""
+    if last_message:
+        preview = last_message[:40] + "..." if len(last_message) > 40 else last_message
+        preview = f"<br><small>💬 {html.escape(preview)}</small>"
+    timestamp = f"<br><small>🕒 {format_timestamp(last_message_time)}</small>" if last_message_time else ""
+    return f'<div class="compact-card"><strong>{html.escape(conversation_label(conv))}</strong>{unread}{preview}{timestamp}</div>'
+
+def render_conversation_actions(conv):
+    """Open the selected conversation"""
+    other_user_id, other_username, other_user_type, last_message_time, last_message, unread_count = conv
+    if st.button("💬 Open chat", key=f"conv_{other_user_id}", use_container_width=True):
+        st.session_state.chat_with = other_user_id
+        st.session_state.chat_with_name = other_username
+        st.session_state.chat_with_type = other_user_type
+        st.rerun()
+
 def show_welcome_message():
     """Show welcome message when no chat is selected"""
     st.markdown("""
@@ -205,7 +154,7 @@ def show_welcome_message():
     **Quick Tips:**
     - 📅 Use the appointment button to schedule meetings
     - 🔍 Search through your conversations
-    - 📎 Send important documents (coming soon)
+    - 📎 Send important documents
     - 📞 Voice/Video calls (coming soon)
     """)
 
@@ -298,10 +247,10 @@ def show_appointment_form(lawyer_user_id, lawyer_name):
         if submitted:
             try:
                 # Find lawyer_id from user_id - FIXED VERSION
-                from database.db_manager import execute_query
+                from database.prepared import execute_prepared
 
                 # First check if lawyer profile exists
-                lawyer_result = execute_query(
+                lawyer_result = execute_prepared(
                     "SELECT id FROM lawyers WHERE user_id = %s",
                     (lawyer_user_id,), fetch='one'
                 )
@@ -309,18 +258,16 @@ def show_appointment_form(lawyer_user_id, lawyer_name):
                 if lawyer_result:
                     lawyer_id = lawyer_result[0]
 
-                    # Create appointment request using the consultation system
-                    from services.consultation_service import schedule_consultation
-
-                    success, message = schedule_consultation(
-                        st.session_state.user_id,  # client_user_id
-                        lawyer_user_id,            # lawyer_user_id
-                        datetime.combine(appointment_date, appointment_time),  # consultation_datetime
-                        0,  # fee_amount (free for initial request)
-                        f"Appointment Request - {appointment_type}\n"
-                        f"Meeting Method: {meeting_method}\n"
-                        f"Duration: {duration}\n"
-                        f"Notes: {notes}"
+                    # Create an appointment request; the lawyer confirms it from their appointments page
+                    success = create_appointment_request(
+                        st.session_state.user_id,
+                        lawyer_id,
+                        appointment_date,
+                        appointment_time,
+                        appointment_type,
+                        meeting_method,
+                        duration,
+                        notes
                     )
 
                     if success:
@@ -332,8 +279,6 @@ def show_appointment_form(lawyer_user_id, lawyer_name):
 
                         st.session_state.show_appointment_form = False
                         st.rerun()
-                    else:
-                        st.error(f"❌ {message}")
                 else:
                     st.error("❌ This user is not registered as a lawyer. They need to complete their lawyer profile first.")
                     st.info("💡 Ask them to log in and complete their lawyer profile in the system.")
@@ -345,13 +290,14 @@ def render_enhanced_message_history(chat_with_id):
     """Enhanced message history with better styling"""
     try:
         messages = get_messages(st.session_state.user_id, chat_with_id)
+        attachments = get_message_attachments([row[0] for row in messages])
 
         # Create a proper container for messages
         message_container = st.container()
 
         with message_container:
             if messages:
-                for sender_id, receiver_id, message, sent_at, read_at in messages:
+                for message_id, sender_id, receiver_id, message, sent_at, read_at in messages:
                     is_sent = sender_id == st.session_state.user_id
                     timestamp = format_timestamp(sent_at)
                     read_status = "✓✓" if read_at and is_sent else "✓" if is_sent else ""
@@ -361,30 +307,32 @@ def render_enhanced_message_history(chat_with_id):
                         col1, col2 = st.columns([1, 3])
                         with col2:
                             st.markdown(f"""
-                            <div style="background-color: #007bff; color: white; padding: 10px;
-                                       border-radius: 15px; margin: 5px 0; text-align: left;">
+                            <div class="chat-bubble sent">
                                 {message}
-                                <br><small style="opacity: 0.8;">{timestamp} {read_status}</small>
+                                <br><small>{timestamp} {read_status}</small>
                             </div>
                             """, unsafe_allow_html=True)
+                            for document in attachments.get(message_id, []):
+                                render_document_link(document, f"message_{message_id}")
                     else:
                         # Received messages - align left
                         col1, col2 = st.columns([3, 1])
                         with col1:
                             st.markdown(f"""
-                            <div style="background-color: #e9ecef; color: black; padding: 10px;
-                                       border-radius: 15px; margin: 5px 0;">
+                            <div class="chat-bubble received">
                                 {message}
-                                <br><small style="opacity: 0.6;">{timestamp}</small>
+                                <br><small>{timestamp}</small>
                             </div>
                             """, unsafe_allow_html=True)
+                            for document in attachments.get(message_id, []):
+                                render_document_link(document, f"message_{message_id}")
             else:
                 st.info("👋 Start the conversation! No messages yet.")
     except Exception as e:
         st.error(f"Error loading messages: {e}")
 
 def render_enhanced_message_input(chat_with_id):
-    """Enhanced message input with quick replies and file upload"""
+    """Enhanced message input with quick replies and file attachments"""
 
     # Quick reply buttons
     st.markdown("**Quick Replies:**")
@@ -433,25 +381,38 @@ def render_enhanced_message_input(chat_with_id):
             st.write("")  # Spacing
             send_btn = st.form_submit_button("📤 Send", type="primary")
 
-            # File upload (placeholder for future feature)
-            st.caption("📎 File attachments coming soon!")
+        # Rotated after each send so the chosen file doesn't ride along with the next message
+        uploader_version = st.session_state.get(f"attachment_version_{chat_with_id}", 0)
+        attachment = st.file_uploader(
+            "📎 Attach a file", key=f"attachment_{chat_with_id}_{uploader_version}",
+            help=f"Up to {DOCUMENT_SETTINGS['max_upload_mb']} MB"
+        )
 
-        if send_btn and new_message.strip():
+        if send_btn and (new_message.strip() or attachment):
             try:
-                if send_message(st.session_state.user_id, chat_with_id, new_message.strip()):
-                    st.success("Message sent! 📤")
-                    st.rerun()
-                else:
+                if attachment:
+                    success, upload_message = send_attachment(
+                        attachment, attachment.name, attachment.type, st.session_state.user_id, chat_with_id,
+                        new_message.strip() or f"📎 {attachment.name}"
+                    )
+                    if not success:
+                        st.error(upload_message)
+                        return
+                    st.session_state[f"attachment_version_{chat_with_id}"] = uploader_version + 1
+                elif not send_message(st.session_state.user_id, chat_with_id, new_message.strip()):
                     st.error("Failed to send message ❌")
+                    return
+                st.success("Message sent! 📤")
+                st.rerun()
             except Exception as e:
                 st.error(f"Error sending message: {e}")
 
 def show_user_info(user_id):
     """Show information about the user being chatted with"""
-    from database.db_manager import execute_query
+    from database.prepared import execute_prepared
 
     try:
-        user_info = execute_query(
+        user_info = execute_prepared(
             "SELECT username, user_type, created_at FROM users WHERE id = %s",
             (user_id,), fetch='one'
         )
@@ -466,7 +427,7 @@ def show_user_info(user_id):
 
                 # If it's a lawyer, show additional info
                 if user_type == 'lawyer':
-                    lawyer_info = execute_query(
+                    lawyer_info = execute_prepared(
                         "SELECT name, specialization, experience, location FROM lawyers WHERE user_id = %s",
                         (user_id,), fetch='one'
                     )
@@ -1,5 +1,6 @@
 import streamlit as st
-from services.chatbot_service import get_legal_response, save_chat_message, get_quick_questions
+from services.chatbot_service import get_legal_answer, save_chat_message, get_quick_questions
+from services.awareness_service import get_language_content
 from config.settings import SUPPORTED_LANGUAGES
 from config.styles import apply_custom_styles
 
@@ -25,9 +26,9 @@ def render_chatbot_controls():
 
     for question in quick_questions:
         if st.button(question, key=f"quick_{question}"):
-            st.session_state.chat_history.append(("user", question))
-            response = get_legal_response(question, language)
-            st.session_state.chat_history.append(("bot", response))
+            st.session_state.chat_history.append(("user", question, None))
+            response, article = get_legal_answer(question, language)
+            st.session_state.chat_history.append(("bot", response, article))
             st.rerun()
 
 def render_chat_interface():
@@ -37,11 +38,14 @@ def render_chat_interface():
     # Display chat history
     chat_container = st.container()
     with chat_container:
-        for sender, message in st.session_state.chat_history[-10:]:
+        history = st.session_state.chat_history[-10:]
+        for index, (sender, message, article) in enumerate(history):
             if sender == "user":
                 st.markdown(f'<div class="chat-message user-message"><strong>You:</strong> {message}</div>', unsafe_allow_html=True)
             else:
                 st.markdown(f'<div class="chat-message bot-message"><strong>Legal Assistant:</strong> {message}</div>', unsafe_allow_html=True)
+                if article:
+                    render_read_more(article, key=f"read_more_{len(st.session_state.chat_history) - len(history) + index}")
 
     # Chat input
     user_input = st.text_input("Ask your legal question:", placeholder="Type your question here...")
@@ -49,12 +53,21 @@ def render_chat_interface():
     if st.button("Send") and user_input:
         language = st.selectbox("Language", SUPPORTED_LANGUAGES, key="chat_lang", label_visibility="collapsed")
 
-        st.session_state.chat_history.append(("user", user_input))
-        response = get_legal_response(user_input, language)
-        st.session_state.chat_history.append(("bot", response))
+        st.session_state.chat_history.append(("user", user_input, None))
+        response, article = get_legal_answer(user_input, language)
+        st.session_state.chat_history.append(("bot", response, article))
 
         # Save to database if user is logged in
         if st.session_state.authenticated:
             save_chat_message(st.session_state.user_id, user_input, response, language)
 
         st.rerun()
+
+def render_read_more(article, key):
+    """Link a bot answer to the full Legal Awareness article it came from"""
+    read_more = get_language_content(article['language'])['labels']['read_more']
+    if st.button(f"📖 {read_more}: {article['title']}", key=key):
+        st.session_state.awareness_article = article['slug']
+        st.session_state.awareness_language = article['language']
+        st.session_state.current_page = "Awareness"
+        st.rerun()
@@ -1,5 +1,5 @@
 import streamlit as st
-from utils.auth_manager import authenticate_user, register_user, validate_registration_data, hash_password
+from utils.auth_manager import login_user, register_user, validate_registration_data, hash_password
 from utils.session_manager import demo_login
 from config.settings import MAJOR_CITIES, SUPPORTED_LANGUAGES, USER_TYPES
 from database.db_manager import execute_query
@@ -55,17 +55,13 @@ def handle_login(username, password, debug_mode):
         if debug_mode:
             st.info(f"Attempting to login user: '{username}'")
 
-        result = authenticate_user(username, password)
-        if result:
-            st.session_state.authenticated = True
-            st.session_state.user_id = result[0]
-            st.session_state.user_type = result[1]
-            st.session_state.username = username
-            st.success("✅ Login successful! Redirecting...")
+        success, message = login_user(username, password)
+        if success:
+            st.success(message)
             st.session_state.current_page = "Home"
             st.rerun()
         else:
-            st.error("❌ Invalid credentials. Please try again.")
+            st.error(message)
             if debug_mode:
                 all_users = execute_query("SELECT username FROM users LIMIT 5", fetch='all')
                 if all_users:
@@ -1,87 +1,86 @@
+import importlib
 import streamlit as st
-from pages.public import home, chatbot, legal_awareness, login
-from pages.citizen import cases, consultations, profile
-from pages.lawyer import dashboard, available_cases, lawyer_cases, clients, appointments, earnings, resources, lawyer_profile,lawyer_marketplace
-from pages.messaging import messages
-from pages.admin import admin_dashboard
 
-# Make sure user is authenticated before showing lawyer-specific pages
-if st.session_state.get('current_page') in ['Available Cases', 'My Cases', 'Clients', 'Appointments']:
-    if not st.session_state.get('authenticated') or st.session_state.get('user_type') != 'Lawyer':
-        st.warning("Access denied. This page is for lawyers only.")
-        st.session_state.current_page = 'Home'
-        st.rerun()
-        
-def route_to_page():
-    """Route to the appropriate page based on current_page in session state"""
-    current_page = st.session_state.current_page
+# Who may open a page: None for everyone, ANY_USER for any logged-in user,
+# otherwise a tuple of user types
+ANY_USER = "*"
+CITIZEN = ("Citizen",)
+LAWYER = ("Lawyer",)
+ADMIN = ("Legal Aid Worker",)
 
+# Page name -> (module path, render function, required role).
+# Modules are imported on first visit, so a cold start only loads what is shown.
+PAGE_REGISTRY = {
     # Public pages (accessible to all)
-    if current_page == "Home":
-        from pages.public.home import show_home_page
-        show_home_page()
-    elif current_page == "Chatbot":
-        from pages.public.chatbot import show_chatbot_page
-        show_chatbot_page()
-    elif current_page == "Lawyers":
-        from pages.lawyer.lawyer_marketplace import show_lawyer_marketplace
-        show_lawyer_marketplace()
-    elif current_page == "Awareness":
-        from pages.public.legal_awareness import show_legal_awareness
-        show_legal_awareness()
-    elif current_page == "Login":
-        from pages.public.login import show_login_page
-        show_login_page()
+    "Home": ("pages.public.home", "show_home_page", None),
+    "Chatbot": ("pages.public.chatbot", "show_chatbot_page", None),
+    "Lawyers": ("pages.lawyer.lawyer_marketplace", "show_lawyer_marketplace", None),
+    "Awareness": ("pages.public.legal_awareness", "show_legal_awareness", None),
+    "Login": ("pages.public.login", "show_login_page", None),
 
     # Citizen-specific pages
-    elif current_page == "Cases":
-        from pages.citizen.cases import show_case_tracking
-        show_case_tracking()
-    elif current_page == "Consultations":
-        from pages.citizen.consultations import show_consultations_page
-        show_consultations_page()
-    elif current_page == "Profile":
-        from pages.citizen.profile import show_profile_page
-        show_profile_page()
+    "Cases": ("pages.citizen.cases", "show_case_tracking", CITIZEN),
+    "Consultations": ("pages.citizen.consultations", "show_consultations_page", CITIZEN),
+    "Profile": ("pages.citizen.profile", "show_profile_page", CITIZEN),
 
     # Messaging (available to all authenticated users)
-    elif current_page == "Messages":
-        from pages.messaging.messages import show_messages_page
-        show_messages_page()
+    "Messages": ("pages.messaging.messages", "show_messages_page", ANY_USER),
 
     # Lawyer-specific pages
-    elif current_page == "LawyerDashboard":
-        from pages.lawyer.dashboard import show_lawyer_dashboard
-        show_lawyer_dashboard()
-    elif current_page == "AvailableCases":
-        from pages.lawyer.available_cases import show_available_cases
-        show_available_cases()
-    elif current_page == "LawyerCases":
-        from pages.lawyer.lawyer_cases import show_lawyer_cases
-        show_lawyer_cases()
-    elif current_page == "LawyerClients":
-        from pages.lawyer.clients import show_lawyer_clients
-        show_lawyer_clients()
-    elif current_page == "LawyerAppointments":
-        from pages.lawyer.appointments import show_lawyer_appointments
-        show_lawyer_appointments()
-    elif current_page == "LawyerEarnings":
-        from pages.lawyer.earnings import show_lawyer_earnings
-        show_lawyer_earnings()
-    elif current_page == "LawyerResources":
-        from pages.lawyer.resources import show_lawyer_resources
-        show_lawyer_resources()
-    elif current_page == "LawyerProfile":
-        from pages.lawyer.lawyer_profile import show_lawyer_profile
-        show_lawyer_profile()
+    "LawyerDashboard": ("pages.lawyer.dashboard", "show_lawyer_dashboard", LAWYER),
+    "AvailableCases": ("pages.lawyer.available_cases", "show_available_cases", LAWYER),
+    "LawyerCases": ("pages.lawyer.lawyer_cases", "show_lawyer_cases", LAWYER),
+    "LawyerClients": ("pages.lawyer.clients", "show_lawyer_clients", LAWYER),
+    "LawyerAppointments": ("pages.lawyer.appointments", "show_lawyer_appointments", LAWYER),
+    "LawyerEarnings": ("pages.lawyer.earnings", "show_lawyer_earnings", LAWYER),
+    "LawyerResources": ("pages.lawyer.resources", "show_lawyer_resources", LAWYER),
+    "LawyerProfile": ("pages.lawyer.lawyer_profile", "show_lawyer_profile", LAWYER),
 
     # Admin pages
-    elif current_page.startswith("Admin"):
-        from pages.admin.admin_dashboard import show_admin_pages
-        show_admin_pages(current_page)
+    "AdminDashboard": ("pages.admin.admin_dashboard", "show_admin_dashboard", ADMIN),
+    "AdminCases": ("pages.admin.admin_dashboard", "show_admin_cases", ADMIN),
+    "AdminLawyers": ("pages.admin.admin_dashboard", "show_admin_lawyers", ADMIN),
+    "AdminUsers": ("pages.admin.admin_dashboard", "show_admin_users", ADMIN),
+    "AdminAnalytics": ("pages.admin.admin_dashboard", "show_admin_analytics", ADMIN),
+    "AdminSettings": ("pages.admin.admin_dashboard", "show_admin_settings", ADMIN),
+    "AdminDiagnostics": ("pages.admin.admin_dashboard", "show_admin_diagnostics", ADMIN),
+}
+
+# Older names still used by some buttons
+PAGE_ALIASES = {
+    "Lawyer Marketplace": "Lawyers",
+    "Lawyer Profile": "LawyerProfile",
+}
+
+def can_access(role):
+    """Check the current session against a page's required role"""
+    if role is None:
+        return True
+    if not st.session_state.get('authenticated'):
+        return False
+    return role == ANY_USER or st.session_state.get('user_type') in role
+
+def load_page(page_name):
+    """Import a page module on demand and return its render function"""
+    module_path, function_name, _ = PAGE_REGISTRY[page_name]
+    return getattr(importlib.import_module(module_path), function_name)
 
-    # Default fallback
-    else:
+def route_to_page():
+    """Route to the appropriate page based on current_page in session state"""
+    current_page = PAGE_ALIASES.get(st.session_state.current_page, st.session_state.current_page)
+
+    if current_page not in PAGE_REGISTRY:
         st.error(f"Page not found: {current_page}")
         st.session_state.current_page = "Home"
         st.rerun()
+
+    # Checked on every rerun, since the session can change between reruns
+    if not can_access(PAGE_REGISTRY[current_page][2]):
+        if not st.session_state.get('authenticated'):
+            st.warning("🔐 Please login to access this page.")
+            current_page = "Login"
+        else:
+            st.warning("Access denied. This page is not available for your account type.")
+            current_page = "Home"
+
+    load_page(current_page)()
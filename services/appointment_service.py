@@ -0,0 +1,157 @@
+import streamlit as st
+from datetime import datetime, timedelta
+from database.db_manager import execute_query
+from database.projection import Projection
+from services.scheduling_service import (
+    get_booked_intervals, book_consultation, parse_duration_minutes
+)
+
+APPOINTMENT_FIELDS = ("id", "client_id", "lawyer_id", "appointment_date", "appointment_time",
+                      "appointment_type", "meeting_method", "duration", "notes", "response_notes",
+                      "status", "created_at")
+APPOINTMENT = Projection("appointment", {field: f"a.{field}" for field in APPOINTMENT_FIELDS})
+APPOINTMENT_COLUMNS = APPOINTMENT.select_list(APPOINTMENT_FIELDS)
+
+# get_user_appointments adds the other party: the client for lawyers, the lawyer for clients
+LAWYER_APPOINTMENT = APPOINTMENT.extend("lawyer appointment", {'client_name': "u.username", 'client_email': "u.email"})
+CLIENT_APPOINTMENT = APPOINTMENT.extend("client appointment", {'lawyer_name': "l.name", 'lawyer_email': "l.email"})
+
+APPOINTMENT_STATUSES = ["pending", "confirmed", "declined", "cancelled", "completed"]
+
+def create_appointment_request(client_id, lawyer_id, appointment_date, appointment_time,
+                             appointment_type, meeting_method, duration, notes=""):
+    """Create an appointment request for a lawyer (lawyers.id)"""
+    try:
+        duration_minutes = parse_duration_minutes(duration)
+        start = datetime.combine(appointment_date, appointment_time)
+
+        if get_booked_intervals(lawyer_id).overlaps(start, start + timedelta(minutes=duration_minutes)):
+            st.warning("⚠️ The lawyer is already booked at that time. Please choose another slot.")
+            return False
+
+        execute_query(
+            """INSERT INTO appointments (client_id, lawyer_id, appointment_date,
+               appointment_time, appointment_type, meeting_method, duration,
+               notes, status, created_at)
+               VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, NOW())""",
+            (client_id, lawyer_id, appointment_date, appointment_time,
+             appointment_type, meeting_method, duration_minutes, notes, 'pending')
+        )
+        return True
+    except Exception as e:
+        st.error(f"Error creating appointment: {e}")
+        return False
+
+def get_user_appointments(user_id, user_type, fields=None):
+    """
+    Get appointments for a user (client or lawyer) as records of the given
+    fields; by default every appointment column plus the other party's
+    name and email.
+    """
+    try:
+        if user_type.lower() == 'lawyer':
+            fields = fields or APPOINTMENT_FIELDS + ("client_name", "client_email")
+            appointments = execute_query(
+                f"""SELECT {LAWYER_APPOINTMENT.select_list(fields)}
+                   FROM appointments a
+                   JOIN lawyers l ON a.lawyer_id = l.id
+                   JOIN users u ON a.client_id = u.id
+                   WHERE l.user_id = %s
+                   ORDER BY a.appointment_date DESC, a.appointment_time DESC""",
+                (user_id,), fetch='records'
+            )
+        else:
+            fields = fields or APPOINTMENT_FIELDS + ("lawyer_name", "lawyer_email")
+            appointments = execute_query(
+                f"""SELECT {CLIENT_APPOINTMENT.select_list(fields)}
+                   FROM appointments a
+                   JOIN lawyers l ON a.lawyer_id = l.id
+                   WHERE a.client_id = %s
+                   ORDER BY a.appointment_date DESC, a.appointment_time DESC""",
+                (user_id,), fetch='records'
+            )
+
+        return appointments if appointments else []
+    except Exception as e:
+        st.error(f"Error fetching appointments: {e}")
+        return []
+
+def get_lawyer_appointments_page(lawyer_user_id, start_date, end_date, after=None,
+                                 page_size=20, status_filter=None):
+    """
+    Get one page of a lawyer's appointments between two dates (inclusive).
+    `after` is the (appointment_date, appointment_time, id) of the last row of
+    the previous page; returns (rows, next_cursor) where next_cursor is None
+    on the last page.
+    """
+    try:
+        query = f"""
+            SELECT {APPOINTMENT_COLUMNS}, u.username as client_name, u.email as client_email
+            FROM appointments a
+            JOIN lawyers l ON a.lawyer_id = l.id
+            JOIN users u ON a.client_id = u.id
+            WHERE l.user_id = %s
+              AND a.appointment_date BETWEEN %s AND %s
+        """
+        params = [lawyer_user_id, start_date, end_date]
+
+        if status_filter and status_filter != "All":
+            query += " AND a.status = %s"
+            params.append(status_filter)
+
+        if after:
+            query += " AND (a.appointment_date, a.appointment_time, a.id) > (%s, %s, %s)"
+            params.extend(after)
+
+        # Fetch one extra row to learn whether another page exists
+        query += " ORDER BY a.appointment_date, a.appointment_time, a.id LIMIT %s"
+        params.append(page_size + 1)
+
+        rows = execute_query(query, params, fetch='all') or []
+        if len(rows) > page_size:
+            rows = rows[:page_size]
+            last = rows[-1]
+            return rows, (last[3], last[4], last[0])
+        return rows, None
+    except Exception as e:
+        st.error(f"Error fetching appointments: {e}")
+        return [], None
+
+def update_appointment_status(appointment_id, status, notes=""):
+    """Update appointment status"""
+    try:
+        execute_query(
+            """UPDATE appointments
+               SET status = %s, response_notes = %s, updated_at = NOW()
+               WHERE id = %s""",
+            (status, notes, appointment_id)
+        )
+        return True
+    except Exception as e:
+        st.error(f"Error updating appointment: {e}")
+        return False
+
+def accept_appointment_request(appointment_id, notes=""):
+    """Confirm an appointment request by booking it as a consultation"""
+    try:
+        appointment = execute_query(
+            """SELECT client_id, lawyer_id, appointment_date, appointment_time,
+                      duration, appointment_type, notes
+               FROM appointments
+               WHERE id = %s AND status = 'pending'""",
+            (appointment_id,), fetch='one'
+        )
+
+        if not appointment:
+            return False, "❌ Appointment request not found or already handled."
+
+        client_id, lawyer_id, appointment_date, appointment_time, duration, appointment_type, request_notes = appointment
+
+        return book_consultation(
+            client_id, lawyer_id,
+            datetime.combine(appointment_date, appointment_time),
+            0, f"{appointment_type}\n{request_notes or ''}".strip(),
+            duration, appointment_id=appointment_id, response_notes=notes
+        )
+    except Exception as e:
+        return False, f"❌ Error accepting appointment: {e}"
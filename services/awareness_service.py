@@ -0,0 +1,40 @@
+import logging
+import os
+from functools import lru_cache
+from config.settings import AWARENESS_SETTINGS
+from utils.awareness_bundle import FALLBACK_LANGUAGE, build_bundle, read_bundle, sources_newer_than, tokenize
+
+logger = logging.getLogger(__name__)
+
+@lru_cache(maxsize=1)
+def get_bundle():
+    """
+    The awareness content bundle, loaded once per process. Falls back to
+    building it from the sources when the deploy step hasn't run or the
+    sources have changed since, so content edits show up in development.
+    """
+    path = AWARENESS_SETTINGS["bundle_path"]
+    source_dir = AWARENESS_SETTINGS["source_dir"]
+    if os.path.exists(path) and not sources_newer_than(source_dir, path):
+        return read_bundle(path)
+    logger.warning("Awareness bundle missing or stale; building it in-process "
+                   "(run python -m utils.awareness_bundle when deploying)")
+    return build_bundle(source_dir)
+
+def get_language_content(language):
+    """One language's articles, labels and search index; English when it has none"""
+    bundle = get_bundle()
+    return bundle.get(language) or bundle[FALLBACK_LANGUAGE]
+
+def has_translation(language):
+    return language in get_bundle()
+
+def match_article(query, language="English"):
+    """The first article whose keywords appear as whole words in the query, or None"""
+    content = get_language_content(language)
+    words = f" {' '.join(tokenize(query))} "
+    for article in content['articles']:
+        for keyword in article['keywords']:
+            if f" {' '.join(tokenize(keyword))} " in words:
+                return article
+    return None
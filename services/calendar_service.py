@@ -0,0 +1,184 @@
+import base64
+from datetime import datetime, timedelta
+from urllib.parse import urlencode
+import psycopg2.extras
+from database.db_manager import execute_query, stream_query, get_pg_connection
+from config.settings import CALENDAR_SETTINGS, DOCUMENT_SETTINGS
+from services.consultation_service import get_lawyer_id
+from services.document_service import download_base_url
+from services.scheduling_service import invalidate_booked_intervals
+from utils.ical import iter_calendar, iter_busy_blocks
+from utils.session_manager import signing_secret
+from utils.session_tokens import sign_link, verify_link
+
+CALENDAR_FILENAME = "legal-aid-consultations.ics"
+
+# Consultations and still-pending appointment requests, in one streamed pass.
+# Rows: uid, start, end, status, notes, client name, phone, email, last modified
+CALENDAR_QUERY = """
+    SELECT 'consultation-' || c.id, c.consultation_date,
+           c.consultation_date + COALESCE(c.duration_minutes, 30) * INTERVAL '1 minute',
+           c.status, c.notes, u.username, u.phone, u.email,
+           COALESCE(c.updated_at, c.created_at)
+    FROM consultations c
+    JOIN lawyers l ON c.lawyer_id = l.id
+    JOIN users u ON c.user_id = u.id
+    WHERE l.user_id = %s AND c.consultation_date IS NOT NULL
+      AND {consultation_filter}
+    UNION ALL
+    SELECT 'appointment-' || a.id, a.appointment_date + a.appointment_time,
+           a.appointment_date + a.appointment_time + COALESCE(a.duration, 30) * INTERVAL '1 minute',
+           a.status, a.notes, u.username, u.phone, u.email,
+           COALESCE(a.updated_at, a.created_at)
+    FROM appointments a
+    JOIN lawyers l ON a.lawyer_id = l.id
+    JOIN users u ON a.client_id = u.id
+    WHERE l.user_id = %s
+      AND {appointment_filter}
+"""
+
+def encode_sync_token(moment):
+    """Encode a server timestamp as an opaque sync token"""
+    return base64.urlsafe_b64encode(f"v1:{moment.isoformat()}".encode()).decode()
+
+def decode_sync_token(token):
+    """Decode a sync token, returning None if it is missing or malformed"""
+    if not token:
+        return None
+    try:
+        version, _, value = base64.urlsafe_b64decode(token.encode()).decode().partition(":")
+        return datetime.fromisoformat(value) if version == "v1" else None
+    except (ValueError, UnicodeDecodeError):
+        return None
+
+def _event_status(status):
+    """Map a consultation or appointment status onto an iCalendar STATUS"""
+    status = (status or "").lower()
+    if status in ("cancelled", "declined"):
+        return "CANCELLED"
+    if status == "pending":
+        return "TENTATIVE"
+    return "CONFIRMED"
+
+def _rows_to_events(rows):
+    """Turn streamed calendar rows into event dicts"""
+    for uid, start, end, status, notes, client_name, phone, email, last_modified in rows:
+        is_request = uid.startswith("appointment-")
+        # Handled requests are superseded by their consultation, so drop them from calendars
+        status = _event_status(status) if not is_request or status == 'pending' else "CANCELLED"
+        kind = "Appointment request" if is_request else "Consultation"
+        yield {
+            'uid': f"{uid}@legal-aid-india",
+            'start': start,
+            'end': end,
+            'summary': f"{kind}: {client_name}",
+            'description': f"Client: {client_name}\nPhone: {phone or '-'}\nEmail: {email or '-'}\n{notes or ''}".strip(),
+            'status': status,
+            'last_modified': last_modified
+        }
+
+def next_sync_token():
+    """Sync token for the next export, a little before the database's clock so no change falls between exports"""
+    server_now = execute_query("SELECT LOCALTIMESTAMP", fetch='one')
+    return encode_sync_token(
+        (server_now[0] if server_now else datetime.now())
+        - timedelta(seconds=CALENDAR_SETTINGS["sync_overlap_seconds"])
+    )
+
+def iter_calendar_feed(lawyer_user_id, sync_token=None):
+    """
+    Lines of a lawyer's ICS feed, generated while rows stream from the
+    database. Without a token the feed holds every active event; with one it
+    holds only events changed since that token, including cancellations so
+    calendars can remove them.
+    """
+    since = decode_sync_token(sync_token)
+    if since:
+        consultation_filter = "COALESCE(c.updated_at, c.created_at) > %s"
+        appointment_filter = "COALESCE(a.updated_at, a.created_at) > %s"
+        params = (lawyer_user_id, since, lawyer_user_id, since)
+    else:
+        consultation_filter = "c.status IS DISTINCT FROM 'Cancelled'"
+        appointment_filter = "a.status = 'pending'"
+        params = (lawyer_user_id, lawyer_user_id)
+
+    rows = stream_query(
+        CALENDAR_QUERY.format(consultation_filter=consultation_filter, appointment_filter=appointment_filter),
+        params,
+        batch_size=CALENDAR_SETTINGS["stream_batch_size"]
+    )
+    return iter_calendar(
+        _rows_to_events(rows),
+        CALENDAR_SETTINGS["timezone_offset_minutes"],
+        CALENDAR_SETTINGS["prodid"],
+        "Legal Aid India consultations"
+    )
+
+def calendar_feed_url(lawyer_user_id, sync_token=None):
+    """
+    Signed, expiring link that streams the lawyer's feed from the download
+    server, or None if it isn't running. Nothing is queried until it's opened.
+    """
+    base_url = download_base_url()
+    if not base_url:
+        return None
+    since = sync_token or ""
+    expires, signature = sign_link(
+        f"calendar/{lawyer_user_id}/{since}", signing_secret(), DOCUMENT_SETTINGS["link_ttl_minutes"] * 60
+    )
+    return f"{base_url}/calendar/{lawyer_user_id}?{urlencode({'since': since, 'expires': expires, 'sig': signature})}"
+
+def generate_calendar_download(path, query):
+    """Map a signed /calendar/<user id> request to (filename, content_type, lines), for the download server"""
+    parts = path.strip("/").split("/")
+    if len(parts) != 2 or parts[0] != "calendar" or not parts[1].isdigit():
+        return None
+    lawyer_user_id = int(parts[1])
+    since = query.get("since", "")
+    if not verify_link(f"calendar/{lawyer_user_id}/{since}", query.get("expires"), query.get("sig"), signing_secret()):
+        return None
+    return CALENDAR_FILENAME, "text/calendar; charset=utf-8", iter_calendar_feed(lawyer_user_id, since or None)
+
+def import_busy_blocks(lawyer_user_id, lines):
+    """
+    Replace a lawyer's imported busy blocks with the future events of an
+    ICS file, so the scheduler treats them as booked time.
+    """
+    lawyer_id = get_lawyer_id(lawyer_user_id)
+    if not lawyer_id:
+        return False, "❌ Lawyer profile not found."
+
+    now = datetime.now()
+    blocks = {}
+    for uid, start, end in iter_busy_blocks(lines, CALENDAR_SETTINGS["timezone_offset_minutes"]):
+        if end > now and end > start:
+            blocks[uid[:500]] = (lawyer_id, uid[:500], start, end)
+
+    conn = get_pg_connection()
+    if conn is None:
+        return False, "❌ Unable to connect to database"
+
+    try:
+        with conn.cursor() as cur:
+            cur.execute(
+                "DELETE FROM lawyer_busy_blocks WHERE lawyer_id = %s AND ends_at > %s",
+                (lawyer_id, now)
+            )
+            psycopg2.extras.execute_values(
+                cur,
+                """INSERT INTO lawyer_busy_blocks (lawyer_id, source_uid, starts_at, ends_at)
+                   VALUES %s
+                   ON CONFLICT (lawyer_id, source_uid)
+                   DO UPDATE SET starts_at = EXCLUDED.starts_at, ends_at = EXCLUDED.ends_at""",
+                list(blocks.values()),
+                page_size=1000
+            )
+        conn.commit()
+    except Exception as e:
+        conn.rollback()
+        return False, f"❌ Error importing calendar: {e}"
+    finally:
+        conn.close()
+
+    invalidate_booked_intervals(lawyer_id)
+    return True, f"✅ Imported {len(blocks)} busy block(s) from your calendar."
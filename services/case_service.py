@@ -1,6 +1,6 @@
 import streamlit as st
 from datetime import datetime
-from database.db_manager import execute_query
+from database.db_manager import execute_query, report_error
 
 def create_case(user_id, title, description, category, priority):
     """Create a new case"""
@@ -15,7 +15,7 @@ def create_case(user_id, title, description, category, priority):
         return False, f"Error creating case: {e}"
 
 def get_user_cases(user_id, status_filter=None, category_filter=None):
-    """Get cases for a specific user with optional filters"""
+    """Get cases for a specific user with optional filters, as named-tuple records"""
     try:
         query = """
             SELECT c.id, c.user_id, c.lawyer_id, c.title, c.description,
@@ -37,17 +37,17 @@ def get_user_cases(user_id, status_filter=None, category_filter=None):
 
         query += " ORDER BY c.created_at DESC"
 
-        return execute_query(query, params, fetch='all')
+        return execute_query(query, params, fetch='records') or []
     except Exception as e:
         st.error(f"Error fetching user cases: {e}")
         return []
 
 def get_lawyer_cases(lawyer_user_id, status_filter=None, category_filter=None, priority_filter=None):
-    """Get cases assigned to a specific lawyer using user_id"""
+    """Get cases assigned to a specific lawyer using user_id, as named-tuple records"""
     try:
         query = """
             SELECT c.id, c.title, c.description, c.category, c.status, c.priority,
-                c.created_at, c.updated_at, u.username as client_name, u.phone, u.email, c.user_id
+                c.created_at, c.updated_at, u.username as client_name, u.phone, u.email, c.user_id as client_user_id
             FROM cases c
             JOIN users u ON c.user_id = u.id
             JOIN lawyers l ON c.lawyer_id = l.id
@@ -67,7 +67,7 @@ def get_lawyer_cases(lawyer_user_id, status_filter=None, category_filter=None, p
 
         query += " ORDER BY c.updated_at DESC"
 
-        return execute_query(query, params, fetch='all')
+        return execute_query(query, params, fetch='records') or []
     except Exception as e:
         st.error(f"Error fetching lawyer cases: {e}")
         return []
@@ -113,11 +113,11 @@ def assign_case_to_lawyer(case_id, lawyer_user_id):
         return False, f"Error assigning case: {e}"
 
 def get_lawyer_cases(lawyer_user_id, status_filter=None, category_filter=None, priority_filter=None):
-    """Get cases assigned to a specific lawyer using user_id"""
+    """Get cases assigned to a specific lawyer using user_id, as named-tuple records"""
     try:
         query = """
             SELECT c.id, c.title, c.description, c.category, c.status, c.priority,
-                c.created_at, c.updated_at, u.username as client_name, u.phone, u.email, c.user_id
+                c.created_at, c.updated_at, u.username as client_name, u.phone, u.email, c.user_id as client_user_id
             FROM cases c
             JOIN users u ON c.user_id = u.id
             JOIN lawyers l ON c.lawyer_id = l.id
@@ -137,7 +137,7 @@ def get_lawyer_cases(lawyer_user_id, status_filter=None, category_filter=None, p
 
         query += " ORDER BY c.updated_at DESC"
 
-        return execute_query(query, params, fetch='all')
+        return execute_query(query, params, fetch='records') or []
     except Exception as e:
         st.error(f"Error fetching lawyer cases: {e}")
         return []
@@ -153,6 +153,22 @@ def update_case_status(case_id, new_status):
     except Exception as e:
         return False, f"Error updating status: {e}"
 
+def get_recent_case_updates(lawyer_user_id, limit=5):
+    """Get a lawyer's most recently updated cases as (title, status, updated_at, client_name)"""
+    try:
+        cases = execute_query(
+            """SELECT c.title, c.status, c.updated_at, u.username as client_name
+               FROM cases c
+               JOIN users u ON c.user_id = u.id
+               WHERE c.lawyer_id = %s
+               ORDER BY c.updated_at DESC LIMIT %s""",
+            (lawyer_user_id, limit), fetch='all'
+        )
+        return cases if cases else []
+    except Exception as e:
+        report_error(f"Error loading recent cases: {e}")
+        return []
+
 def get_case_statistics(user_id, user_type):
     """Get case statistics based on user type"""
     try:
@@ -202,5 +218,5 @@ def get_case_statistics(user_id, user_type):
             return stats
 
     except Exception as e:
-        st.error(f"Error getting statistics: {e}")
+        report_error(f"Error getting statistics: {e}")
         return {}
@@ -1,13 +1,15 @@
 import streamlit as st
-from datetime import datetime
-from database.db_manager import execute_query
+from datetime import datetime, timedelta
+from database.db_manager import execute_query, report_error
+from database.prepared import execute_prepared
+from services.scheduling_service import book_consultation, invalidate_booked_intervals
 
 def validate_lawyer_exists(user_id):
     """
     Check if lawyer profile exists, create if not
     """
     try:
-        lawyer_record = execute_query(
+        lawyer_record = execute_prepared(
             "SELECT id FROM lawyers WHERE user_id = %s",
             (user_id,),
             fetch='one'
@@ -27,13 +29,27 @@ def validate_lawyer_exists(user_id):
         return False
 
 
-def schedule_consultation(client_user_id, lawyer_user_id, consultation_datetime, fee_amount, notes):
+def get_lawyer_id(user_id):
+    """Get the lawyers.id for a lawyer's user_id"""
+    try:
+        lawyer_record = execute_prepared(
+            "SELECT id FROM lawyers WHERE user_id = %s",
+            (user_id,),
+            fetch='one'
+        )
+        return lawyer_record[0] if lawyer_record else None
+    except Exception as e:
+        st.error(f"Error getting lawyer ID: {e}")
+        return None
+
+def schedule_consultation(client_user_id, lawyer_user_id, consultation_datetime, fee_amount, notes,
+                          duration_minutes=None):
     """
     Schedule a new consultation with proper lawyer_id validation
     """
     try:
         # First, get the actual lawyer_id from the lawyers table using user_id
-        lawyer_record = execute_query(
+        lawyer_record = execute_prepared(
             "SELECT id FROM lawyers WHERE user_id = %s",
             (lawyer_user_id,),
             fetch='one'
@@ -60,29 +76,15 @@ def schedule_consultation(client_user_id, lawyer_user_id, consultation_datetime,
         # Get client user_id (in case client_user_id is actually user_id)
         client_id = client_user_id
 
-        # Insert consultation with proper lawyer_id
-        consultation_id = execute_query(
-            """
-            INSERT INTO consultations (user_id, lawyer_id, consultation_type, status,
-                                     scheduled_at, consultation_date, fee_amount, notes)
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-            RETURNING id
-            """,
-            (client_id, lawyer_id, 'Scheduled', 'Pending',
-             consultation_datetime, consultation_datetime, fee_amount, notes),
-            fetch='one'
-        )
-
-        if consultation_id:
-            return True, f"✅ Consultation scheduled successfully (ID: {consultation_id[0]})"
-        else:
-            return False, "❌ Failed to schedule consultation"
+        # Insert consultation with proper lawyer_id, rejecting overlapping bookings
+        return book_consultation(client_id, lawyer_id, consultation_datetime,
+                                 fee_amount, notes, duration_minutes)
 
     except Exception as e:
         return False, f"❌ Error scheduling consultation: {str(e)}"
 
 def get_user_consultations(user_id):
-    """Get all consultations for a user"""
+    """Get all consultations for a user as named-tuple records"""
     try:
         consultations = execute_query(
             """SELECT c.id, c.consultation_date, c.status, c.notes, c.fee_amount,
@@ -91,7 +93,7 @@ def get_user_consultations(user_id):
                JOIN lawyers l ON c.lawyer_id = l.user_id
                WHERE c.user_id = %s
                ORDER BY c.consultation_date DESC""",
-            (user_id,), fetch='all'
+            (user_id,), fetch='records'
         )
         return consultations if consultations else []
     except Exception as e:
@@ -120,16 +122,68 @@ def get_lawyer_consultations(lawyer_user_id, upcoming_only=False):
         st.error(f"Error fetching lawyer consultations: {e}")
         return []
 
+def get_lawyer_consultations_in_range(lawyer_user_id, start=None, end=None, limit=10, newest_first=False):
+    """
+    Get a lawyer's consultations with start <= consultation_date < end.
+    Filtering, ordering and LIMIT all happen in SQL on the
+    (lawyer_id, consultation_date) index, so the cost does not grow with
+    the lawyer's history.
+    """
+    try:
+        query = """
+            SELECT c.id, c.consultation_date, c.status, c.notes, c.fee_amount,
+                   u.username, u.phone, u.email
+            FROM consultations c
+            JOIN lawyers l ON c.lawyer_id = l.id
+            JOIN users u ON c.user_id = u.id
+            WHERE l.user_id = %s
+        """
+        params = [lawyer_user_id]
+
+        if start is not None:
+            query += " AND c.consultation_date >= %s"
+            params.append(start)
+        if end is not None:
+            query += " AND c.consultation_date < %s"
+            params.append(end)
+
+        query += " ORDER BY c.consultation_date DESC" if newest_first else " ORDER BY c.consultation_date ASC"
+
+        if limit:
+            query += " LIMIT %s"
+            params.append(limit)
+
+        return execute_query(query, params, fetch='all') or []
+    except Exception as e:
+        report_error(f"Error fetching lawyer consultations: {e}")
+        return []
+
+def get_upcoming_consultations(lawyer_user_id, limit=10, start=None):
+    """Get the next consultations from now (or `start`), soonest first"""
+    return get_lawyer_consultations_in_range(lawyer_user_id, start=start or datetime.now(), limit=limit)
+
+def get_past_consultations(lawyer_user_id, limit=10):
+    """Get the most recent past consultations, newest first"""
+    return get_lawyer_consultations_in_range(lawyer_user_id, end=datetime.now(), limit=limit, newest_first=True)
+
+def get_todays_consultations(lawyer_user_id, limit=20):
+    """Get today's consultations, earliest first"""
+    today = datetime.combine(datetime.now().date(), datetime.min.time())
+    return get_lawyer_consultations_in_range(lawyer_user_id, start=today,
+                                             end=today + timedelta(days=1), limit=limit)
+
 def update_consultation_status(consultation_id, new_status):
     """
     Update consultation status
     """
     try:
-        result = execute_query(
-            "UPDATE consultations SET status = %s WHERE id = %s",
+        updated = execute_query(
+            "UPDATE consultations SET status = %s, updated_at = NOW() WHERE id = %s RETURNING lawyer_id",
             (new_status, consultation_id),
-            fetch=False
+            fetch='one'
         )
+        if updated and new_status == 'Cancelled':
+            invalidate_booked_intervals(updated[0])
         return True
     except Exception as e:
         st.error(f"Error updating consultation status: {e}")
@@ -165,7 +219,7 @@ def get_consultation_statistics(lawyer_id):
 
         return stats
     except Exception as e:
-        st.error(f"Error getting consultation statistics: {e}")
+        report_error(f"Error getting consultation statistics: {e}")
         return {}
 
 def get_lawyer_clients(user_id):
@@ -174,7 +228,7 @@ def get_lawyer_clients(user_id):
     """
     try:
         # First get the lawyer_id
-        lawyer_record = execute_query(
+        lawyer_record = execute_prepared(
             "SELECT id FROM lawyers WHERE user_id = %s",
             (user_id,),
             fetch='one'
@@ -212,7 +266,7 @@ def get_lawyer_consultations(user_id, upcoming_only=False):
     """
     try:
         # First get the lawyer_id
-        lawyer_record = execute_query(
+        lawyer_record = execute_prepared(
             "SELECT id FROM lawyers WHERE user_id = %s",
             (user_id,),
             fetch='one'
@@ -0,0 +1,236 @@
+"""Run background jobs on uploaded documents: previews, text extraction and search indexing.
+
+Usage: DATABASE_URL=postgresql://... python -m services.document_jobs
+       [--workers 1] [--kinds extract preview] [--once]
+
+Each worker process claims one job at a time from document_jobs with
+FOR UPDATE SKIP LOCKED, so any number of workers (on any number of hosts)
+share the queue without handing out a job twice. Workers run at lower CPU
+priority (DOCUMENT_PIPELINE_SETTINGS["niceness"]) and can be capped in pages
+per second, so extraction yields to the processes serving pages. --once
+drains the queue and exits instead of polling for new jobs; it exits with
+an error if the queue can't be read.
+"""
+import argparse
+import logging
+import mimetypes
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+import psycopg2
+from config.settings import DOCUMENT_PIPELINE_SETTINGS, SUPPORTED_LANGUAGES
+from database.db_manager import connection_args
+from database.records import rows_to_records
+from services.document_service import BUCKET, content_key, object_store
+from services.preview_service import preview_document
+from utils.text_extraction import (
+    OcrUnavailable, UnsupportedDocument, clean_text, detect_language, extract_pages, ocr_language_codes
+)
+
+logger = logging.getLogger(__name__)
+
+class Throttle:
+    """Space out units of work to at most `per_second` (0 for no limit)"""
+
+    def __init__(self, per_second):
+        self.interval = 1 / per_second if per_second else 0
+        self._next = time.monotonic()
+
+    def wait(self):
+        if not self.interval:
+            return
+        now = time.monotonic()
+        if now < self._next:
+            time.sleep(self._next - now)
+        self._next = max(now, self._next) + self.interval
+
+def _execute(query, params=None, fetch=False):
+    """
+    Run one statement on its own connection and commit. Unlike execute_query,
+    which reports errors on the page and returns None, database errors are
+    raised, so a failed claim isn't mistaken for an empty queue.
+    fetch: False, 'one' or 'records'.
+    """
+    args, kwargs = connection_args()
+    conn = psycopg2.connect(*args, **kwargs)
+    try:
+        with conn, conn.cursor() as cur:  # Commits, or rolls back on error
+            cur.execute(query, params)
+            if fetch == 'records':
+                return rows_to_records(cur.description, cur.fetchall())
+            return cur.fetchone() if fetch == 'one' else None
+    finally:
+        conn.close()
+
+def claim_job(kinds):
+    """Take the oldest open job of the given kinds, or None; skips jobs other workers hold"""
+    return _execute(
+        """UPDATE document_jobs
+           SET status = 'running', attempts = attempts + 1, claimed_at = NOW(), error = NULL
+           WHERE id = (
+               SELECT id FROM document_jobs
+               WHERE kind = ANY(%s)
+                 AND attempts < %s
+                 AND (status = 'pending'
+                      OR (status = 'running' AND claimed_at < NOW() - %s * INTERVAL '1 minute'))
+               ORDER BY id
+               LIMIT 1
+               FOR UPDATE SKIP LOCKED
+           )
+           RETURNING id, document_id, kind, attempts""",
+        (list(kinds), DOCUMENT_PIPELINE_SETTINGS["max_attempts"], DOCUMENT_PIPELINE_SETTINGS["stale_minutes"]),
+        fetch='one'
+    )
+
+def finish_job(job_id):
+    _execute(
+        "UPDATE document_jobs SET status = 'done', finished_at = NOW() WHERE id = %s",
+        (job_id,)
+    )
+
+def fail_job(job_id, attempts, error, retry=True):
+    """Record a failure; the job goes back in the queue until it runs out of attempts"""
+    status = 'pending' if retry and attempts < DOCUMENT_PIPELINE_SETTINGS["max_attempts"] else 'failed'
+    _execute(
+        "UPDATE document_jobs SET status = %s, error = %s, finished_at = NOW() WHERE id = %s",
+        (status, error[:1000], job_id)
+    )
+
+def expire_lost_jobs():
+    """Fail jobs whose worker died on their last attempt, so they don't stay 'running'"""
+    _execute(
+        """UPDATE document_jobs SET status = 'failed', error = 'Worker stopped during the last attempt'
+           WHERE status = 'running' AND attempts >= %s
+             AND claimed_at < NOW() - %s * INTERVAL '1 minute'""",
+        (DOCUMENT_PIPELINE_SETTINGS["max_attempts"], DOCUMENT_PIPELINE_SETTINGS["stale_minutes"])
+    )
+
+def load_document(document_id):
+    """The document a job works on, as a record, or None if it was deleted"""
+    documents = _execute(
+        """SELECT d.id, d.sha256, d.filename, d.content_type, u.language AS uploader_language
+           FROM documents d
+           LEFT JOIN users u ON u.id = d.uploaded_by
+           WHERE d.id = %s""",
+        (document_id,),
+        fetch='records'
+    )
+    return documents[0] if documents else None
+
+def extract_document(document, throttle):
+    """Extract, clean and index a document's text; returns the number of pages read"""
+    content_type = document.content_type or mimetypes.guess_type(document.filename)[0]
+    # OCR in the uploader's language as well as English
+    lang = ocr_language_codes([document.uploader_language] if document.uploader_language else [])
+
+    pages = []
+    with tempfile.NamedTemporaryFile(suffix=os.path.splitext(document.filename)[1]) as local:
+        object_store.download_fileobj(Bucket=BUCKET, Key=content_key(document.sha256), Fileobj=local)
+        local.flush()
+        for text in extract_pages(local.name, content_type, lang, DOCUMENT_PIPELINE_SETTINGS["min_text_chars"]):
+            pages.append(clean_text(text))
+            throttle.wait()
+
+    text = "\n\n".join(page for page in pages if page)
+    language = detect_language(text, SUPPORTED_LANGUAGES)
+    indexed = text[:DOCUMENT_PIPELINE_SETTINGS["max_indexed_chars"]]
+    updated = _execute(
+        """UPDATE documents
+           SET extracted_text = %s, language = %s, page_count = %s,
+               search_vector = setweight(to_tsvector('simple', filename), 'A')
+                   || to_tsvector(%s::regconfig, %s)
+                   || to_tsvector('simple', %s)
+           WHERE id = %s
+           RETURNING id""",
+        (text, language, len(pages), 'english' if language == "English" else 'simple',
+         indexed, indexed, document.id),
+        fetch='one'
+    )
+    if updated is None:
+        raise RuntimeError("Document deleted while its text was extracted")
+    return len(pages)
+
+# Job kind -> handler(document record, throttle) returning pages processed
+HANDLERS = {
+    'extract': extract_document,
+    'preview': preview_document,
+}
+
+def run_job(job, throttle):
+    """Run one claimed job and record its outcome; returns pages processed"""
+    job_id, document_id, kind, attempts = job
+    try:
+        document = load_document(document_id)
+        pages = HANDLERS[kind](document, throttle) if document else 0
+    except (UnsupportedDocument, OcrUnavailable) as e:
+        # Retrying won't help until the document type or OCR is supported
+        _record_outcome(fail_job, job_id, attempts, str(e), retry=False)
+        return 0
+    except Exception as e:
+        logger.warning("Job %s (%s of document %s) failed: %s", job_id, kind, document_id, e)
+        _record_outcome(fail_job, job_id, attempts, f"{type(e).__name__}: {e}")
+        return 0
+    _record_outcome(finish_job, job_id)
+    return pages
+
+def _record_outcome(record, job_id, *args, **kwargs):
+    """Store a job's outcome; if the database refuses, log it and leave the job to be reclaimed once stale"""
+    try:
+        record(job_id, *args, **kwargs)
+    except psycopg2.Error:
+        logger.exception("Could not record the outcome of job %s; it runs again after %s minutes",
+                         job_id, DOCUMENT_PIPELINE_SETTINGS["stale_minutes"])
+
+def _lower_priority():
+    os.nice(DOCUMENT_PIPELINE_SETTINGS["niceness"])
+
+def worker_loop(kinds, once=False):
+    """Claim and run jobs until the queue is empty (once) or forever; returns (jobs, pages)"""
+    throttle = Throttle(DOCUMENT_PIPELINE_SETTINGS["max_pages_per_second"])
+    jobs = pages = 0
+    expire_lost_jobs()
+    while True:
+        try:
+            job = claim_job(kinds)
+        except psycopg2.Error:
+            if once:
+                raise  # Not an empty queue: report the failure instead of finishing
+            logger.exception("Could not claim a job; retrying")
+            time.sleep(DOCUMENT_PIPELINE_SETTINGS["poll_seconds"])
+            continue
+        if job is None:
+            if once:
+                return jobs, pages
+            time.sleep(DOCUMENT_PIPELINE_SETTINGS["poll_seconds"])
+            try:
+                expire_lost_jobs()
+            except psycopg2.Error:
+                logger.exception("Could not expire lost jobs")
+            continue
+        pages += run_job(job, throttle)
+        jobs += 1
+
+def run_workers(workers, kinds, once=False):
+    """Run `workers` worker processes; returns their combined (jobs, pages)"""
+    with ProcessPoolExecutor(max_workers=workers, initializer=_lower_priority) as pool:
+        results = [future.result() for future in [pool.submit(worker_loop, kinds, once) for _ in range(workers)]]
+    return sum(jobs for jobs, _ in results), sum(pages for _, pages in results)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, default=DOCUMENT_PIPELINE_SETTINGS["workers"])
+    parser.add_argument("--kinds", nargs="+", default=list(HANDLERS), choices=list(HANDLERS))
+    parser.add_argument("--once", action="store_true", help="exit when the queue is empty")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(processName)s %(levelname)s %(message)s")
+    began = time.perf_counter()
+    try:
+        jobs, pages = run_workers(args.workers, args.kinds, args.once)
+    except psycopg2.Error as e:
+        raise SystemExit(f"Database error: {e}")
+    print(f"{jobs} jobs, {pages} pages in {time.perf_counter() - began:.1f} s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,277 @@
+import hashlib
+import os
+import uuid
+import streamlit as st
+from config.settings import DOCUMENT_SETTINGS
+from database.db_manager import execute_query
+from utils.object_store import FileSystemObjectStore, NoSuchKey, start_download_server
+from utils.session_manager import signing_secret
+from utils.session_tokens import sign_link, verify_link
+
+BUCKET = DOCUMENT_SETTINGS["bucket"]
+object_store = FileSystemObjectStore(DOCUMENT_SETTINGS["store_root"], DOCUMENT_SETTINGS["chunk_bytes"])
+
+_DOCUMENT_COLUMNS = """d.id, d.filename, d.content_type, d.size_bytes, d.sha256, d.uploaded_by, d.created_at,
+    d.language, d.page_count, j.status AS extraction_status, p.status AS preview_status"""
+_DOCUMENT_JOIN = """documents d
+    LEFT JOIN document_jobs j ON j.document_id = d.id AND j.kind = 'extract'
+    LEFT JOIN document_jobs p ON p.document_id = d.id AND p.kind = 'preview'"""
+
+# clean_text strips control characters from extracted text, so these can't clash with it
+HIGHLIGHT_START, HIGHLIGHT_STOP = "\x02", "\x03"
+_HEADLINE_OPTIONS = f"StartSel={HIGHLIGHT_START}, StopSel={HIGHLIGHT_STOP}, MaxFragments=2, MaxWords=25, MinWords=8"
+
+class UploadTooLarge(ValueError):
+    """The upload passed the configured size limit"""
+
+class HashingReader:
+    """
+    Wrap a file object so the object store's chunked copy also computes the
+    SHA-256 and enforces the size limit, without a second pass over the data.
+    """
+
+    def __init__(self, fileobj, max_bytes):
+        self._fileobj = fileobj
+        self._max_bytes = max_bytes
+        self.sha256 = hashlib.sha256()
+        self.size = 0
+
+    def readinto(self, buffer):
+        if hasattr(self._fileobj, "readinto"):
+            count = self._fileobj.readinto(buffer)
+        else:
+            chunk = self._fileobj.read(len(buffer))
+            count = len(chunk)
+            buffer[:count] = chunk
+        if not count:
+            return 0
+        self.size += count
+        if self.size > self._max_bytes:
+            raise UploadTooLarge(f"File is larger than {self._max_bytes // (1024 * 1024)} MB")
+        self.sha256.update(memoryview(buffer)[:count])
+        return count
+
+def content_key(sha256_hex):
+    """Object key for a content address, fanned out so no directory grows huge"""
+    return f"sha256/{sha256_hex[:2]}/{sha256_hex[2:4]}/{sha256_hex}"
+
+def _object_exists(key):
+    try:
+        object_store.head_object(Bucket=BUCKET, Key=key)
+        return True
+    except NoSuchKey:
+        return False
+
+def _store_object(fileobj):
+    """
+    Stream an upload into the object store under its content address.
+    The bytes go to a temporary key while being hashed, then move to their
+    content address; if that address already holds the same bytes the new
+    copy is dropped, so re-uploads of a document cost no extra storage.
+    Returns (sha256, size); raises UploadTooLarge past the size limit.
+    """
+    reader = HashingReader(fileobj, DOCUMENT_SETTINGS["max_upload_mb"] * 1024 * 1024)
+    incoming = f"incoming/{uuid.uuid4().hex}"
+    try:
+        object_store.put_object(Bucket=BUCKET, Key=incoming, Body=reader)
+        digest = reader.sha256.hexdigest()
+        key = content_key(digest)
+        if not _object_exists(key):
+            object_store.copy_object(Bucket=BUCKET, Key=key, CopySource={'Bucket': BUCKET, 'Key': incoming})
+    finally:
+        object_store.delete_object(Bucket=BUCKET, Key=incoming)
+    return digest, reader.size
+
+def _queue_processing(document_id):
+    # Previews first: they are quick and lawyers see them as soon as they open the case
+    enqueue_job(document_id, 'preview')
+    enqueue_job(document_id, 'extract')
+
+def store_document(fileobj, filename, content_type, uploaded_by, case_id=None, message_id=None):
+    """Stream an upload into the object store and record it; returns (success, message)"""
+    try:
+        digest, size = _store_object(fileobj)
+    except UploadTooLarge as e:
+        return False, f"❌ {e}."
+    except Exception as e:
+        return False, f"❌ Error storing document: {e}"
+
+    try:
+        document = execute_query(
+            """INSERT INTO documents (sha256, size_bytes, filename, content_type, case_id, message_id, uploaded_by)
+               VALUES (%s, %s, %s, %s, %s, %s, %s)
+               RETURNING id""",
+            (digest, size, os.path.basename(filename)[:255], content_type, case_id, message_id, uploaded_by),
+            fetch='one'
+        )
+    except Exception as e:
+        return False, f"❌ Error saving document: {e}"
+    if not document:
+        return False, "❌ Error saving document."
+    _queue_processing(document[0])
+    return True, f"✅ Uploaded {filename}."
+
+def send_attachment(fileobj, filename, content_type, sender_id, receiver_id, text):
+    """
+    Store a message attachment, then send the message and record the
+    document in one statement, so an upload that fails never leaves a sent
+    message without its file. Returns (success, message).
+    """
+    try:
+        digest, size = _store_object(fileobj)
+    except UploadTooLarge as e:
+        return False, f"❌ {e}."
+    except Exception as e:
+        return False, f"❌ Error storing document: {e}"
+
+    try:
+        document = execute_query(
+            """WITH sent AS (
+                   INSERT INTO direct_messages (sender_id, receiver_id, message, sent_at, read_at)
+                   VALUES (%s, %s, %s, NOW(), NULL)
+                   RETURNING id
+               )
+               INSERT INTO documents (sha256, size_bytes, filename, content_type, message_id, uploaded_by)
+               SELECT %s, %s, %s, %s, sent.id, %s FROM sent
+               RETURNING id""",
+            (sender_id, receiver_id, text, digest, size, os.path.basename(filename)[:255], content_type, sender_id),
+            fetch='one'
+        )
+    except Exception as e:
+        return False, f"❌ Error sending attachment: {e}"
+    if not document:
+        return False, "❌ Error sending attachment."
+    _queue_processing(document[0])
+    return True, f"✅ Sent {filename}."
+
+def enqueue_job(document_id, kind):
+    """Queue background work on a document (see services/document_jobs.py); re-queues a finished job"""
+    try:
+        execute_query(
+            """INSERT INTO document_jobs (document_id, kind) VALUES (%s, %s)
+               ON CONFLICT (document_id, kind)
+               DO UPDATE SET status = 'pending', attempts = 0, error = NULL, finished_at = NULL""",
+            (document_id, kind)
+        )
+    except Exception as e:
+        st.error(f"Error queueing document processing: {e}")
+
+def get_case_documents(case_id):
+    """Documents attached to a case, newest first"""
+    try:
+        documents = execute_query(
+            f"SELECT {_DOCUMENT_COLUMNS} FROM {_DOCUMENT_JOIN} WHERE d.case_id = %s ORDER BY d.created_at DESC",
+            (case_id,),
+            fetch='records'
+        )
+        return documents or []
+    except Exception as e:
+        st.error(f"Error fetching documents: {e}")
+        return []
+
+def get_message_attachments(message_ids):
+    """Attachments for a page of messages: {message_id: [documents]}"""
+    if not message_ids:
+        return {}
+    try:
+        documents = execute_query(
+            f"SELECT d.message_id, {_DOCUMENT_COLUMNS} FROM {_DOCUMENT_JOIN} WHERE d.message_id = ANY(%s) ORDER BY d.id",
+            (list(message_ids),),
+            fetch='records'
+        )
+    except Exception as e:
+        st.error(f"Error fetching attachments: {e}")
+        return {}
+    attachments = {}
+    for document in documents or []:
+        attachments.setdefault(document.message_id, []).append(document)
+    return attachments
+
+def search_lawyer_documents(lawyer_user_id, query, limit=20):
+    """
+    Full-text search inside the documents of a lawyer's cases.
+    Matches English stems and exact words in any script; the snippet marks
+    hits with HIGHLIGHT_START/HIGHLIGHT_STOP so the page can escape the
+    document text before styling them.
+    """
+    if not query.strip():
+        return []
+    try:
+        results = execute_query(
+            """WITH q AS (
+                   SELECT websearch_to_tsquery('english', %s) || websearch_to_tsquery('simple', %s) AS query
+               )
+               SELECT d.id, d.filename, d.content_type, d.size_bytes, d.sha256, d.language,
+                      c.id AS case_id, c.title AS case_title,
+                      ts_headline('simple', left(d.extracted_text, 100000), q.query, %s) AS snippet
+               FROM documents d
+               JOIN cases c ON c.id = d.case_id
+               JOIN lawyers l ON l.id = c.lawyer_id
+               CROSS JOIN q
+               WHERE l.user_id = %s AND d.search_vector @@ q.query
+               ORDER BY ts_rank(d.search_vector, q.query) DESC, d.created_at DESC
+               LIMIT %s""",
+            (query, query, _HEADLINE_OPTIONS, lawyer_user_id, limit),
+            fetch='records'
+        )
+        return results or []
+    except Exception as e:
+        st.error(f"Error searching documents: {e}")
+        return []
+
+def open_document(document, byte_range=None):
+    """Open a document's bytes as a stream; byte_range is an HTTP Range header value"""
+    return object_store.get_object(Bucket=BUCKET, Key=content_key(document.sha256), Range=byte_range)
+
+def read_document(document):
+    """Whole document as bytes, for st.download_button; only for small files"""
+    with open_document(document)['Body'] as body:
+        return body.read()
+
+def _download_port():
+    port = os.environ.get(DOCUMENT_SETTINGS["download_port_env"])
+    return int(port) if port else None
+
+def download_base_url():
+    """Public URL of the download server, or None if it isn't running"""
+    port = _download_port()
+    if not port:
+        return None
+    base_url = os.environ.get(DOCUMENT_SETTINGS["download_base_url_env"]) or f"http://localhost:{port}"
+    return base_url.rstrip('/')
+
+def download_url(document):
+    """Signed, expiring link to the download server, or None if it isn't running"""
+    base_url = download_base_url()
+    if not base_url:
+        return None
+    expires, signature = sign_link(document.id, signing_secret(), DOCUMENT_SETTINGS["link_ttl_minutes"] * 60)
+    return f"{base_url}/documents/{document.id}?expires={expires}&sig={signature}"
+
+def _resolve_download(path, query):
+    """Map a signed /documents/<id> request to its object, for the download server"""
+    parts = path.strip("/").split("/")
+    if len(parts) != 2 or parts[0] != "documents" or not parts[1].isdigit():
+        return None
+    document_id = int(parts[1])
+    if not verify_link(document_id, query.get("expires"), query.get("sig"), signing_secret()):
+        return None
+    document = execute_query(
+        "SELECT sha256, filename, content_type FROM documents WHERE id = %s",
+        (document_id,),
+        fetch='one'
+    )
+    if not document:
+        return None
+    sha256, filename, content_type = document
+    return content_key(sha256), filename, content_type
+
+def start_download_endpoint():
+    """Serve signed document links with Range support, and calendar feeds, when DOCUMENT_PORT is set"""
+    from services.calendar_service import generate_calendar_download
+    try:
+        port = _download_port()
+        if port:
+            start_download_server(object_store, BUCKET, _resolve_download, port, generate=generate_calendar_download)
+    except (OSError, ValueError) as e:
+        st.warning(f"Document download server not started: {e}")
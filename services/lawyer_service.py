@@ -1,18 +1,32 @@
 import streamlit as st
-import pandas as pd
-from database.db_manager import execute_query, get_pg_connection
-
-def get_lawyers(specialization_filter=None, location_filter=None, fee_filter=None):
-    """Get filtered list of lawyers with better error handling"""
+from database.db_manager import execute_query
+from database.projection import Projection
+
+# Fields callers can ask for; queries join lawyers l to users u
+LAWYER = Projection("lawyer", {
+    'id': "l.id", 'user_id': "l.user_id", 'name': "l.name", 'email': "l.email", 'phone': "l.phone",
+    'specialization': "l.specialization", 'experience': "l.experience", 'location': "l.location",
+    'rating': "l.rating", 'fee_range': "l.fee_range", 'languages': "l.languages",
+    'verified': "l.verified", 'created_at': "l.created_at",
+    'username': "u.username", 'user_email': "u.email", 'user_created_at': "u.created_at",
+})
+
+# Default field sets, for callers that don't declare their own
+LAWYER_CARD_FIELDS = ("id", "user_id", "name", "email", "phone", "specialization", "experience",
+                      "location", "rating", "fee_range", "languages", "username", "user_created_at")
+LAWYER_ADMIN_FIELDS = ("id", "user_id", "name", "email", "phone", "specialization", "experience",
+                       "location", "verified", "created_at", "username", "user_email")
+
+def _first_record(query, params):
+    records = execute_query(query, params, fetch='records')
+    return records[0] if records else None
+
+def get_lawyers(specialization_filter=None, location_filter=None, fee_filter=None, fields=LAWYER_CARD_FIELDS):
+    """Get filtered list of verified lawyers as named-tuple records of the given fields"""
     try:
-        conn = get_pg_connection()
-        if conn is None:
-            st.error("Unable to connect to database")
-            return pd.DataFrame()
-
         # Base query - ensure we get verified lawyers
-        query = """
-            SELECT l.*, u.username, u.created_at as user_created_at
+        query = f"""
+            SELECT {LAWYER.select_list(fields)}
             FROM lawyers l
             JOIN users u ON l.user_id = u.id
             WHERE l.verified = %s
@@ -30,49 +44,52 @@ def get_lawyers(specialization_filter=None, location_filter=None, fee_filter=Non
 
         if fee_filter and fee_filter != "All":
             # Parse fee filter and add condition
-            fee_conditions = parse_fee_filter(fee_filter)
-            if fee_conditions:
-                query += f" AND ({fee_conditions})"
+            fee_patterns = parse_fee_filter(fee_filter)
+            if fee_patterns:
+                query += " AND l.fee_range ILIKE ANY(%s)"
+                params.append(fee_patterns)
 
         # Order by rating and experience
         query += " ORDER BY l.rating DESC, l.experience DESC"
 
-        lawyers_df = pd.read_sql_query(query, conn, params=params)
-        conn.close()
+        lawyers = execute_query(query, params, fetch='records')
+        if lawyers is None:
+            st.error("Unable to load lawyers from database")
+            return []
 
         # Debug info
-        st.sidebar.info(f"Debug: Found {len(lawyers_df)} lawyers in database")
+        st.sidebar.info(f"Debug: Found {len(lawyers)} lawyers in database")
 
-        return lawyers_df
+        return lawyers
 
     except Exception as e:
         st.error(f"Error loading lawyers: {e}")
         st.sidebar.error(f"SQL Error Details: {str(e)}")
-        return pd.DataFrame()
+        return []
 
 def parse_fee_filter(fee_filter):
-    """Parse fee filter into SQL condition"""
+    """Map a fee filter to ILIKE patterns for fee_range (passed as parameters,
+    since a literal % in a parameterised query breaks psycopg2 formatting)"""
     if fee_filter == "₹0-500":
-        return "l.fee_range ILIKE '%0-500%' OR l.fee_range ILIKE '%under 500%'"
+        return ['%0-500%', '%under 500%']
     elif fee_filter == "₹500-1500":
-        return "l.fee_range ILIKE '%500-1500%' OR l.fee_range ILIKE '%500-1000%'"
+        return ['%500-1500%', '%500-1000%']
     elif fee_filter == "₹1500-3000":
-        return "l.fee_range ILIKE '%1500-3000%' OR l.fee_range ILIKE '%2000-3000%'"
+        return ['%1500-3000%', '%2000-3000%']
     elif fee_filter == "₹3000+":
-        return "l.fee_range ILIKE '%3000%' OR l.fee_range ILIKE '%above 3000%'"
+        return ['%3000%', '%above 3000%']
     return None
 
-def get_lawyer_profile(user_id):
-    """Get lawyer profile by user_id with enhanced data"""
+def get_lawyer_profile(user_id, fields=LAWYER_CARD_FIELDS):
+    """Get a lawyer's profile by user_id as a record of the given fields, or None"""
     try:
-        profile = execute_query(
-            """SELECT l.*, u.username, u.email as user_email, u.created_at
+        return _first_record(
+            f"""SELECT {LAWYER.select_list(fields)}
                FROM lawyers l
                JOIN users u ON l.user_id = u.id
                WHERE l.user_id = %s""",
-            (user_id,), fetch='one'
+            (user_id,)
         )
-        return profile
     except Exception as e:
         st.error(f"Error loading lawyer profile: {e}")
         return None
@@ -112,17 +129,16 @@ def update_lawyer_profile(user_id, name, email, phone, specialization, experienc
     except Exception as e:
         return False, f"Error updating profile: {e}"
 
-def get_lawyer_by_id(lawyer_id):
-    """Get lawyer details by lawyer table ID with user info"""
+def get_lawyer_by_id(lawyer_id, fields=LAWYER_CARD_FIELDS):
+    """Get lawyer details by lawyer table ID as a record of the given fields, or None"""
     try:
-        lawyer = execute_query(
-            """SELECT l.*, u.username, u.email as user_email
+        return _first_record(
+            f"""SELECT {LAWYER.select_list(fields)}
                FROM lawyers l
                JOIN users u ON l.user_id = u.id
                WHERE l.id = %s""",
-            (lawyer_id,), fetch='one'
+            (lawyer_id,)
         )
-        return lawyer
     except Exception as e:
         st.error(f"Error fetching lawyer details: {e}")
         return None
@@ -139,11 +155,11 @@ def get_lawyer_user_id(lawyer_id):
         st.error(f"Error getting lawyer user ID: {e}")
         return None
 
-def search_lawyers(search_term, filters=None):
-    """Enhanced search with better query"""
+def search_lawyers(search_term, filters=None, fields=LAWYER_CARD_FIELDS):
+    """Search verified lawyers by name, specialization or location; records of the given fields"""
     try:
-        query = """
-            SELECT l.*, u.username
+        query = f"""
+            SELECT {LAWYER.select_list(fields)}
             FROM lawyers l
             JOIN users u ON l.user_id = u.id
             WHERE l.verified = true
@@ -162,7 +178,7 @@ def search_lawyers(search_term, filters=None):
 
         query += " ORDER BY l.rating DESC, l.experience DESC"
 
-        lawyers = execute_query(query, params, fetch='all')
+        lawyers = execute_query(query, params, fetch='records')
         return lawyers if lawyers else []
     except Exception as e:
         st.error(f"Error searching lawyers: {e}")
@@ -179,15 +195,15 @@ def verify_lawyer_profile(user_id):
     except Exception as e:
         return False, f"Error verifying profile: {e}"
 
-def get_all_lawyers_for_admin():
-    """Get all lawyers for admin verification"""
+def get_all_lawyers_for_admin(fields=LAWYER_ADMIN_FIELDS):
+    """Get all lawyers for admin verification as records of the given fields"""
     try:
         lawyers = execute_query(
-            """SELECT l.*, u.username, u.email as user_email
+            f"""SELECT {LAWYER.select_list(fields)}
                FROM lawyers l
                JOIN users u ON l.user_id = u.id
                ORDER BY l.created_at DESC""",
-            fetch='all'
+            fetch='records'
         )
         return lawyers if lawyers else []
     except Exception as e:
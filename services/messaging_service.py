@@ -1,16 +1,19 @@
 import streamlit as st
 from database.db_manager import execute_query
+from database.prepared import execute_prepared
 from datetime import datetime
 
 def send_message(sender_id, receiver_id, message):
-    """Send a direct message between users with better error handling"""
+    """Send a direct message between users; returns the new message id, or False"""
     try:
-        execute_query(
+        sent = execute_query(
             """INSERT INTO direct_messages (sender_id, receiver_id, message, sent_at, read_at)
-               VALUES (%s, %s, %s, NOW(), NULL)""",
-            (sender_id, receiver_id, message)
+               VALUES (%s, %s, %s, NOW(), NULL)
+               RETURNING id""",
+            (sender_id, receiver_id, message),
+            fetch='one'
         )
-        return True
+        return sent[0] if sent else False
     except Exception as e:
         st.error(f"Error sending message: {e}")
         return False
@@ -18,7 +21,7 @@ def send_message(sender_id, receiver_id, message):
 def get_unread_message_count(user_id):
     """Get count of unread messages for a user"""
     try:
-        count = execute_query(
+        count = execute_prepared(
             "SELECT COUNT(*) FROM direct_messages WHERE receiver_id = %s AND read_at IS NULL",
             (user_id,),
             fetch='one'
@@ -31,8 +34,8 @@ def get_unread_message_count(user_id):
 def get_messages(user1_id, user2_id, limit=50):
     """Get all messages between two users with pagination"""
     try:
-        messages = execute_query(
-            """SELECT sender_id, receiver_id, message, sent_at, read_at
+        messages = execute_prepared(
+            """SELECT id, sender_id, receiver_id, message, sent_at, read_at
                FROM direct_messages
                WHERE (sender_id = %s AND receiver_id = %s)
                   OR (sender_id = %s AND receiver_id = %s)
@@ -86,7 +89,7 @@ def get_user_conversations(user_id):
 def mark_messages_as_read(sender_id, receiver_id):
     """Mark messages as read"""
     try:
-        execute_query(
+        execute_prepared(
             """UPDATE direct_messages
                SET read_at = NOW()
                WHERE sender_id = %s AND receiver_id = %s AND read_at IS NULL""",
@@ -97,64 +100,6 @@ def mark_messages_as_read(sender_id, receiver_id):
         st.error(f"Error marking messages as read: {e}")
         return False
 
-def create_appointment_request(client_id, lawyer_id, appointment_date, appointment_time,
-                             appointment_type, meeting_method, duration, notes=""):
-    """Create an appointment request"""
-    try:
-        execute_query(
-            """INSERT INTO appointments (client_id, lawyer_id, appointment_date,
-               appointment_time, appointment_type, meeting_method, duration,
-               notes, status, created_at)
-               VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, NOW())""",
-            (client_id, lawyer_id, appointment_date, appointment_time,
-             appointment_type, meeting_method, duration, notes, 'pending')
-        )
-        return True
-    except Exception as e:
-        st.error(f"Error creating appointment: {e}")
-        return False
-
-def get_user_appointments(user_id, user_type):
-    """Get appointments for a user (client or lawyer)"""
-    try:
-        if user_type == 'lawyer':
-            appointments = execute_query(
-                """SELECT a.*, u.username as client_name, u.email as client_email
-                   FROM appointments a
-                   JOIN users u ON a.client_id = u.id
-                   WHERE a.lawyer_id = (SELECT id FROM lawyers WHERE user_id = %s)
-                   ORDER BY a.appointment_date DESC, a.appointment_time DESC""",
-                (user_id,), fetch='all'
-            )
-        else:
-            appointments = execute_query(
-                """SELECT a.*, l.name as lawyer_name, l.email as lawyer_email
-                   FROM appointments a
-                   JOIN lawyers l ON a.lawyer_id = l.id
-                   WHERE a.client_id = %s
-                   ORDER BY a.appointment_date DESC, a.appointment_time DESC""",
-                (user_id,), fetch='all'
-            )
-
-        return appointments if appointments else []
-    except Exception as e:
-        st.error(f"Error fetching appointments: {e}")
-        return []
-
-def update_appointment_status(appointment_id, status, notes=""):
-    """Update appointment status"""
-    try:
-        execute_query(
-            """UPDATE appointments
-               SET status = %s, response_notes = %s, updated_at = NOW()
-               WHERE id = %s""",
-            (status, notes, appointment_id)
-        )
-        return True
-    except Exception as e:
-        st.error(f"Error updating appointment: {e}")
-        return False
-
 def search_message_history(user1_id, user2_id, search_term):
     """Search through message history"""
     try:
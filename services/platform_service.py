@@ -0,0 +1,62 @@
+import streamlit as st
+from config.settings import PLATFORM_COUNTER_SETTINGS
+from database.db_manager import execute_query
+
+# Counter name -> query computing it
+COUNTER_QUERIES = {
+    'registered_lawyers': "SELECT COUNT(*) FROM lawyers",
+    'cases_resolved': "SELECT COUNT(*) FROM cases WHERE status = 'Closed'",
+    'users_helped': "SELECT COUNT(*) FROM (SELECT user_id FROM cases UNION SELECT user_id FROM consultations) helped",
+}
+
+def refresh_platform_counters():
+    """
+    Recompute every counter in one round-trip. The COUNT queries only run
+    once the transaction-level advisory lock is taken, so concurrent
+    refreshes from other processes skip the work instead of repeating it.
+    """
+    counts = " UNION ALL ".join(
+        f"SELECT '{name}' AS name, ({query}) AS value" for name, query in COUNTER_QUERIES.items()
+    )
+    # PL/pgSQL decides before the counts run; a WHERE on the lock in the same
+    # query leaves the planner free to compute them first
+    execute_query(
+        f"""DO $$
+            BEGIN
+                IF pg_try_advisory_xact_lock(%s) THEN
+                    INSERT INTO platform_counters (name, value, updated_at)
+                    SELECT counts.name, counts.value, NOW() FROM ({counts}) counts
+                    ON CONFLICT (name) DO UPDATE SET value = EXCLUDED.value, updated_at = EXCLUDED.updated_at;
+                END IF;
+            END
+            $$""",
+        (PLATFORM_COUNTER_SETTINGS["lock_id"],)
+    )
+
+def _read_counters():
+    """{name: (value, stale)}, judging staleness by the database clock that stamped them"""
+    rows = execute_query(
+        """SELECT name, value, updated_at < NOW() - %s * INTERVAL '1 second'
+           FROM platform_counters""",
+        (PLATFORM_COUNTER_SETTINGS["refresh_seconds"],),
+        fetch='all'
+    )
+    return {name: (value, stale) for name, value, stale in rows or []}
+
+@st.cache_data(ttl=PLATFORM_COUNTER_SETTINGS["cache_ttl_seconds"], show_spinner=False)
+def get_platform_counters():
+    """
+    Platform totals as {name: value}, shared by every session in the process
+    for the cache TTL. The counters table is recomputed when it is missing a
+    counter or older than refresh_seconds, so the COUNT queries run a few
+    times an hour rather than on every home-page view.
+    """
+    try:
+        counters = _read_counters()
+        if set(counters) != set(COUNTER_QUERIES) or any(stale for _, stale in counters.values()):
+            refresh_platform_counters()
+            counters = _read_counters()
+        return {name: value for name, (value, _) in counters.items()}
+    except Exception as e:
+        st.error(f"Error loading platform statistics: {e}")
+        return {}
@@ -0,0 +1,52 @@
+import mimetypes
+import os
+import tempfile
+from config.settings import DOCUMENT_PIPELINE_SETTINGS, PREVIEW_SETTINGS
+from services.document_service import BUCKET, content_key, object_store
+from utils.preview_cache import PreviewCache
+from utils.thumbnails import can_preview, make_thumbnail
+
+preview_cache = PreviewCache(PREVIEW_SETTINGS["cache_root"], PREVIEW_SETTINGS["max_cache_mb"] * 1024 * 1024)
+
+def preview_key(sha256):
+    """Cache key: the content address plus the preview size, so a size change starts afresh"""
+    return f"{sha256}-{PREVIEW_SETTINGS['thumbnail_px']}"
+
+def generate_preview(sha256, filename, content_type):
+    """Render a document's first-page thumbnail into the cache; returns the JPEG bytes or None"""
+    with tempfile.NamedTemporaryFile(suffix=os.path.splitext(filename)[1]) as local:
+        object_store.download_fileobj(Bucket=BUCKET, Key=content_key(sha256), Fileobj=local)
+        local.flush()
+        data = make_thumbnail(
+            local.name, content_type, PREVIEW_SETTINGS["thumbnail_px"], DOCUMENT_PIPELINE_SETTINGS["min_text_chars"]
+        )
+    if data:
+        preview_cache.put(preview_key(sha256), data)
+    return data
+
+def get_preview(document):
+    """
+    A document's thumbnail as JPEG bytes, from the cache or generated on
+    first request if the background worker hasn't made it yet. None for
+    documents without a preview.
+    """
+    cached = preview_cache.get(preview_key(document.sha256))
+    if cached is not None:
+        return cached
+
+    content_type = document.content_type or mimetypes.guess_type(document.filename)[0]
+    if (not can_preview(content_type) or document.preview_status == 'failed'
+            or document.size_bytes > PREVIEW_SETTINGS["max_source_mb"] * 1024 * 1024):
+        return None
+    try:
+        return generate_preview(document.sha256, document.filename, content_type)
+    except Exception:
+        return None  # A broken preview shouldn't break the page; the job records why
+
+def preview_document(document, throttle):
+    """document_jobs handler: precompute the preview of a new upload; returns pages rendered"""
+    content_type = document.content_type or mimetypes.guess_type(document.filename)[0]
+    if not can_preview(content_type) or preview_cache.get(preview_key(document.sha256)) is not None:
+        return 0
+    throttle.wait()
+    return 1 if generate_preview(document.sha256, document.filename, content_type) else 0
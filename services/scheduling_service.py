@@ -0,0 +1,162 @@
+import threading
+import time as clock
+from datetime import datetime, timedelta, time
+import psycopg2
+import psycopg2.errors
+import streamlit as st
+from database.db_manager import execute_query
+from config.settings import SCHEDULING_SETTINGS
+from utils.intervals import BookedIntervals, find_free_slots
+
+# lawyer_id -> (loaded_at, BookedIntervals)
+_interval_cache = {}
+_cache_lock = threading.Lock()
+
+def _setting_time(key):
+    """Parse an HH:MM scheduling setting into a time"""
+    hour, minute = map(int, SCHEDULING_SETTINGS[key].split(':'))
+    return time(hour, minute)
+
+def parse_duration_minutes(duration):
+    """Convert labels like '30 minutes' or '1.5 hours' into minutes"""
+    if isinstance(duration, (int, float)):
+        return int(duration)
+    try:
+        amount, unit = str(duration).split()[:2]
+        minutes = float(amount) * (60 if unit.startswith('hour') else 1)
+        return int(minutes)
+    except (ValueError, TypeError):
+        return SCHEDULING_SETTINGS["default_duration_minutes"]
+
+def load_booked_intervals(lawyer_id, window_start, window_end):
+    """Load a lawyer's non-cancelled bookings and imported busy blocks overlapping the window"""
+    rows = execute_query(
+        """SELECT consultation_date,
+                  consultation_date + COALESCE(duration_minutes, %s) * INTERVAL '1 minute'
+           FROM consultations
+           WHERE lawyer_id = %s
+             AND status IS DISTINCT FROM 'Cancelled'
+             AND consultation_date < %s
+             AND consultation_date + COALESCE(duration_minutes, %s) * INTERVAL '1 minute' > %s
+           UNION ALL
+           SELECT starts_at, ends_at
+           FROM lawyer_busy_blocks
+           WHERE lawyer_id = %s AND starts_at < %s AND ends_at > %s""",
+        (SCHEDULING_SETTINGS["default_duration_minutes"], lawyer_id, window_end,
+         SCHEDULING_SETTINGS["default_duration_minutes"], window_start,
+         lawyer_id, window_end, window_start),
+        fetch='all'
+    )
+    return BookedIntervals(rows or [])
+
+def get_booked_intervals(lawyer_id):
+    """Return the cached interval index for a lawyer, reloading when stale"""
+    with _cache_lock:
+        cached = _interval_cache.get(lawyer_id)
+    if cached and clock.monotonic() - cached[0] < SCHEDULING_SETTINGS["cache_ttl_seconds"]:
+        return cached[1]
+
+    now = datetime.now()
+    intervals = load_booked_intervals(
+        lawyer_id,
+        now - timedelta(days=1),
+        now + timedelta(days=SCHEDULING_SETTINGS["horizon_days"] + 1)
+    )
+    with _cache_lock:
+        _interval_cache[lawyer_id] = (clock.monotonic(), intervals)
+    return intervals
+
+def invalidate_booked_intervals(lawyer_id=None):
+    """Drop cached intervals for one lawyer, or for everyone"""
+    with _cache_lock:
+        if lawyer_id is None:
+            _interval_cache.clear()
+        else:
+            _interval_cache.pop(lawyer_id, None)
+
+def get_free_slots(lawyer_id, duration_minutes=None, count=10, start=None):
+    """Get the next free consultation slots for a lawyer (lawyers.id)"""
+    try:
+        duration = timedelta(minutes=duration_minutes or SCHEDULING_SETTINGS["default_duration_minutes"])
+        start = max(start or datetime.now(), datetime.now())
+        return find_free_slots(
+            get_booked_intervals(lawyer_id),
+            start,
+            duration,
+            count,
+            _setting_time("day_start"),
+            _setting_time("day_end"),
+            timedelta(minutes=SCHEDULING_SETTINGS["slot_step_minutes"]),
+            break_start=_setting_time("break_start"),
+            break_end=_setting_time("break_end"),
+            working_days=set(SCHEDULING_SETTINGS["working_days"]),
+            horizon=timedelta(days=SCHEDULING_SETTINGS["horizon_days"])
+        )
+    except Exception as e:
+        st.error(f"Error finding free slots: {e}")
+        return []
+
+def get_free_slots_on(lawyer_id, day, duration_minutes=None):
+    """Get every free slot for a lawyer on a given date"""
+    slots_per_day = 24 * 60 // SCHEDULING_SETTINGS["slot_step_minutes"]
+    slots = get_free_slots(lawyer_id, duration_minutes, slots_per_day,
+                           start=datetime.combine(day, time.min))
+    return [slot for slot in slots if slot.date() == day]
+
+def book_consultation(client_id, lawyer_id, consultation_datetime, fee_amount, notes,
+                      duration_minutes=None, appointment_id=None, response_notes=""):
+    """
+    Book a consultation, rejecting overlaps with the lawyer's other bookings.
+    The consultations_no_overlap exclusion constraint makes the check atomic;
+    the in-memory index only short-circuits obvious conflicts. With an
+    appointment_id, the same statement confirms that pending request, so
+    the request and the booking never disagree.
+    """
+    duration_minutes = duration_minutes or SCHEDULING_SETTINGS["default_duration_minutes"]
+    consultation_end = consultation_datetime + timedelta(minutes=duration_minutes)
+
+    if get_booked_intervals(lawyer_id).overlaps(consultation_datetime, consultation_end):
+        return False, "❌ This time slot is no longer available. Please pick another slot."
+
+    insert = """
+        INSERT INTO consultations (user_id, lawyer_id, consultation_type, status,
+                                 scheduled_at, consultation_date, duration_minutes,
+                                 fee_amount, notes)
+    """
+    values = (client_id, lawyer_id, 'Scheduled', 'Pending', consultation_datetime,
+              consultation_datetime, duration_minutes, fee_amount, notes)
+    if appointment_id is None:
+        query = insert + "VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s) RETURNING id"
+        params = values
+    else:
+        # Nothing is inserted unless the request was still pending
+        query = """
+            WITH claimed AS (
+                UPDATE appointments
+                SET status = 'confirmed', response_notes = %s, updated_at = NOW()
+                WHERE id = %s AND status = 'pending'
+                RETURNING id
+            )
+        """ + insert + "SELECT %s, %s, %s, %s, %s, %s, %s, %s, %s FROM claimed RETURNING id"
+        params = (response_notes, appointment_id) + values
+
+    try:
+        consultation_id = execute_query(query, params, fetch='one')
+    except psycopg2.errors.ExclusionViolation:
+        invalidate_booked_intervals(lawyer_id)
+        return False, "❌ This time slot was just booked by someone else. Please pick another slot."
+
+    if not consultation_id and appointment_id is not None:
+        return False, "❌ Appointment request not found or already handled."
+    if not consultation_id:
+        return False, "❌ Failed to schedule consultation"
+
+    # Copy-on-write so concurrent slot searches never see a half-applied insert
+    with _cache_lock:
+        cached = _interval_cache.get(lawyer_id)
+        if cached:
+            updated = BookedIntervals(zip(cached[1].starts, cached[1].ends))
+            updated.add(consultation_datetime, consultation_end)
+            _interval_cache[lawyer_id] = (cached[0], updated)
+
+    return True, f"✅ Consultation scheduled successfully (ID: {consultation_id[0]})"
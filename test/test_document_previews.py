@@ -0,0 +1,37 @@
+import io
+from PIL import Image
+from streamlit.testing.v1 import AppTest
+from config.settings import DOCUMENT_SETTINGS
+from database.records import record_type
+from services import preview_service
+from utils.preview_cache import PreviewCache
+
+Document = record_type(("id", "filename", "size_bytes", "sha256", "content_type", "extraction_status",
+                        "page_count", "language", "preview_status"))
+
+def preview_page():
+    import streamlit as st
+    from components.documents import render_document_previews
+
+    render_document_previews(st.session_state.documents, "test")
+
+def jpeg():
+    buffer = io.BytesIO()
+    Image.new("RGB", (8, 8), "navy").save(buffer, "JPEG")
+    return buffer.getvalue()
+
+def test_cached_preview_renders(tmp_path, monkeypatch):
+    cache = PreviewCache(str(tmp_path), 1024 * 1024)
+    sha256 = "ab" * 32
+    cache.put(preview_service.preview_key(sha256), jpeg())
+    monkeypatch.setattr(preview_service, "preview_cache", cache)
+    monkeypatch.delenv(DOCUMENT_SETTINGS["download_port_env"], raising=False)
+
+    app = AppTest.from_function(preview_page)
+    app.session_state.documents = [
+        Document(1, "deed.pdf", 2048, sha256, "application/pdf", "done", 1, None, "done")
+    ]
+    app.run()
+
+    assert not app.exception
+    assert len(app.get("imgs")) == 1
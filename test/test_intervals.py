@@ -0,0 +1,61 @@
+from datetime import datetime, time, timedelta
+from utils.intervals import BookedIntervals, find_free_slots, round_up
+
+DAY = datetime(2030, 1, 7)  # A Monday
+
+def at(hour, minute=0, days=0):
+    return DAY + timedelta(days=days, hours=hour, minutes=minute)
+
+def slots(booked, start, count=5, duration=30, **options):
+    settings = {'day_start': time(9), 'day_end': time(18), 'step': timedelta(minutes=30)}
+    settings.update(options)
+    return find_free_slots(booked, start, timedelta(minutes=duration), count, **settings)
+
+def test_merges_overlapping_and_touching_bookings():
+    booked = BookedIntervals([(at(11), at(12)), (at(9), at(10)), (at(10), at(10, 30)), (at(9, 15), at(9, 45))])
+    assert booked.starts == [at(9), at(11)]
+    assert booked.ends == [at(10, 30), at(12)]
+
+def test_overlaps_is_half_open():
+    booked = BookedIntervals([(at(10), at(11))])
+    assert booked.overlaps(at(10, 30), at(10, 45))
+    assert booked.overlaps(at(9, 30), at(10, 1))
+    assert not booked.overlaps(at(9), at(10))
+    assert not booked.overlaps(at(11), at(12))
+
+def test_add_merges_neighbours():
+    booked = BookedIntervals([(at(9), at(10)), (at(11), at(12)), (at(14), at(15))])
+    booked.add(at(10), at(11))
+    assert list(zip(booked.starts, booked.ends)) == [(at(9), at(12)), (at(14), at(15))]
+    booked.add(at(16), at(17))
+    assert len(booked) == 3
+
+def test_blocking_end():
+    booked = BookedIntervals([(at(10), at(11)), (at(11, 30), at(12))])
+    assert booked.blocking_end(at(10, 30), at(11)) == at(11)
+    assert booked.blocking_end(at(11), at(11, 45)) == at(12)
+    assert booked.blocking_end(at(11), at(11, 30)) is None
+
+def test_round_up():
+    step = timedelta(minutes=30)
+    assert round_up(at(9, 10), step) == at(9, 30)
+    assert round_up(at(9, 30), step) == at(9, 30)
+
+def test_free_slots_skip_bookings():
+    booked = BookedIntervals([(at(9, 30), at(10, 30))])
+    assert slots(booked, at(9), count=3) == [at(9), at(10, 30), at(11)]
+
+def test_free_slots_skip_break_and_end_of_day():
+    found = slots(BookedIntervals(), at(12), count=4, duration=60,
+                  break_start=time(13), break_end=time(14), day_end=time(15, 30))
+    # 12:30 would run into the break; 14:30 ends exactly at closing, 15:00 after it
+    assert found == [at(12), at(14), at(14, 30), at(9, days=1)]
+
+def test_free_slots_skip_non_working_days():
+    saturday = at(17, 30, days=5)
+    found = slots(BookedIntervals(), saturday, count=1, working_days=[0, 1, 2, 3, 4])
+    assert found == [at(9, days=7)]
+
+def test_free_slots_stop_at_horizon():
+    booked = BookedIntervals([(at(0), at(0, days=30))])
+    assert slots(booked, at(9), horizon=timedelta(days=10)) == []
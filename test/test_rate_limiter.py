@@ -0,0 +1,72 @@
+import pytest
+from utils.rate_limiter import TokenBucketLimiter, client_address
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+def test_burst_then_rejects_with_retry_after():
+    clock = FakeClock()
+    limiter = TokenBucketLimiter(3, 0.5, clock=clock)
+    assert [limiter.acquire("a")[0] for _ in range(3)] == [True, True, True]
+    allowed, retry_after = limiter.acquire("a")
+    assert not allowed
+    assert retry_after == pytest.approx(2.0)
+
+def test_refills_over_time_up_to_capacity():
+    clock = FakeClock()
+    limiter = TokenBucketLimiter(2, 1.0, clock=clock)
+    limiter.acquire("a")
+    limiter.acquire("a")
+    clock.now += 1
+    assert limiter.acquire("a")[0]
+    assert not limiter.acquire("a")[0]
+
+    clock.now += 3600  # Idle for an hour: back to capacity, no more
+    assert [limiter.acquire("a")[0] for _ in range(3)] == [True, True, False]
+
+def test_keys_are_independent():
+    limiter = TokenBucketLimiter(1, 0.001, clock=FakeClock())
+    assert limiter.acquire("a")[0]
+    assert not limiter.acquire("a")[0]
+    assert limiter.acquire("b")[0]
+
+def test_reset_refills_key():
+    limiter = TokenBucketLimiter(1, 0.001, clock=FakeClock())
+    limiter.acquire("a")
+    limiter.reset("a")
+    assert limiter.acquire("a")[0]
+    limiter.reset("missing")  # No error for an unknown key
+
+def test_evicts_least_recently_used():
+    limiter = TokenBucketLimiter(1, 0.001, max_keys=2, clock=FakeClock())
+    limiter.acquire("a")
+    limiter.acquire("b")
+    limiter.acquire("a")  # Touch "a", so "b" is the oldest
+    limiter.acquire("c")
+    assert limiter.metrics() == {'keys': 2, 'allowed': 3, 'rejected': 1, 'evicted': 1}
+    assert limiter.acquire("b")[0]  # Forgotten, so it starts full again
+    assert not limiter.acquire("c")[0]
+
+def test_client_address_without_trusted_proxies_ignores_header():
+    assert client_address("203.0.113.5", "198.51.100.7", []) == "203.0.113.5"
+
+def test_client_address_walks_past_trusted_proxies():
+    trusted = ["10.0.0.0/8"]
+    assert client_address("10.0.0.2", "198.51.100.7", trusted) == "198.51.100.7"
+    assert client_address("10.0.0.2", "198.51.100.7, 10.0.0.9", trusted) == "198.51.100.7"
+    # Entries left of the first untrusted hop are chosen by the client
+    assert client_address("10.0.0.2", "6.6.6.6, 198.51.100.7", trusted) == "198.51.100.7"
+
+def test_client_address_from_untrusted_peer_ignores_header():
+    assert client_address("198.51.100.7", "6.6.6.6", ["10.0.0.0/8"]) == "198.51.100.7"
+
+def test_client_address_edge_cases():
+    trusted = ["10.0.0.1", "2001:db8::/32"]
+    assert client_address("10.0.0.1", None, trusted) == "10.0.0.1"
+    assert client_address("2001:db8::1", "203.0.113.5", trusted) == "203.0.113.5"
+    assert client_address(None, "203.0.113.5", trusted) is None
+    assert client_address("10.0.0.1", "not-an-ip, 10.0.0.1", trusted) == "not-an-ip"
@@ -0,0 +1,49 @@
+from utils.session_tokens import decode_token, issue_token, sign_link, verify_link
+
+SECRET = b"s" * 32
+NOW = 1_800_000_000
+IDENTITY = {'user_id': 7, 'user_type': "Lawyer", 'lawyer_id': 3, 'name': "Asha", 'session_id': "ab" * 16}
+
+def test_token_round_trip():
+    token = issue_token(IDENTITY, SECRET, 60, now=NOW)
+    identity = decode_token(token, SECRET, now=NOW + 30)
+    assert identity == {**IDENTITY, 'expires_at': NOW + 60}
+
+def test_token_expires():
+    token = issue_token(IDENTITY, SECRET, 60, now=NOW)
+    assert decode_token(token, SECRET, now=NOW + 60) is not None
+    assert decode_token(token, SECRET, now=NOW + 61) is None
+
+def test_token_rejects_other_secret():
+    token = issue_token(IDENTITY, SECRET, 60, now=NOW)
+    assert decode_token(token, b"t" * 32, now=NOW) is None
+
+def test_token_rejects_tampered_payload():
+    payload, signature = issue_token(IDENTITY, SECRET, 60, now=NOW).split(".")
+    other_payload = issue_token({**IDENTITY, 'user_id': 8}, SECRET, 60, now=NOW).split(".")[0]
+    assert decode_token(f"{other_payload}.{signature}", SECRET, now=NOW) is None
+    assert decode_token(f"{payload}.{signature}x", SECRET, now=NOW) is None
+
+def test_token_rejects_malformed():
+    for token in (None, "", "abc", "a.b.c", "!!!.???"):
+        assert decode_token(token, SECRET, now=NOW) is None
+
+def test_token_needs_user_id():
+    token = issue_token({**IDENTITY, 'user_id': None}, SECRET, 60, now=NOW)
+    assert decode_token(token, SECRET, now=NOW) is None
+
+def test_link_round_trip_and_expiry():
+    expires, signature = sign_link(42, SECRET, 900, now=NOW)
+    assert verify_link(42, expires, signature, SECRET, now=NOW + 900)
+    assert verify_link("42", str(expires), signature, SECRET, now=NOW)  # As read from a query string
+    assert not verify_link(42, expires, signature, SECRET, now=NOW + 901)
+
+def test_link_bound_to_resource_and_expiry():
+    expires, signature = sign_link("calendar/5/", SECRET, 900, now=NOW)
+    assert not verify_link("calendar/6/", expires, signature, SECRET, now=NOW)
+    assert not verify_link("calendar/5/", expires + 3600, signature, SECRET, now=NOW)
+    assert not verify_link("calendar/5/", expires, signature, b"t" * 32, now=NOW)
+
+def test_link_rejects_malformed():
+    assert not verify_link(42, None, None, SECRET, now=NOW)
+    assert not verify_link(42, "soon", "abc", SECRET, now=NOW)
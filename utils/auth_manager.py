@@ -1,65 +1,267 @@
-import hashlib
+import threading
+from functools import lru_cache
 import streamlit as st
+from concurrent.futures import ThreadPoolExecutor
+from streamlit.runtime.scriptrunner import get_script_run_ctx
 from database.db_manager import execute_query
+from database.prepared import execute_prepared
+from config.settings import PASSWORD_HASH_SETTINGS, RATE_LIMIT_SETTINGS
+from utils import passwords
+from utils.rate_limiter import TokenBucketLimiter, client_address
+from utils.session_manager import start_user_session
+
+# Bounded pool for CPU-heavy hashing. scrypt releases the GIL, so other
+# sessions' script threads keep running while a login is being verified.
+_hash_pool = ThreadPoolExecutor(
+    max_workers=PASSWORD_HASH_SETTINGS["verify_workers"],
+    thread_name_prefix="password-hash"
+)
+
+@lru_cache(maxsize=1)
+def _dummy_hash():
+    """
+    Verified against when the username does not exist, so unknown users cost
+    the same time as wrong passwords. Hashed on first use, not at import.
+    """
+    return passwords.hash_password(
+        "dummy-password", PASSWORD_HASH_SETTINGS["n"], PASSWORD_HASH_SETTINGS["r"], PASSWORD_HASH_SETTINGS["p"]
+    )
 
 def hash_password(password):
-    """Hash password using SHA256"""
-    return hashlib.sha256(password.encode()).hexdigest()
+    """Hash password using salted scrypt"""
+    return passwords.hash_password(
+        password,
+        PASSWORD_HASH_SETTINGS["n"],
+        PASSWORD_HASH_SETTINGS["r"],
+        PASSWORD_HASH_SETTINGS["p"],
+        PASSWORD_HASH_SETTINGS["salt_bytes"],
+        PASSWORD_HASH_SETTINGS["key_bytes"]
+    )
+
+def verify_password(password, stored_password):
+    """Verify a password on the hashing pool; returns (matches, needs_rehash)"""
+    future = _hash_pool.submit(
+        passwords.verify_password, password, stored_password,
+        PASSWORD_HASH_SETTINGS["n"], PASSWORD_HASH_SETTINGS["r"], PASSWORD_HASH_SETTINGS["p"]
+    )
+    return future.result(timeout=PASSWORD_HASH_SETTINGS["verify_timeout_seconds"])
+
+_login_limiters = {
+    'username': TokenBucketLimiter(
+        RATE_LIMIT_SETTINGS["username_capacity"],
+        1 / RATE_LIMIT_SETTINGS["username_refill_seconds"],
+        RATE_LIMIT_SETTINGS["max_tracked_keys"]
+    ),
+    'client_username': TokenBucketLimiter(
+        RATE_LIMIT_SETTINGS["client_username_capacity"],
+        1 / RATE_LIMIT_SETTINGS["client_username_refill_seconds"],
+        RATE_LIMIT_SETTINGS["max_tracked_keys"]
+    ),
+    'client': TokenBucketLimiter(
+        RATE_LIMIT_SETTINGS["client_capacity"],
+        1 / RATE_LIMIT_SETTINGS["client_refill_seconds"],
+        RATE_LIMIT_SETTINGS["max_tracked_keys"]
+    )
+}
+
+# Outcomes of shared (PostgreSQL) bucket checks made by this process
+_shared_metrics = {'allowed': 0, 'rejected': 0, 'errors': 0}
+_shared_metrics_lock = threading.Lock()
+
+def get_client_key():
+    """Identify the caller by IP address, seen past any trusted proxy, falling back to the browser session"""
+    ip_address = client_address(
+        getattr(st.context, "ip_address", None),
+        st.context.headers.get("X-Forwarded-For"),
+        RATE_LIMIT_SETTINGS["trusted_proxies"]
+    )
+    if ip_address:
+        return f"ip:{ip_address}"
+    ctx = get_script_run_ctx()
+    return f"session:{ctx.session_id}" if ctx else "session:unknown"
+
+def _acquire_shared_token(scope, key):
+    """Spend a token from a PostgreSQL bucket in one round-trip"""
+    capacity = RATE_LIMIT_SETTINGS[f"{scope}_capacity"]
+    rate = 1 / RATE_LIMIT_SETTINGS[f"{scope}_refill_seconds"]
+
+    # Refill from the elapsed time, then spend a token only if one is available.
+    # SET expressions all see the old row, so `allowed` matches the new `tokens`.
+    refilled = """LEAST(%(capacity)s, b.tokens
+                   + EXTRACT(EPOCH FROM clock_timestamp() - b.updated_at) * %(rate)s)"""
+    result = execute_query(
+        f"""INSERT INTO login_rate_limits AS b (bucket_key, tokens, allowed, updated_at)
+            VALUES (%(key)s, %(capacity)s - 1, TRUE, clock_timestamp())
+            ON CONFLICT (bucket_key) DO UPDATE SET
+                tokens = CASE WHEN {refilled} >= 1 THEN {refilled} - 1 ELSE {refilled} END,
+                allowed = {refilled} >= 1,
+                updated_at = clock_timestamp()
+            RETURNING allowed, tokens""",
+        {'capacity': capacity, 'rate': rate, 'key': f"{scope}:{key}"[:300]},
+        fetch='one'
+    )
+
+    with _shared_metrics_lock:
+        if not result:
+            # Fail open: a database outage must not lock everyone out
+            _shared_metrics['errors'] += 1
+            return True, 0.0
+        _shared_metrics['allowed' if result[0] else 'rejected'] += 1
+        attempts = sum(_shared_metrics.values())
+
+    if attempts % RATE_LIMIT_SETTINGS["shared_cleanup_every"] == 0:
+        # Idle buckets have refilled completely, so dropping them changes nothing
+        execute_query(
+            "DELETE FROM login_rate_limits WHERE updated_at < NOW() - INTERVAL '1 day'"
+        )
+
+    return result[0], 0.0 if result[0] else (1 - result[1]) / rate
+
+def _client_username_key(username, client_key):
+    return f"{(username or '').strip().lower()}|{client_key}"
+
+def check_login_rate_limit(username):
+    """
+    Spend one login attempt for this client, for this username from it, and
+    for this username from anywhere. The per-username bucket is larger, so
+    guesses spread over many addresses are throttled without one client
+    locking the owner out. Returns (allowed, retry_after_seconds).
+    """
+    client_key = get_client_key()
+    attempts = (
+        ('client', client_key),
+        ('client_username', _client_username_key(username, client_key)),
+        ('username', (username or '').strip().lower()),
+    )
+    for scope, key in attempts:
+        if RATE_LIMIT_SETTINGS["backend"] == "shared":
+            allowed, retry_after = _acquire_shared_token(scope, key)
+        else:
+            allowed, retry_after = _login_limiters[scope].acquire(key)
+        if not allowed:
+            return False, retry_after
+    return True, 0.0
+
+def reset_login_rate_limit(username):
+    """
+    Refill this client's bucket for a username after it logs in. The
+    client's own bucket and the username's global one are kept.
+    """
+    key = _client_username_key(username, get_client_key())
+    if RATE_LIMIT_SETTINGS["backend"] == "shared":
+        execute_query("DELETE FROM login_rate_limits WHERE bucket_key = %s", (f"client_username:{key}"[:300],))
+    else:
+        _login_limiters['client_username'].reset(key)
+
+def get_rate_limit_metrics():
+    """Get login throttling counters for this process"""
+    metrics = {scope: limiter.metrics() for scope, limiter in _login_limiters.items()}
+    with _shared_metrics_lock:
+        metrics['shared'] = dict(_shared_metrics)
+    return metrics
+
+def _rehash_password(user_id, password, old_hash):
+    """Upgrade a legacy or outdated hash; skipped if the password changed meanwhile"""
+    execute_query(
+        "UPDATE users SET password = %s WHERE id = %s AND password = %s",
+        (hash_password(password), user_id, old_hash)
+    )
 
 def authenticate_user(username, password):
-    """Authenticate user with debugging information"""
+    """
+    Authenticate user, transparently upgrading legacy password hashes.
+    Returns (user_id, user_type, username, lawyer_id) or None.
+    """
     try:
-        user_check = execute_query(
-            "SELECT id, username, password, user_type FROM users WHERE LOWER(username) = LOWER(%s)",
+        user_check = execute_prepared(
+            """SELECT u.id, u.username, u.password, u.user_type, l.id
+               FROM users u
+               LEFT JOIN lawyers l ON l.user_id = u.id
+               WHERE LOWER(u.username) = LOWER(%s)
+               LIMIT 1""",
             (username,),
             fetch='one'
         )
 
         if not user_check:
+            verify_password(password, _dummy_hash())
             return None
 
         stored_password = user_check[2]
-        hashed_input = hash_password(password)
+        matches, needs_rehash = verify_password(password, stored_password)
 
-        if stored_password == hashed_input:
-            return (user_check[0], user_check[3])
-        else:
+        if not matches:
             return None
 
+        if needs_rehash:
+            # Runs on the pool so the login itself is not delayed
+            _hash_pool.submit(_rehash_password, user_check[0], password, stored_password)
+
+        return (user_check[0], user_check[3], user_check[1], user_check[4])
+
     except Exception as e:
         st.error(f"Authentication error: {e}")
         return None
 
+def login_user(username, password):
+    """Throttle, authenticate and start a session; returns (success, message)"""
+    allowed, retry_after = check_login_rate_limit(username)
+    if not allowed:
+        return False, f"⏳ Too many login attempts. Please try again in {int(retry_after) + 1} seconds."
+
+    result = authenticate_user(username, password)
+    if not result:
+        return False, "❌ Invalid credentials. Please try again."
+
+    user_id, user_type, canonical_username, lawyer_id = result
+    reset_login_rate_limit(username)
+    start_user_session(user_id, user_type, canonical_username, lawyer_id)
+    return True, "✅ Login successful! Redirecting..."
+
 def register_user(username, password, email, phone, location, language, user_type):
-    """Register a new user with proper error handling"""
+    """Register a new user in a single round-trip"""
     try:
-        existing_user = execute_query(
-            "SELECT id FROM users WHERE username = %s",
-            (username,),
-            fetch='one'
+        hashed_password = _hash_pool.submit(hash_password, password).result(
+            timeout=PASSWORD_HASH_SETTINGS["verify_timeout_seconds"]
         )
 
-        if existing_user:
-            return False, "Username already exists. Please choose a different username."
-
-        existing_email = execute_query(
-            "SELECT id FROM users WHERE email = %s",
-            (email,),
+        # Duplicate checks and the insert share one statement; ON CONFLICT
+        # covers a concurrent registration of the same username
+        result = execute_query(
+            """WITH existing AS (
+                   SELECT COALESCE(BOOL_OR(username = %(username)s), FALSE) AS username_taken,
+                          COALESCE(BOOL_OR(email = %(email)s), FALSE) AS email_taken
+                   FROM users
+                   WHERE username = %(username)s OR email = %(email)s
+               ), inserted AS (
+                   INSERT INTO users (username, password, email, phone, location, language, user_type)
+                   SELECT %(username)s, %(password)s, %(email)s, %(phone)s, %(location)s, %(language)s, %(user_type)s
+                   FROM existing
+                   WHERE NOT existing.username_taken AND NOT existing.email_taken
+                   ON CONFLICT (username) DO NOTHING
+                   RETURNING id
+               )
+               SELECT (SELECT id FROM inserted), username_taken, email_taken FROM existing""",
+            {
+                'username': username, 'password': hashed_password, 'email': email,
+                'phone': phone, 'location': location, 'language': language,
+                'user_type': user_type
+            },
             fetch='one'
         )
 
-        if existing_email:
-            return False, "Email already registered. Please use a different email."
+        if not result:
+            return False, "Registration failed: database unavailable."
 
-        hashed_password = hash_password(password)
+        new_user_id, username_taken, email_taken = result
 
-        execute_query(
-            """INSERT INTO users (username, password, email, phone, location, language, user_type)
-               VALUES (%s, %s, %s, %s, %s, %s, %s)""",
-            (username, hashed_password, email, phone, location, language, user_type)
-        )
+        if new_user_id:
+            return True, "Registration successful!"
+
+        if email_taken and not username_taken:
+            return False, "Email already registered. Please use a different email."
 
-        return True, "Registration successful!"
+        return False, "Username already exists. Please choose a different username."
 
     except Exception as e:
         return False, f"Registration failed: {str(e)}"
@@ -0,0 +1,176 @@
+"""Build the Legal Awareness content bundle from the per-language article sources.
+
+Usage: python -m utils.awareness_bundle [--source assets/awareness]
+       [--output assets/awareness/bundle.json.gz]
+
+Run at deploy time. Each <Language>.json source holds that language's
+articles with bodies in a small Markdown subset (### headings, - and 1.
+lists, **bold**, blank-line paragraphs). The bundle stores every article
+already rendered to HTML plus a search index, gzipped, so the app only
+has to decompress it once per process.
+"""
+import argparse
+import glob
+import gzip
+import html
+import json
+import os
+import re
+import unicodedata
+
+FALLBACK_LANGUAGE = "English"
+# Index weights: a hit in the title or keywords ranks above one in the text
+TITLE_WEIGHT, BODY_WEIGHT = 3, 1
+
+_BOLD = re.compile(r"\*\*(.+?)\*\*")
+_NUMBERED = re.compile(r"^\d+\.\s+")
+
+def tokenize(text):
+    """
+    Lowercased words: runs of letters, combining marks and digits, so
+    Indic vowel signs stay inside their words. The page's search script
+    splits queries the same way (/[\\p{L}\\p{M}\\p{N}]+/gu).
+    """
+    words = []
+    current = []
+    for char in text.lower():
+        if unicodedata.category(char)[0] in "LMN":
+            current.append(char)
+        elif current:
+            words.append("".join(current))
+            current = []
+    if current:
+        words.append("".join(current))
+    return words
+
+def _inline(text):
+    return _BOLD.sub(r"<strong>\1</strong>", html.escape(text))
+
+def render_markdown(text):
+    """Render the article Markdown subset to HTML"""
+    parts = []
+    list_tag = None
+    paragraph = []
+
+    def close_blocks():
+        nonlocal list_tag
+        if paragraph:
+            parts.append(f"<p>{_inline(' '.join(paragraph))}</p>")
+            paragraph.clear()
+        if list_tag:
+            parts.append(f"</{list_tag}>")
+            list_tag = None
+
+    for line in text.splitlines():
+        line = line.strip()
+        if line.startswith("- ") or _NUMBERED.match(line):
+            tag = "ul" if line.startswith("- ") else "ol"
+            if paragraph or list_tag != tag:
+                close_blocks()
+                parts.append(f"<{tag}>")
+                list_tag = tag
+            item = line[2:] if tag == "ul" else _NUMBERED.sub("", line)
+            parts.append(f"<li>{_inline(item)}</li>")
+        elif line.startswith("#"):
+            close_blocks()
+            level = min(len(line) - len(line.lstrip("#")), 6)
+            parts.append(f"<h{level}>{_inline(line.lstrip('#').strip())}</h{level}>")
+        elif line:
+            if list_tag:
+                close_blocks()
+            paragraph.append(line)
+        else:
+            close_blocks()
+    close_blocks()
+    return "".join(parts)
+
+def build_index(articles):
+    """{word: [[article position, weight], ...]} over titles, keywords and bodies"""
+    index = {}
+    for position, article in enumerate(articles):
+        weights = {}
+        for word in tokenize(article['body']) + tokenize(article['summary']):
+            weights[word] = BODY_WEIGHT
+        for word in tokenize(article['title'] + " " + " ".join(article['keywords'])):
+            weights[word] = TITLE_WEIGHT
+        for word, weight in weights.items():
+            index.setdefault(word, []).append([position, weight])
+    return index
+
+def _language_entry(source, fallback=None):
+    """Render one language, filling articles it lacks from the fallback language"""
+    translated = {article['slug']: article for article in source['articles']}
+    order = [article['slug'] for article in (fallback or source)['articles']]
+    order += [slug for slug in translated if slug not in order]
+
+    articles = []
+    for slug in order:
+        article = translated.get(slug)
+        language = source['language']
+        if article is None:
+            article = next(item for item in fallback['articles'] if item['slug'] == slug)
+            language = fallback['language']
+        articles.append({
+            'slug': slug,
+            'icon': article.get('icon', "📄"),
+            'title': article['title'],
+            'keywords': article.get('keywords', []),
+            'summary': article['summary'],
+            'body': article['body'],
+            'html': render_markdown(article['body']),
+            'language': language,
+        })
+
+    entry = {
+        'labels': {**(fallback or {}).get('labels', {}), **source.get('labels', {})},
+        'fallback_response': source.get('fallback_response') or fallback['fallback_response'],
+        'articles': articles,
+        'index': build_index(articles),
+    }
+    for article in articles:
+        del article['body']  # Only needed for the index; pages use the HTML
+    return entry
+
+def build_bundle(source_dir):
+    """{language: {labels, fallback_response, articles, index}} from every <Language>.json"""
+    sources = {}
+    for path in sorted(glob.glob(os.path.join(source_dir, "*.json"))):
+        with open(path, encoding="utf-8") as handle:
+            source = json.load(handle)
+        sources[source['language']] = source
+
+    fallback = sources[FALLBACK_LANGUAGE]
+    return {
+        language: _language_entry(source, None if language == FALLBACK_LANGUAGE else fallback)
+        for language, source in sources.items()
+    }
+
+def write_bundle(bundle, path):
+    data = json.dumps(bundle, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    with gzip.open(path, "wb", compresslevel=9) as handle:
+        handle.write(data)
+    return len(data), os.path.getsize(path)
+
+def read_bundle(path):
+    with gzip.open(path, "rb") as handle:
+        return json.loads(handle.read())
+
+def sources_newer_than(source_dir, path):
+    """Whether any article source changed after the bundle was built"""
+    built = os.path.getmtime(path)
+    return any(os.path.getmtime(source) > built for source in glob.glob(os.path.join(source_dir, "*.json")))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--source", default="assets/awareness")
+    parser.add_argument("--output", default="assets/awareness/bundle.json.gz")
+    args = parser.parse_args()
+
+    bundle = build_bundle(args.source)
+    raw, compressed = write_bundle(bundle, args.output)
+    articles = sum(len(entry['articles']) for entry in bundle.values())
+    print(f"{len(bundle)} languages, {articles} articles: {raw / 1024:.1f} KiB JSON, "
+          f"{compressed / 1024:.1f} KiB gzipped -> {args.output}")
+
+if __name__ == "__main__":
+    main()
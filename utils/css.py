@@ -0,0 +1,19 @@
+import re
+
+_COMMENTS = re.compile(r"/\*.*?\*/", re.DOTALL)
+_WHITESPACE = re.compile(r"\s+")
+# Spaces around these never matter; around ":" they can in selectors, so only after it
+_PUNCTUATION = re.compile(r"\s*([{}();,>])\s*")
+_AFTER_COLON = re.compile(r":\s+")
+
+def minify_css(css):
+    """Strip comments and insignificant whitespace from a stylesheet"""
+    css = _COMMENTS.sub("", css)
+    css = _WHITESPACE.sub(" ", css)
+    css = _PUNCTUATION.sub(r"\1", css)
+    css = _AFTER_COLON.sub(":", css)
+    return css.replace(";}", "}").strip()
+
+def class_slug(value):
+    """'In Progress' -> 'in-progress', for class names derived from data values"""
+    return re.sub(r"[^a-z0-9]+", "-", str(value).lower()).strip("-")
@@ -0,0 +1,103 @@
+import bisect
+from datetime import datetime, timedelta
+
+class BookedIntervals:
+    """Sorted, non-overlapping booked intervals for a single lawyer.
+
+    Overlapping or touching bookings are merged on insert, so both the start
+    and end lists stay sorted and every lookup is a binary search.
+    """
+
+    __slots__ = ('starts', 'ends')
+
+    def __init__(self, intervals=()):
+        self.starts = []
+        self.ends = []
+        for start, end in sorted(intervals):
+            if self.ends and start <= self.ends[-1]:
+                if end > self.ends[-1]:
+                    self.ends[-1] = end
+            else:
+                self.starts.append(start)
+                self.ends.append(end)
+
+    def __len__(self):
+        return len(self.starts)
+
+    def overlaps(self, start, end):
+        """Return True if [start, end) intersects any booked interval"""
+        i = bisect.bisect_right(self.starts, start)
+        if i > 0 and self.ends[i - 1] > start:
+            return True
+        return i < len(self.starts) and self.starts[i] < end
+
+    def add(self, start, end):
+        """Insert a booking, merging it with any neighbours it touches"""
+        lo = bisect.bisect_left(self.ends, start)
+        hi = bisect.bisect_right(self.starts, end)
+        if lo < hi:
+            start = min(start, self.starts[lo])
+            end = max(end, self.ends[hi - 1])
+        self.starts[lo:hi] = [start]
+        self.ends[lo:hi] = [end]
+
+    def blocking_end(self, start, end):
+        """Return the end of the first interval blocking [start, end), or None"""
+        i = bisect.bisect_right(self.starts, start)
+        if i > 0 and self.ends[i - 1] > start:
+            return self.ends[i - 1]
+        if i < len(self.starts) and self.starts[i] < end:
+            return self.ends[i]
+        return None
+
+def round_up(moment, step):
+    """Round a datetime up to the next multiple of step since midnight"""
+    midnight = datetime.combine(moment.date(), datetime.min.time())
+    remainder = (moment - midnight) % step
+    return moment if not remainder else moment + (step - remainder)
+
+def find_free_slots(booked, start, duration, count, day_start, day_end,
+                    step, break_start=None, break_end=None, working_days=None,
+                    horizon=None):
+    """Return the next `count` free slot start times of length `duration`.
+
+    `day_start`, `day_end`, `break_start` and `break_end` are `time` values
+    bounding the working day; `working_days` holds weekday numbers (Monday
+    is 0). Every iteration either yields a slot or jumps past a booking, a
+    break or a day boundary, so the cost is O(count + skipped) binary searches.
+    """
+    slots = []
+    limit = start + (horizon or timedelta(days=60))
+    cursor = round_up(start, step)
+
+    while len(slots) < count and cursor < limit:
+        day = cursor.date()
+        opens = datetime.combine(day, day_start)
+        closes = datetime.combine(day, day_end)
+
+        if working_days is not None and day.weekday() not in working_days or cursor + duration > closes:
+            cursor = datetime.combine(day + timedelta(days=1), day_start)
+            continue
+
+        if cursor < opens:
+            cursor = opens
+            continue
+
+        slot_end = cursor + duration
+
+        if break_start and break_end:
+            paused = datetime.combine(day, break_start)
+            resumes = datetime.combine(day, break_end)
+            if cursor < resumes and slot_end > paused:
+                cursor = round_up(resumes, step)
+                continue
+
+        blocked_until = booked.blocking_end(cursor, slot_end)
+        if blocked_until is not None:
+            cursor = round_up(blocked_until, step)
+            continue
+
+        slots.append(cursor)
+        cursor += step
+
+    return slots
@@ -0,0 +1,272 @@
+import hashlib
+import os
+import re
+import shutil
+import threading
+import uuid
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, quote, urlsplit
+
+# Characters allowed in object keys; "/" separates directories on disk
+_KEY = re.compile(r"^[A-Za-z0-9!_.*'()/-]+$")
+_RANGE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+class NoSuchKey(KeyError):
+    """The requested object does not exist"""
+
+class InvalidRange(ValueError):
+    """The requested byte range lies outside the object"""
+
+def parse_range(header, size):
+    """
+    Parse a single HTTP/S3 byte range ("bytes=0-99", "bytes=100-",
+    "bytes=-500") against an object size. Returns inclusive (start, end).
+    """
+    match = _RANGE.match(header.strip()) if header else None
+    if not match or match.groups() == ("", ""):
+        raise InvalidRange(f"Unsupported range: {header!r}")
+    first, last = match.groups()
+    if first == "":
+        start, end = max(size - int(last), 0), size - 1
+    else:
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        raise InvalidRange(f"Range {header!r} not satisfiable for {size} bytes")
+    return start, end
+
+class StreamingBody:
+    """Read-only view of `length` bytes of an open file, like botocore's StreamingBody"""
+
+    def __init__(self, handle, length):
+        self._handle = handle
+        self._remaining = length
+
+    def read(self, size=-1):
+        if size is None or size < 0 or size > self._remaining:
+            size = self._remaining
+        data = self._handle.read(size)
+        self._remaining -= len(data)
+        return data
+
+    def iter_chunks(self, chunk_size=1024 * 1024):
+        while self._remaining:
+            chunk = self.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+
+    def close(self):
+        self._handle.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+class FileSystemObjectStore:
+    """
+    Object store on the local filesystem with the call shapes of an S3
+    client (put_object, get_object, head_object, download_fileobj,
+    copy_object, delete_object), so a boto3 client can stand in for it unchanged.
+    Each bucket is a directory under `root`; writes go to a temporary file
+    first and are renamed into place, so readers never see partial objects.
+    """
+
+    def __init__(self, root, chunk_size=1024 * 1024):
+        self.root = os.path.abspath(root)
+        self.chunk_size = chunk_size
+
+    def _path(self, bucket, key):
+        if not _KEY.match(key) or ".." in key.split("/") or key.startswith("/"):
+            raise ValueError(f"Invalid object key: {key!r}")
+        return os.path.join(self.root, bucket, *key.split("/"))
+
+    def _temp_path(self, bucket):
+        directory = os.path.join(self.root, bucket, ".incoming")
+        os.makedirs(directory, exist_ok=True)
+        return os.path.join(directory, uuid.uuid4().hex)
+
+    def _head(self, path, key):
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            raise NoSuchKey(key) from None
+        return {
+            'ContentLength': stat.st_size,
+            'LastModified': datetime.fromtimestamp(stat.st_mtime, timezone.utc),
+        }
+
+    def put_object(self, Bucket, Key, Body):
+        """
+        Store bytes or a readable file object. File objects are copied
+        chunk by chunk, using readinto() with one reused buffer when the
+        source supports it.
+        """
+        path = self._path(Bucket, Key)
+        temp = self._temp_path(Bucket)
+        digest = hashlib.md5(usedforsecurity=False)
+        size = 0
+        try:
+            with open(temp, "wb") as out:
+                if isinstance(Body, (bytes, bytearray, memoryview)):
+                    out.write(Body)
+                    digest.update(Body)
+                    size = len(Body)
+                elif hasattr(Body, "readinto"):
+                    buffer = bytearray(self.chunk_size)
+                    view = memoryview(buffer)
+                    while True:
+                        count = Body.readinto(buffer)
+                        if not count:
+                            break
+                        out.write(view[:count])
+                        digest.update(view[:count])
+                        size += count
+                else:
+                    for chunk in iter(lambda: Body.read(self.chunk_size), b""):
+                        out.write(chunk)
+                        digest.update(chunk)
+                        size += len(chunk)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            os.replace(temp, path)
+        except BaseException:
+            if os.path.exists(temp):
+                os.remove(temp)
+            raise
+        return {'ETag': f'"{digest.hexdigest()}"', 'ContentLength': size}
+
+    def head_object(self, Bucket, Key):
+        return self._head(self._path(Bucket, Key), Key)
+
+    def get_object(self, Bucket, Key, Range=None):
+        """Open an object (or an inclusive byte range of it) as a StreamingBody"""
+        path = self._path(Bucket, Key)
+        head = self._head(path, Key)
+        size = head['ContentLength']
+        start, end = parse_range(Range, size) if Range else (0, size - 1)
+
+        handle = open(path, "rb")
+        handle.seek(start)
+        response = dict(head, Body=StreamingBody(handle, end - start + 1), ContentLength=end - start + 1)
+        if Range:
+            response['ContentRange'] = f"bytes {start}-{end}/{size}"
+        return response
+
+    def download_fileobj(self, Bucket, Key, Fileobj):
+        """Copy an object into a writable file object, one chunk at a time"""
+        with self.get_object(Bucket=Bucket, Key=Key)['Body'] as body:
+            for chunk in body.iter_chunks(self.chunk_size):
+                Fileobj.write(chunk)
+
+    def copy_object(self, Bucket, Key, CopySource):
+        """Copy CopySource {'Bucket', 'Key'} to Key; a hard link when possible"""
+        source = self._path(CopySource['Bucket'], CopySource['Key'])
+        self._head(source, CopySource['Key'])
+        path = self._path(Bucket, Key)
+        temp = self._temp_path(Bucket)
+        try:
+            os.link(source, temp)
+        except OSError:
+            shutil.copyfile(source, temp)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        os.replace(temp, path)
+        return {}
+
+    def delete_object(self, Bucket, Key):
+        try:
+            os.remove(self._path(Bucket, Key))
+        except FileNotFoundError:
+            pass  # S3 deletes are idempotent too
+        return {}
+
+_server = None
+_server_lock = threading.Lock()
+
+def start_download_server(store, bucket, resolve, port, host="0.0.0.0", generate=None):
+    """
+    Serve objects over HTTP with Range support from a daemon thread.
+    resolve(path, query) maps a request to (key, filename, content_type),
+    or None to answer 404; query is a dict of single values. generate, if
+    given, is tried first and maps a request to (filename, content_type,
+    chunks) for content produced while it is sent, or None. Safe to call
+    on every rerun; only the first call binds the port.
+    """
+    global _server
+    with _server_lock:
+        if _server is not None:
+            return _server
+
+        class DownloadHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                url = urlsplit(self.path)
+                query = {name: values[0] for name, values in parse_qs(url.query).items()}
+                generated = generate(url.path, query) if generate else None
+                if generated is not None:
+                    self.send_generated(*generated)
+                    return
+                target = resolve(url.path, query)
+                if target is None:
+                    self.send_error(404)
+                    return
+                key, filename, content_type = target
+                try:
+                    response = store.get_object(Bucket=bucket, Key=key, Range=self.headers.get("Range"))
+                except NoSuchKey:
+                    self.send_error(404)
+                    return
+                except InvalidRange:
+                    size = store.head_object(Bucket=bucket, Key=key)['ContentLength']
+                    self.send_response(416)
+                    self.send_header("Content-Range", f"bytes */{size}")
+                    self.end_headers()
+                    return
+
+                with response['Body'] as body:
+                    self.send_response(206 if 'ContentRange' in response else 200)
+                    self.send_header("Content-Type", content_type or "application/octet-stream")
+                    self.send_header("Content-Length", str(response['ContentLength']))
+                    self.send_header("Accept-Ranges", "bytes")
+                    self.send_header("Content-Disposition", f"attachment; filename*=UTF-8''{quote(filename)}")
+                    if 'ContentRange' in response:
+                        self.send_header("Content-Range", response['ContentRange'])
+                    self.end_headers()
+                    try:
+                        for chunk in body.iter_chunks(store.chunk_size):
+                            self.wfile.write(chunk)
+                    except (BrokenPipeError, ConnectionResetError):
+                        pass  # Client gave up or will resume with a Range request
+
+            def send_generated(self, filename, content_type, chunks):
+                """Write str or bytes chunks in store.chunk_size writes; the length isn't known, so the connection closes at the end"""
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Disposition", f"attachment; filename*=UTF-8''{quote(filename)}")
+                self.end_headers()
+                buffer, buffered = [], 0
+                try:
+                    for chunk in chunks:
+                        if isinstance(chunk, str):
+                            chunk = chunk.encode("utf-8")
+                        buffer.append(chunk)
+                        buffered += len(chunk)
+                        if buffered >= store.chunk_size:
+                            self.wfile.write(b"".join(buffer))
+                            buffer, buffered = [], 0
+                    self.wfile.write(b"".join(buffer))
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+                finally:
+                    close = getattr(chunks, "close", None)
+                    if close:
+                        close()  # Ends the query behind a generator the client stopped reading
+
+            def log_message(self, format, *args):
+                pass
+
+        _server = ThreadingHTTPServer((host, port), DownloadHandler)
+        _server.daemon_threads = True
+        threading.Thread(target=_server.serve_forever, name="download-server", daemon=True).start()
+        return _server
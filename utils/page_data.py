@@ -0,0 +1,66 @@
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+import streamlit as st
+from config.settings import PAGE_DATA_SETTINGS
+from database.db_manager import collect_errors, statement_deadline
+from database.instrumentation import attach_trace, current_trace
+
+# Shared by every session in this process
+_pool = ThreadPoolExecutor(max_workers=PAGE_DATA_SETTINGS["max_workers"], thread_name_prefix="page-data")
+
+def _run_loader(loader, trace, deadline):
+    """
+    Run one loader on a pool thread; returns (result, error messages).
+    The thread has no script context, so nothing here may write to the
+    page: errors from execute_query and services go to the returned list.
+    """
+    errors = []
+    attach_trace(trace)
+    try:
+        with statement_deadline(deadline), collect_errors(errors):
+            return loader(), errors
+    finally:
+        # Pool threads are reused by other sessions; don't leave this one's trace behind
+        attach_trace(None)
+
+def fetch_all(loaders, defaults=None, timeout=None):
+    """
+    Run a page's independent data loaders concurrently.
+    loaders: {name: zero-argument callable}; returns {name: result}, so the
+    page waits for the slowest loader instead of the sum of all of them.
+
+    A loader that raises, or hasn't finished after `timeout` seconds, gets
+    its value from `defaults` (None if absent) and a warning is shown.
+    Loaders still queued are cancelled; running ones have their queries
+    cancelled by PostgreSQL at the same deadline. Loaders run without the
+    page's script context and must not call st; errors they report through
+    report_error are shown here, from the script thread.
+    """
+    defaults = defaults or {}
+    timeout = PAGE_DATA_SETTINGS["timeout_seconds"] if timeout is None else timeout
+    deadline = time.monotonic() + timeout
+    trace = current_trace()
+
+    futures = {
+        name: _pool.submit(_run_loader, loader, trace, deadline)
+        for name, loader in loaders.items()
+    }
+    wait(futures.values(), timeout=timeout)
+
+    results = {}
+    errors = []
+    failed = []
+    for name, future in futures.items():
+        if future.done() and not future.cancelled() and future.exception() is None:
+            results[name], loader_errors = future.result()
+            errors.extend(loader_errors)
+            continue
+        future.cancel()
+        failed.append(name)
+        results[name] = defaults.get(name)
+
+    for message in dict.fromkeys(errors):
+        st.error(message)
+    if failed:
+        st.warning(f"⚠️ Some information could not be loaded in time ({', '.join(failed)}). Please refresh.")
+    return results
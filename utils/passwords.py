@@ -0,0 +1,56 @@
+import base64
+import hashlib
+import hmac
+import os
+
+SCRYPT_PREFIX = "scrypt"
+
+def _b64encode(raw):
+    return base64.b64encode(raw).decode().rstrip("=")
+
+def _b64decode(text):
+    return base64.b64decode(text + "=" * (-len(text) % 4))
+
+def _scrypt(password, salt, n, r, p, key_bytes):
+    """Derive a scrypt key; OpenSSL releases the GIL while it runs"""
+    return hashlib.scrypt(
+        password.encode("utf-8"), salt=salt, n=n, r=r, p=p,
+        maxmem=256 * r * (n + p), dklen=key_bytes
+    )
+
+def hash_password(password, n, r, p, salt_bytes=16, key_bytes=32):
+    """Hash a password as 'scrypt$n$r$p$salt$key' with a random salt"""
+    salt = os.urandom(salt_bytes)
+    key = _scrypt(password, salt, n, r, p, key_bytes)
+    return f"{SCRYPT_PREFIX}${n}${r}${p}${_b64encode(salt)}${_b64encode(key)}"
+
+def is_legacy_hash(stored):
+    """True for the old unsalted SHA-256 hex digests"""
+    return len(stored) == 64 and all(c in "0123456789abcdef" for c in stored.lower())
+
+def verify_password(password, stored, n, r, p):
+    """
+    Check a password against a stored hash.
+    Returns (matches, needs_rehash); needs_rehash is True for legacy SHA-256
+    hashes and for scrypt hashes made with other cost parameters.
+    """
+    if not stored:
+        return False, False
+
+    if stored.startswith(SCRYPT_PREFIX + "$"):
+        try:
+            _, stored_n, stored_r, stored_p, salt, key = stored.split("$")
+            stored_n, stored_r, stored_p = int(stored_n), int(stored_r), int(stored_p)
+            expected = _b64decode(key)
+            derived = _scrypt(password, _b64decode(salt), stored_n, stored_r, stored_p, len(expected))
+        except (ValueError, TypeError):
+            return False, False
+        matches = hmac.compare_digest(derived, expected)
+        return matches, matches and (stored_n, stored_r, stored_p) != (n, r, p)
+
+    if is_legacy_hash(stored):
+        legacy = hashlib.sha256(password.encode()).hexdigest()
+        matches = hmac.compare_digest(legacy, stored.lower())
+        return matches, matches
+
+    return False, False
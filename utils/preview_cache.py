@@ -0,0 +1,89 @@
+import os
+import threading
+import time
+import uuid
+
+class PreviewCache:
+    """
+    Size-bounded on-disk LRU for generated previews, keyed by content hash,
+    shared by every process using the directory. Reads return the file's
+    bytes. Access refreshes a file's mtime; when the directory grows past
+    `max_bytes` the least recently used files are deleted down to
+    `low_water` of the limit.
+    """
+
+    def __init__(self, root, max_bytes, low_water=0.9, touch_interval=60):
+        self.root = os.path.abspath(root)
+        self.max_bytes = max_bytes
+        self.low_water = low_water
+        self.touch_interval = touch_interval
+        self._lock = threading.Lock()
+        self._size = None  # Bytes on disk, counted on first write
+
+    def _path(self, key):
+        if not key.replace("-", "").isalnum():
+            raise ValueError(f"Invalid cache key: {key!r}")
+        return os.path.join(self.root, key[:2], key)
+
+    def get(self, key):
+        """A cached preview's bytes, or None on a miss"""
+        path = self._path(key)
+        try:
+            with open(path, "rb") as handle:
+                stat = os.fstat(handle.fileno())
+                data = handle.read()
+        except FileNotFoundError:
+            return None
+        if not data:
+            return None  # Left by a failed write; treated as a miss
+        if time.time() - stat.st_mtime > self.touch_interval:
+            try:
+                os.utime(path)
+            except FileNotFoundError:
+                pass  # Evicted by another process meanwhile; the bytes were already read
+        return data
+
+    def put(self, key, data):
+        """Store a preview atomically and evict old entries if over the limit"""
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp = f"{path}.{uuid.uuid4().hex}.tmp"
+        with open(temp, "wb") as handle:
+            handle.write(data)
+        os.replace(temp, path)
+
+        with self._lock:
+            if self._size is None:
+                self._size = self._scan_size()
+            else:
+                self._size += len(data)
+            if self._size > self.max_bytes:
+                self._size = self._evict()
+
+    def _entries(self):
+        for directory in os.scandir(self.root):
+            if directory.is_dir():
+                for entry in os.scandir(directory.path):
+                    if entry.is_file() and not entry.name.endswith(".tmp"):
+                        yield entry
+
+    def _scan_size(self):
+        return sum(entry.stat().st_size for entry in self._entries())
+
+    def _evict(self):
+        """Delete least recently used files until under the low-water mark; returns the new size"""
+        entries = sorted(
+            ((stat.st_mtime, stat.st_size, entry.path) for entry in self._entries() for stat in [entry.stat()]),
+            reverse=True
+        )
+        # Other processes share the directory, so recount rather than trust our running total
+        size = sum(file_size for _, file_size, _ in entries)
+        target = self.max_bytes * self.low_water
+        while entries and size > target:
+            _, file_size, path = entries.pop()
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            size -= file_size
+        return size
@@ -0,0 +1,134 @@
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from functools import wraps
+import streamlit as st
+from config.settings import PROFILER_SETTINGS
+from database.instrumentation import start_trace, stop_trace
+
+# The profile being collected by this script thread, or None when profiling is off
+_local = threading.local()
+
+def is_enabled():
+    """Check whether reruns in this session should be profiled"""
+    return bool(os.environ.get(PROFILER_SETTINGS["env_var"])) or st.session_state.get('profiling', False)
+
+def set_enabled(enabled):
+    """Turn profiling on or off for the current session"""
+    st.session_state.profiling = enabled
+    if not enabled:
+        st.session_state.pop('rerun_profiles', None)
+
+def start_rerun():
+    """Begin a rerun profile if profiling is enabled; cheap no-op otherwise"""
+    if not is_enabled():
+        _local.profile = None
+        stop_trace()  # Drop a trace left on this thread by an earlier rerun
+        return
+    _local.profile = {'started': time.perf_counter(), 'depth': 0, 'spans': []}
+    start_trace()
+
+@contextmanager
+def phase(name):
+    """Time a block of the rerun as a waterfall span"""
+    profile = getattr(_local, 'profile', None)
+    if profile is None:
+        yield
+        return
+
+    began = time.perf_counter()
+    depth = profile['depth']
+    profile['depth'] += 1
+    try:
+        yield
+    finally:
+        profile['depth'] = depth
+        profile['spans'].append({
+            'name': name,
+            'kind': 'phase',
+            'start': began - profile['started'],
+            'seconds': time.perf_counter() - began,
+            'depth': depth,
+        })
+
+def profiled(name):
+    """Decorator form of phase() for render helpers"""
+    def decorate(function):
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            with phase(name):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorate
+
+def _service_spans(events, started):
+    """Group back-to-back queries from the same function into one service-call span"""
+    gap = PROFILER_SETTINGS["service_gap_ms"] / 1000
+    spans = []
+    for began, seconds, caller, rows, error in events:
+        last = spans[-1] if spans else None
+        if last and last['caller'] == caller and began - (started + last['start'] + last['seconds']) < gap:
+            last['seconds'] = began + seconds - started - last['start']
+            last['queries'] += 1
+            last['db_seconds'] += seconds
+            last['rows'] += rows
+            last['errors'] += bool(error)
+            continue
+        spans.append({
+            'name': caller.rsplit('.', 1)[-1],
+            'caller': caller,
+            'kind': 'service',
+            'start': began - started,
+            'seconds': seconds,
+            'db_seconds': seconds,
+            'queries': 1,
+            'rows': rows,
+            'errors': int(bool(error)),
+        })
+    return spans
+
+def finish_rerun(page):
+    """
+    Close the current rerun profile, attach query counts to each span and
+    keep it in the session's per-page history. Returns the profile or None;
+    page is None when the rerun ended before routing, and nothing is kept.
+    """
+    profile = getattr(_local, 'profile', None)
+    if profile is None:
+        return None
+    _local.profile = None
+
+    events = stop_trace()
+    total = time.perf_counter() - profile['started']
+    phases = profile['spans']
+    services = _service_spans(events, profile['started'])
+
+    for span in phases:
+        end = span['start'] + span['seconds']
+        inside = [s for s in services if span['start'] <= s['start'] < end]
+        span['queries'] = sum(s['queries'] for s in inside)
+        span['db_seconds'] = sum(s['db_seconds'] for s in inside)
+    for span in services:
+        owners = [p for p in phases if p['start'] <= span['start'] < p['start'] + p['seconds']]
+        span['depth'] = max((p['depth'] for p in owners), default=-1) + 1
+
+    result = {
+        'page': page,
+        'at': time.time(),
+        'seconds': total,
+        'queries': len(events),
+        'db_seconds': sum(event[1] for event in events),
+        'spans': sorted(phases + services, key=lambda span: (span['start'], span['depth'])),
+    }
+
+    if page is None:
+        return None
+    history = st.session_state.setdefault('rerun_profiles', {})
+    history.setdefault(page, deque(maxlen=PROFILER_SETTINGS["history_size"])).append(result)
+    return result
+
+def get_history(page):
+    """Get the retained profiles for a page, oldest first"""
+    return list(st.session_state.get('rerun_profiles', {}).get(page, ()))
@@ -0,0 +1,84 @@
+import ipaddress
+import threading
+import time
+from collections import OrderedDict
+
+class TokenBucketLimiter:
+    """
+    Process-wide token buckets keyed by string.
+    Each key starts with `capacity` tokens and regains `refill_per_second`;
+    an attempt spends one token. At most `max_keys` buckets are kept, least
+    recently used first out, so memory stays bounded under key flooding.
+    """
+
+    def __init__(self, capacity, refill_per_second, max_keys=100000, clock=time.monotonic):
+        self.capacity = float(capacity)
+        self.refill_per_second = float(refill_per_second)
+        self.max_keys = max_keys
+        self._clock = clock
+        self._buckets = OrderedDict()  # key -> [tokens, updated_at]
+        self._lock = threading.Lock()
+        self.allowed = 0
+        self.rejected = 0
+        self.evicted = 0
+
+    def acquire(self, key):
+        """Spend a token for `key`; returns (allowed, retry_after_seconds)"""
+        now = self._clock()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = [self.capacity, now]
+                self._buckets[key] = bucket
+                if len(self._buckets) > self.max_keys:
+                    self._buckets.popitem(last=False)
+                    self.evicted += 1
+            else:
+                self._buckets.move_to_end(key)
+                bucket[0] = min(self.capacity, bucket[0] + (now - bucket[1]) * self.refill_per_second)
+                bucket[1] = now
+
+            if bucket[0] >= 1:
+                bucket[0] -= 1
+                self.allowed += 1
+                return True, 0.0
+
+            self.rejected += 1
+            return False, (1 - bucket[0]) / self.refill_per_second
+
+    def reset(self, key):
+        """Forget a key's bucket"""
+        with self._lock:
+            self._buckets.pop(key, None)
+
+    def metrics(self):
+        """Return counters for monitoring"""
+        with self._lock:
+            return {
+                'keys': len(self._buckets),
+                'allowed': self.allowed,
+                'rejected': self.rejected,
+                'evicted': self.evicted
+            }
+
+
+def client_address(peer, forwarded_for, trusted_proxies):
+    """
+    The caller's IP address. When the peer is a trusted proxy, walk
+    X-Forwarded-For from the right past the other trusted proxies; entries
+    further left are set by the client and are not believed.
+    """
+    networks = [ipaddress.ip_network(proxy, strict=False) for proxy in trusted_proxies]
+
+    def is_trusted(address):
+        try:
+            ip = ipaddress.ip_address(address)
+        except ValueError:
+            return False
+        return any(ip in network for network in networks)
+
+    hops = [hop.strip() for hop in (forwarded_for or "").split(",") if hop.strip()]
+    address = peer
+    while address and hops and is_trusted(address):
+        address = hops.pop()
+    return address
@@ -1,4 +1,94 @@
+import hashlib
+import secrets
 import streamlit as st
+from config.settings import SESSION_SETTINGS
+from database.db_manager import execute_query
+from utils.session_tokens import issue_token, decode_token
+
+# Used when no signing secret is configured: tokens then survive browser
+# reconnects but not a server restart
+_fallback_secret = secrets.token_bytes(32)
+
+def signing_secret():
+    """Get the key that signs session tokens and document links"""
+    try:
+        configured = st.secrets.get(SESSION_SETTINGS["secret_key"])
+    except Exception:
+        configured = None
+    return configured.encode() if configured else _fallback_secret
+
+def _apply_identity(identity):
+    """Copy a decoded identity into session state"""
+    st.session_state.identity = identity
+    st.session_state.authenticated = True
+    st.session_state.user_id = identity['user_id']
+    st.session_state.user_type = identity['user_type']
+    st.session_state.username = identity['name']
+
+def _client_hash():
+    """Hash of the browser's User-Agent, which the URL doesn't carry"""
+    try:
+        agent = st.context.headers.get("User-Agent") or ""
+    except Exception:
+        agent = ""
+    return hashlib.sha256(agent.encode()).hexdigest()[:32]
+
+def _open_server_session(user_id):
+    """Record a new session for this browser (purging the user's expired ones); returns its id"""
+    session_id = secrets.token_hex(16)
+    execute_query(
+        """WITH purged AS (
+               DELETE FROM user_sessions WHERE user_id = %s AND expires_at < NOW()
+           )
+           INSERT INTO user_sessions (id, user_id, client_hash, expires_at)
+           VALUES (%s, %s, %s, NOW() + %s * INTERVAL '1 hour')""",
+        (user_id, session_id, user_id, _client_hash(), SESSION_SETTINGS["token_ttl_hours"])
+    )
+    return session_id
+
+def _claim_server_session(identity):
+    """Revoke a token's session if it is live and was issued to this browser; True if it was"""
+    claimed = execute_query(
+        """UPDATE user_sessions SET revoked_at = NOW()
+           WHERE id = %s AND user_id = %s AND client_hash = %s
+             AND revoked_at IS NULL AND expires_at > NOW()
+           RETURNING id""",
+        (identity['session_id'], identity['user_id'], _client_hash()),
+        fetch='one'
+    )
+    return claimed is not None
+
+def start_user_session(user_id, user_type, name, lawyer_id=None):
+    """Log a user in and issue the signed token that restores the session"""
+    identity = {'user_id': user_id, 'user_type': user_type, 'lawyer_id': lawyer_id, 'name': name,
+                'session_id': _open_server_session(user_id)}
+    token = issue_token(identity, signing_secret(), SESSION_SETTINGS["token_ttl_hours"] * 3600)
+    st.query_params[SESSION_SETTINGS["query_param"]] = token
+    _apply_identity(decode_token(token, signing_secret()))
+
+def restore_session():
+    """
+    Restore a login from the URL token after a reconnect; True if restored.
+    The token is spent and replaced, so each one restores a session once.
+    """
+    token = st.query_params.get(SESSION_SETTINGS["query_param"])
+    if not token:
+        return False
+    identity = decode_token(token, signing_secret())
+    if identity is None or not identity['session_id'] or not _claim_server_session(identity):
+        del st.query_params[SESSION_SETTINGS["query_param"]]
+        return False
+    start_user_session(identity['user_id'], identity['user_type'], identity['name'], identity['lawyer_id'])
+    return True
+
+def get_identity():
+    """Get the cached identity of the logged-in user, or None"""
+    return st.session_state.get('identity')
+
+def get_current_lawyer_id():
+    """Get the lawyers.id of the logged-in lawyer without a database lookup"""
+    identity = get_identity()
+    return identity.get('lawyer_id') if identity else None
 
 def init_session_state():
     """Initialize session state variables"""
@@ -18,10 +108,19 @@ def init_session_state():
         st.session_state.chat_with = None
     if 'chat_open' not in st.session_state:
         st.session_state.chat_open = False
+    if 'identity' not in st.session_state:
+        # First run of a browser session: the token is decoded once and cached
+        st.session_state.identity = None
+        restore_session()
 
 def logout_user():
-    """Clear session state and logout user"""
+    """Clear session state, revoke the session token and logout user"""
+    identity = st.session_state.get('identity')
+    if identity and identity.get('session_id'):
+        execute_query("UPDATE user_sessions SET revoked_at = NOW() WHERE id = %s", (identity['session_id'],))
     st.session_state.authenticated = False
+    st.session_state.identity = None
+    st.query_params.pop(SESSION_SETTINGS["query_param"], None)
     st.session_state.user_id = None
     st.session_state.user_type = None
     st.session_state.username = None
@@ -36,6 +135,8 @@ def demo_login():
     st.session_state.user_id = 999
     st.session_state.user_type = "Citizen"
     st.session_state.username = "Demo User"
+    # Demo sessions get no token, so they end with the browser session
+    st.session_state.identity = {'user_id': 999, 'user_type': "Citizen", 'lawyer_id': None, 'name': "Demo User"}
 
 def get_navigation_menu():
     """Return navigation menu based on user type"""
@@ -83,7 +184,8 @@ def get_navigation_menu():
             "👨‍⚖️ Lawyer Management": "AdminLawyers",
             "👥 User Management": "AdminUsers",
             "📈 Analytics": "AdminAnalytics",
-            "⚙️ Settings": "AdminSettings"
+            "⚙️ Settings": "AdminSettings",
+            "🩺 Diagnostics": "AdminDiagnostics"
         }
 
     else:
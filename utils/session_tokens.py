@@ -0,0 +1,56 @@
+import base64
+import hashlib
+import hmac
+import json
+import time
+
+# Short keys keep the token small enough for a URL
+_FIELDS = {'user_id': 'uid', 'user_type': 'typ', 'lawyer_id': 'lid', 'name': 'nam', 'session_id': 'sid'}
+
+def _b64encode(raw):
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def _b64decode(text):
+    return base64.urlsafe_b64decode(text + "=" * (-len(text) % 4))
+
+def _sign(payload, secret):
+    return hmac.new(secret, payload.encode(), hashlib.sha256).digest()
+
+def issue_token(identity, secret, ttl_seconds, now=None):
+    """Sign an identity dict as 'payload.signature'"""
+    claims = {short: identity.get(field) for field, short in _FIELDS.items()}
+    claims['exp'] = int((now or time.time()) + ttl_seconds)
+    payload = _b64encode(json.dumps(claims, separators=(",", ":"), ensure_ascii=False).encode())
+    return f"{payload}.{_b64encode(_sign(payload, secret))}"
+
+def decode_token(token, secret, now=None):
+    """Return the identity dict for a valid, unexpired token, else None"""
+    if not token or token.count(".") != 1:
+        return None
+    payload, signature = token.split(".")
+    try:
+        if not hmac.compare_digest(_b64decode(signature), _sign(payload, secret)):
+            return None
+        claims = json.loads(_b64decode(payload))
+    except (ValueError, TypeError):
+        return None
+
+    if not isinstance(claims, dict) or claims.get('exp', 0) < (now or time.time()):
+        return None
+    identity = {field: claims.get(short) for field, short in _FIELDS.items()}
+    identity['expires_at'] = claims['exp']
+    return identity if identity['user_id'] is not None else None
+
+def sign_link(resource, secret, ttl_seconds, now=None):
+    """Sign a resource id for a time-limited link; returns (expires, signature)"""
+    expires = int((now or time.time()) + ttl_seconds)
+    return expires, _b64encode(_sign(f"{resource}:{expires}", secret))
+
+def verify_link(resource, expires, signature, secret, now=None):
+    """Check a signature made by sign_link and that it hasn't expired"""
+    try:
+        expires = int(expires)
+        valid = hmac.compare_digest(_b64decode(signature), _sign(f"{resource}:{expires}", secret))
+    except (ValueError, TypeError):
+        return False
+    return valid and expires >= (now or time.time())
@@ -0,0 +1,121 @@
+import unicodedata
+
+# Unicode blocks of the scripts used by SUPPORTED_LANGUAGES
+SCRIPT_RANGES = (
+    (0x0900, 0x097F, "Devanagari"),
+    (0x0980, 0x09FF, "Bengali"),
+    (0x0A80, 0x0AFF, "Gujarati"),
+    (0x0B80, 0x0BFF, "Tamil"),
+    (0x0C00, 0x0C7F, "Telugu"),
+    (0x0C80, 0x0CFF, "Kannada"),
+    (0x0D00, 0x0D7F, "Malayalam"),
+)
+SCRIPT_LANGUAGES = {
+    "Latin": "English", "Devanagari": "Hindi", "Bengali": "Bengali", "Gujarati": "Gujarati",
+    "Tamil": "Tamil", "Telugu": "Telugu", "Kannada": "Kannada", "Malayalam": "Malayalam",
+}
+# Hindi and Marathi share Devanagari; these letters and words are common in
+# Marathi and rare in Hindi
+MARATHI_MARKERS = ("ळ", "आहे", "आणि", "च्या", "नाही")
+
+# Tesseract traineddata names
+OCR_LANGUAGES = {
+    "English": "eng", "Hindi": "hin", "Tamil": "tam", "Telugu": "tel", "Bengali": "ben",
+    "Malayalam": "mal", "Kannada": "kan", "Gujarati": "guj", "Marathi": "mar",
+}
+
+# Control characters other than tab and newline (Unicode category Cc)
+_CONTROL_CHARS = dict.fromkeys([*range(0x00, 0x09), *range(0x0B, 0x20), *range(0x7F, 0xA0)])
+
+class UnsupportedDocument(ValueError):
+    """No extractor handles this content type"""
+
+class OcrUnavailable(RuntimeError):
+    """pytesseract or the tesseract binary is not installed"""
+
+def _script(char):
+    code = ord(char)
+    for start, end, name in SCRIPT_RANGES:
+        if start <= code <= end:
+            return name
+    if char.isascii():
+        return "Latin"
+    return None
+
+def detect_language(text, candidates, sample_chars=20000):
+    """
+    Guess a document's language from the Unicode script of its letters;
+    returns a name from `candidates`, or None for text without letters.
+    """
+    counts = {}
+    for char in text[:sample_chars]:
+        if char.isalpha():
+            script = _script(char)
+            if script:
+                counts[script] = counts.get(script, 0) + 1
+    if not counts:
+        return None
+
+    script = max(counts, key=counts.get)
+    language = SCRIPT_LANGUAGES[script]
+    if script == "Devanagari" and any(marker in text[:sample_chars] for marker in MARATHI_MARKERS):
+        language = "Marathi"
+    return language if language in candidates else None
+
+def ocr_language_codes(languages):
+    """Tesseract -l argument for a list of language names, English always included"""
+    codes = [OCR_LANGUAGES[name] for name in languages if name in OCR_LANGUAGES]
+    return "+".join(dict.fromkeys(codes + ["eng"]))
+
+def ocr_image(image, lang):
+    """Text of a PIL image through tesseract"""
+    try:
+        import pytesseract
+    except ImportError:
+        raise OcrUnavailable("pytesseract is not installed") from None
+    try:
+        return pytesseract.image_to_string(image, lang=lang)
+    except pytesseract.TesseractNotFoundError:
+        raise OcrUnavailable("the tesseract binary is not installed") from None
+
+def _pdf_pages(path, lang, min_text_chars):
+    try:
+        from pypdf import PdfReader
+    except ImportError:
+        raise UnsupportedDocument("pypdf is not installed") from None
+
+    for page in PdfReader(path).pages:
+        text = page.extract_text() or ""
+        if len(text.strip()) < min_text_chars and page.images:
+            # A scanned page: the text is in the page images
+            text = "\n".join(ocr_image(image.image, lang) for image in page.images)
+        yield text
+
+def _image_pages(path, lang):
+    from PIL import Image, ImageSequence
+    with Image.open(path) as image:
+        # Multi-page TIFF scans come through as one frame per page
+        for frame in ImageSequence.Iterator(image):
+            yield ocr_image(frame.convert("L"), lang)
+
+def extract_pages(path, content_type, lang="eng", min_text_chars=20):
+    """
+    Yield the text of each page of a stored document, one page at a time.
+    PDFs use their text layer and fall back to OCR for scanned pages;
+    images are OCRed; plain text is one page.
+    """
+    content_type = (content_type or "").split(";")[0].strip().lower()
+    if content_type == "application/pdf":
+        yield from _pdf_pages(path, lang, min_text_chars)
+    elif content_type.startswith("image/"):
+        yield from _image_pages(path, lang)
+    elif content_type.startswith("text/"):
+        with open(path, "rb") as handle:
+            yield handle.read().decode("utf-8", errors="replace")
+    else:
+        raise UnsupportedDocument(f"Can't extract text from {content_type or 'unknown type'}")
+
+def clean_text(text):
+    """Normalise extracted text for storage and indexing"""
+    text = unicodedata.normalize("NFC", text).translate(_CONTROL_CHARS)
+    return "\n".join(line.strip() for line in text.splitlines() if line.strip())
@@ -0,0 +1,84 @@
+import io
+import textwrap
+from PIL import Image, ImageDraw, ImageFont, ImageOps
+
+# Portrait A4 proportions for rendered text pages
+PAGE_RATIO = 297 / 210
+
+def _fit(image, max_px):
+    """Downscale in place to fit a max_px square, flattening transparency onto white"""
+    image.thumbnail((max_px, max_px))
+    if image.mode in ("RGBA", "LA", "P"):
+        image = image.convert("RGBA")
+        background = Image.new("RGB", image.size, "white")
+        background.paste(image, mask=image.getchannel("A"))
+        return background
+    return image.convert("RGB")
+
+def _image_thumbnail(source, max_px):
+    with Image.open(source) as image:
+        # draft() lets JPEG decode at a fraction of full size
+        image.draft("RGB", (max_px, max_px))
+        return _fit(ImageOps.exif_transpose(image), max_px)
+
+def _text_thumbnail(text, max_px):
+    """Draw the start of a page's text on a blank page, like a zoomed-out view of it"""
+    width, height = int(max_px / PAGE_RATIO), max_px
+    page = Image.new("RGB", (width, height), "white")
+    draw = ImageDraw.Draw(page)
+    font = ImageFont.load_default(size=max(height // 40, 6))
+    margin = width // 12
+    line_height = max(height // 34, 7)
+    chars_per_line = max(int((width - 2 * margin) / (line_height * 0.5)), 10)
+    y = margin
+    for paragraph in text.splitlines():
+        for line in textwrap.wrap(paragraph, chars_per_line) or [""]:
+            if y + line_height > height - margin:
+                return page
+            draw.text((margin, y), line, fill="#333333", font=font)
+            y += line_height
+    return page
+
+def _pdf_thumbnail(path, max_px, min_text_chars):
+    try:
+        from pypdf import PdfReader
+    except ImportError:
+        return None
+    reader = PdfReader(path)
+    if not reader.pages:
+        return None
+    page = reader.pages[0]
+    text = page.extract_text() or ""
+    if len(text.strip()) >= min_text_chars or not page.images:
+        return _text_thumbnail(text, max_px)
+    # A scanned page: its largest image is the page itself
+    largest = max(page.images, key=lambda image: len(image.data))
+    return _image_thumbnail(io.BytesIO(largest.data), max_px)
+
+def can_preview(content_type):
+    """Whether make_thumbnail handles this content type"""
+    content_type = (content_type or "").split(";")[0].strip().lower()
+    return content_type.startswith(("image/", "text/")) or content_type == "application/pdf"
+
+def make_thumbnail(path, content_type, max_px, min_text_chars=20, quality=80):
+    """
+    JPEG thumbnail of a document's first page, or None for types without a
+    visual preview. Images are downscaled, scanned PDFs use their page
+    image and text PDFs and plain text are drawn as a page of text.
+    """
+    content_type = (content_type or "").split(";")[0].strip().lower()
+    if content_type.startswith("image/"):
+        image = _image_thumbnail(path, max_px)
+    elif content_type == "application/pdf":
+        image = _pdf_thumbnail(path, max_px, min_text_chars)
+    elif content_type.startswith("text/"):
+        with open(path, "rb") as handle:
+            image = _text_thumbnail(handle.read(8192).decode("utf-8", errors="replace"), max_px)
+    else:
+        return None
+    if image is None:
+        return None
+
+    out = io.BytesIO()
+    image.save(out, "JPEG", quality=quality, optimize=True)
+    return out.getvalue()